@@ -0,0 +1,138 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import argparse
+import json
+import time
+
+import numpy as np
+import tensorflow as tf
+
+from src.config import Settings
+from src.inference import INPUT_SHAPE, load_backend, preprocess_batch
+from src.inference.backends import KerasBackend
+
+
+def exportar_savedmodel(model, destino: Path) -> Path:
+    model.export(str(destino))
+    return destino
+
+
+def exportar_tflite(model, destino: Path, quantizar: bool = False) -> Path:
+    converter = tf.lite.TFLiteConverter.from_keras_model(model)
+    if quantizar:
+        # Quantização de faixa dinâmica: pesos em int8, ativações em float.
+        converter.optimizations = [tf.lite.Optimize.DEFAULT]
+    destino.write_bytes(converter.convert())
+    return destino
+
+
+def carregar_amostras(imagens: Path, quantidade: int) -> np.ndarray:
+    if imagens is not None:
+        caminhos = sorted(
+            str(p) for p in imagens.rglob("*") if p.suffix.lower() in {".png", ".jpg", ".jpeg"}
+        )[:quantidade]
+        if caminhos:
+            return preprocess_batch(caminhos)
+
+    rng = np.random.default_rng(0)
+    return rng.standard_normal((quantidade, *INPUT_SHAPE), dtype=np.float32)
+
+
+def medir(backend, amostras: np.ndarray) -> tuple:
+    backend.predict(amostras[:1])
+    inicio = time.perf_counter()
+    saidas = np.concatenate([backend.predict(amostras[i:i + 1]) for i in range(len(amostras))])
+    latencia_ms = (time.perf_counter() - inicio) * 1000.0 / len(amostras)
+    return saidas.reshape(-1), latencia_ms
+
+
+def prioridade(score: float) -> str:
+    if score >= 0.7:
+        return "CRÍTICA"
+    if score >= 0.5:
+        return "ALTA"
+    if score >= 0.45:
+        return "MÉDIA"
+    return "BAIXA"
+
+
+def relatorio_paridade(referencia, candidato, amostras: np.ndarray) -> dict:
+    """Compara as saídas do artefato exportado com o modelo Keras nas mesmas amostras."""
+    esperado, latencia_ref = medir(referencia, amostras)
+    obtido, latencia_cand = medir(candidato, amostras)
+
+    diferenca = np.abs(esperado - obtido)
+    return {
+        "amostras": int(len(amostras)),
+        "diferenca_max": float(diferenca.max()),
+        "diferenca_media": float(diferenca.mean()),
+        "concordancia_classe": float(np.mean((esperado >= 0.5) == (obtido >= 0.5))),
+        "concordancia_prioridade": float(np.mean([prioridade(a) == prioridade(b) for a, b in zip(esperado, obtido)])),
+        "latencia_keras_ms": round(latencia_ref, 3),
+        "latencia_exportado_ms": round(latencia_cand, 3),
+    }
+
+
+def tamanho(caminho: Path) -> int:
+    if caminho.is_dir():
+        return sum(p.stat().st_size for p in caminho.rglob("*") if p.is_file())
+    return caminho.stat().st_size
+
+
+def main():
+    settings = Settings()
+
+    parser = argparse.ArgumentParser(description='Exporta o modelo de pneumonia para inferência otimizada em CPU')
+    parser.add_argument('formato', choices=['savedmodel', 'tflite'])
+    parser.add_argument('--modelo', type=Path, default=settings.model_path, help='Modelo Keras de origem')
+    parser.add_argument('--saida', type=Path, help='Destino do artefato (padrão: ao lado do modelo)')
+    parser.add_argument('--quantizar', action='store_true', help='Quantização de faixa dinâmica (apenas tflite)')
+    parser.add_argument('--imagens', type=Path, help='Diretório de raios-X para o teste de paridade')
+    parser.add_argument('--amostras', type=int, default=32, help='Número de amostras do teste de paridade')
+
+    args = parser.parse_args()
+
+    if args.saida is None:
+        args.saida = args.modelo.with_suffix(".tflite" if args.formato == "tflite" else "")
+
+    print("\n" + "=" * 50)
+    print("   EXPORTAÇÃO DO MODELO")
+    print("=" * 50 + "\n")
+
+    referencia = KerasBackend(args.modelo)
+
+    print(f"📦 Exportando {args.formato} para {args.saida}...")
+    if args.formato == "tflite":
+        exportar_tflite(referencia.model, args.saida, quantizar=args.quantizar)
+    else:
+        exportar_savedmodel(referencia.model, args.saida)
+
+    print("🔍 Verificando paridade com o modelo Keras...")
+    candidato = load_backend(args.formato, args.saida)
+    relatorio = relatorio_paridade(referencia, candidato, carregar_amostras(args.imagens, args.amostras))
+    relatorio.update({
+        "formato": args.formato,
+        "quantizado": bool(args.quantizar and args.formato == "tflite"),
+        "origem": str(args.modelo),
+        "artefato": str(args.saida),
+        "tamanho_origem_bytes": tamanho(args.modelo),
+        "tamanho_artefato_bytes": tamanho(args.saida),
+    })
+
+    relatorio_path = Path(f"{args.saida}.parity.json")
+    relatorio_path.write_text(json.dumps(relatorio, indent=4, ensure_ascii=False), encoding="utf-8")
+
+    for chave, valor in relatorio.items():
+        print(f"   {chave}: {valor}")
+
+    print("\n" + "=" * 50)
+    print(f"✅ Relatório de paridade: {relatorio_path}")
+    print(f"   Para servir: INFERENCE_BACKEND={args.formato} INFERENCE_ARTIFACT_PATH={args.saida}")
+    print("=" * 50 + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import argparse
+import datetime
+import tempfile
+
+
+def sinteticos(quantidade: int, imagem: str, pasta: Path) -> list:
+    from src.agents.report.pdf import diagnosis_context
+
+    prioridades = ["LOW", "MEDIUM", "HIGH", "CRITICAL"]
+    jobs = []
+    for i in range(quantidade):
+        paciente = {"id": f"P{i:05d}", "name": f"Paciente Sintético {i}", "cpf": f"{i:011d}", "birth_date": "1980-01-01"}
+        diagnostico = {
+            "id": f"D{i:05d}",
+            "patient_id": paciente["id"],
+            "classification": "PNEUMONIA" if i % 2 else "NORMAL",
+            "confidence": 0.5 + (i % 50) / 100.0,
+            "priority": prioridades[i % 4],
+            "notes": "Pneumonia detectada. Tratamento urgente recomendado. Avaliação médica no mesmo dia. " * (1 + i % 3),
+            "timestamp": datetime.datetime.now().isoformat(),
+        }
+        jobs.append((diagnosis_context(paciente, diagnostico), imagem, str(pasta / f"relatorio_{i:05d}.pdf")))
+    return jobs
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Gera relatórios PDF em lote, sem passar pelo LLM')
+    parser.add_argument('--inicio', help='Data inicial (YYYY-MM-DD); padrão: hoje')
+    parser.add_argument('--fim', help='Data final, inclusiva (YYYY-MM-DD)')
+    parser.add_argument('--prioridade', help='BAIXA, MÉDIA, ALTA ou CRÍTICA')
+    parser.add_argument('--classificacao', help='NORMAL ou PNEUMONIA')
+    parser.add_argument('--sintetico', type=int, default=0, help='Gera N relatórios fictícios (benchmark, sem banco)')
+    parser.add_argument('--imagem', help='Imagem usada nos relatórios fictícios')
+    parser.add_argument('--workers', type=int, help='Processos de renderização (padrão: REPORT_WORKERS)')
+    args = parser.parse_args()
+
+    print("\n" + "=" * 50)
+    print("   RELATÓRIOS EM LOTE")
+    print("=" * 50 + "\n")
+
+    if args.sintetico:
+        from src.agents.report.batch import BatchReportRenderer
+
+        with tempfile.TemporaryDirectory() as pasta:
+            renderer = BatchReportRenderer(args.workers or 0)
+            resumo = renderer.render(sinteticos(args.sintetico, args.imagem, Path(pasta)))
+            resumo["pasta"] = "(temporária)"
+    else:
+        from src.container import container
+
+        if args.workers is not None:
+            container.settings.report_workers = args.workers
+        inicio = args.inicio or datetime.date.today().isoformat()
+        resumo = container.tool_report.gerar_relatorios_lote(inicio, args.fim, args.prioridade, args.classificacao)
+        if "mensagem" in resumo:
+            print(resumo["mensagem"])
+            return
+
+    print(f"Relatórios:  {resumo['relatorios']}")
+    if "reaproveitados" in resumo:
+        print(f"Em cache:    {resumo['reaproveitados']}")
+    print(f"Páginas:     {resumo['paginas']}")
+    print(f"Erros:       {len(resumo['erros'])}")
+    print(f"Tempo:       {resumo['segundos']} s")
+    print(f"Throughput:  {resumo['paginas_por_segundo']} páginas/s")
+    print(f"Pasta:       {resumo['pasta']}")
+    for erro in resumo['erros'][:20]:
+        print(f"  ❌ {erro['arquivo']}: {erro['erro']}")
+    print("=" * 50 + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import argparse
+import datetime
+import json
+import sqlite3
+import tempfile
+import time
+
+from src.agents.notification.alerts import AlertStore
+
+
+def alerta(i: int) -> dict:
+    return {
+        "timestamp": datetime.datetime.now().isoformat(),
+        "paciente": f"Paciente {i}",
+        "diagnostico": "PNEUMONIA",
+        "recomendacao": "Avaliação imediata",
+        "lido": False,
+    }
+
+
+def enviar_alerta_json(arquivo: Path, i: int):
+    """Caminho anterior: lê a fila inteira, acrescenta um alerta e reescreve o arquivo."""
+    with open(arquivo, 'r') as f:
+        fila = json.load(f)
+    fila.append(alerta(i))
+    with open(arquivo, 'w') as f:
+        json.dump(fila, f, indent=4)
+
+
+def mediana(tempos: list) -> float:
+    tempos = sorted(tempos)
+    return tempos[len(tempos) // 2]
+
+
+def medir_json(tmp: Path, tamanho: int, amostras: int) -> float:
+    arquivo = tmp / f"alerts_{tamanho}.json"
+    with open(arquivo, 'w') as f:
+        json.dump([alerta(i) for i in range(tamanho)], f, indent=4)
+
+    tempos = []
+    for i in range(amostras):
+        inicio = time.perf_counter()
+        enviar_alerta_json(arquivo, tamanho + i)
+        tempos.append((time.perf_counter() - inicio) * 1000.0)
+    return mediana(tempos)
+
+
+def medir_store(tmp: Path, tamanho: int, amostras: int) -> float:
+    store = AlertStore(tmp / f"alerts_{tamanho}.db")
+    with sqlite3.connect(store.db_path) as connection:
+        connection.executemany(
+            "INSERT INTO alerts (timestamp, paciente, diagnostico, recomendacao) VALUES (?, ?, ?, ?)",
+            ((a["timestamp"], a["paciente"], a["diagnostico"], a["recomendacao"]) for a in map(alerta, range(tamanho)))
+        )
+
+    tempos = []
+    for i in range(amostras):
+        inicio = time.perf_counter()
+        store.append(f"Paciente {tamanho + i}", "PNEUMONIA", "Avaliação imediata")
+        tempos.append((time.perf_counter() - inicio) * 1000.0)
+    return mediana(tempos)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compara a latência de registrar um alerta no JSON antigo e no AlertStore')
+    parser.add_argument('--tamanhos', type=int, nargs='+', default=[1_000, 10_000, 100_000], help='Alertas já na fila')
+    parser.add_argument('--amostras', type=int, default=20, help='Alertas registrados por cenário')
+    args = parser.parse_args()
+
+    print("=" * 64)
+    print("   Registro de alerta — mediana em ms")
+    print("=" * 64)
+    print(f"{'fila':>10}{'JSON (antes)':>18}{'AlertStore':>16}{'speedup':>12}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        for tamanho in args.tamanhos:
+            antes = medir_json(tmp, tamanho, args.amostras)
+            depois = medir_store(tmp, tamanho, args.amostras)
+            print(f"{tamanho:>10,}{antes:>18.3f}{depois:>16.3f}{antes / depois:>11.1f}x")
+
+
+if __name__ == "__main__":
+    main()
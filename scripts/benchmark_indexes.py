@@ -0,0 +1,139 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import argparse
+import datetime
+import random
+import tempfile
+import time
+
+from sqlalchemy import create_engine, inspect
+
+from src.database.migrations import ensure_indexes
+from src.database.models import Base
+
+CONSULTAS = {
+    "diagnosticos_do_paciente": (
+        "SELECT * FROM diagnoses WHERE patient_id = ? ORDER BY timestamp DESC LIMIT 20",
+        ("patient_id",),
+    ),
+    "historico_do_paciente": (
+        "SELECT * FROM medical_history WHERE patient_id = ? ORDER BY date_recorded",
+        ("patient_id",),
+    ),
+    "fila_criticos": (
+        "SELECT * FROM diagnoses WHERE priority = 'CRITICAL' ORDER BY timestamp DESC LIMIT 50",
+        (),
+    ),
+    "pneumonia_no_periodo": (
+        "SELECT COUNT(*) FROM diagnoses WHERE classification = 'PNEUMONIA' AND timestamp >= ?",
+        ("inicio",),
+    ),
+}
+
+
+def popular(engine, total: int):
+    rng = random.Random(42)
+    pacientes = max(1, total // 20)
+    agora = datetime.datetime(2026, 1, 1)
+
+    raw = engine.raw_connection()
+    try:
+        cursor = raw.cursor()
+        cursor.executemany(
+            "INSERT INTO patients (id, name) VALUES (?, ?)",
+            ((f"P{i:07d}", f"Paciente {i}") for i in range(pacientes))
+        )
+        cursor.executemany(
+            "INSERT INTO medical_history (patient_id, description, date_recorded) VALUES (?, ?, ?)",
+            ((f"P{rng.randrange(pacientes):07d}", "registro", agora - datetime.timedelta(days=rng.randrange(3650)))
+             for _ in range(total // 5))
+        )
+        cursor.executemany(
+            "INSERT INTO diagnoses (id, patient_id, classification, confidence, priority, timestamp) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            ((
+                f"D{i:08d}",
+                f"P{rng.randrange(pacientes):07d}",
+                rng.choice(["NORMAL", "PNEUMONIA"]),
+                rng.random(),
+                rng.choice(["LOW", "MEDIUM", "HIGH", "CRITICAL"]),
+                agora - datetime.timedelta(minutes=rng.randrange(525600)),
+            ) for i in range(total))
+        )
+        raw.commit()
+    finally:
+        raw.close()
+    return pacientes
+
+
+def medir(engine, pacientes: int, repeticoes: int) -> dict:
+    rng = random.Random(7)
+    resultados = {}
+    with engine.connect() as connection:
+        for nome, (sql, chaves) in CONSULTAS.items():
+            tempos = []
+            for _ in range(repeticoes):
+                valores = {"patient_id": f"P{rng.randrange(pacientes):07d}", "inicio": "2025-12-01"}
+                inicio = time.perf_counter()
+                connection.exec_driver_sql(sql, tuple(valores[c] for c in chaves)).fetchall()
+                tempos.append((time.perf_counter() - inicio) * 1000.0)
+            tempos.sort()
+            resultados[nome] = tempos[len(tempos) // 2]
+    return resultados
+
+
+def planos(engine) -> dict:
+    valores = {"patient_id": "P0000001", "inicio": "2025-12-01"}
+    resultado = {}
+    with engine.connect() as connection:
+        for nome, (sql, chaves) in CONSULTAS.items():
+            linhas = connection.exec_driver_sql(
+                "EXPLAIN QUERY PLAN " + sql, tuple(valores[c] for c in chaves)
+            ).fetchall()
+            resultado[nome] = " | ".join(linha[-1] for linha in linhas)
+    return resultado
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Mede a latência das consultas de diagnóstico com e sem índices')
+    parser.add_argument('--tamanhos', type=int, nargs='+', default=[10_000, 100_000, 1_000_000])
+    parser.add_argument('--repeticoes', type=int, default=25)
+    args = parser.parse_args()
+
+    for total in args.tamanhos:
+        with tempfile.TemporaryDirectory() as tmp:
+            engine = create_engine(f"sqlite:///{tmp}/bench.db")
+            Base.metadata.create_all(bind=engine)
+
+            inspector = inspect(engine)
+            with engine.begin() as connection:
+                for table in Base.metadata.sorted_tables:
+                    for index in inspector.get_indexes(table.name):
+                        connection.exec_driver_sql(f"DROP INDEX {index['name']}")
+
+            print(f"\n📦 Populando {total:,} diagnósticos...")
+            pacientes = popular(engine, total)
+
+            sem_indice = medir(engine, pacientes, args.repeticoes)
+            ensure_indexes(engine)
+            com_indice = medir(engine, pacientes, args.repeticoes)
+
+            print("=" * 78)
+            print(f"   {total:,} diagnósticos ({pacientes:,} pacientes) — mediana em ms")
+            print("=" * 78)
+            print(f"{'consulta':<28}{'sem índice':>14}{'com índice':>14}{'speedup':>12}")
+            for nome in CONSULTAS:
+                speedup = sem_indice[nome] / com_indice[nome] if com_indice[nome] > 0 else float("inf")
+                print(f"{nome:<28}{sem_indice[nome]:>14.3f}{com_indice[nome]:>14.3f}{speedup:>11.1f}x")
+            print("-" * 78)
+            for nome, plano in planos(engine).items():
+                print(f"{nome}: {plano}")
+
+            engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
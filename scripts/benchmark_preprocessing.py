@@ -0,0 +1,88 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import argparse
+import tempfile
+import time
+
+import numpy as np
+from PIL import Image
+
+from src.inference.preprocessing import preprocess_batch
+
+
+def preprocess_legacy(image_path: str) -> np.ndarray:
+    """Caminho antigo do ToolTriagem: uma imagem por vez, com temporários por etapa."""
+    img = Image.open(image_path).convert('RGB')
+    img = img.resize((224, 224))
+
+    img_array = np.array(img, dtype=np.float32)
+    img_array = img_array - np.mean(img_array)
+
+    std = np.std(img_array)
+    if std > 0:
+        img_array = img_array / std
+
+    return np.expand_dims(img_array, axis=0)
+
+
+def gerar_imagens(destino: Path, quantidade: int, tamanho: int) -> list:
+    rng = np.random.default_rng(42)
+    caminhos = []
+    for i in range(quantidade):
+        pixels = rng.integers(0, 256, size=(tamanho, tamanho), dtype=np.uint8)
+        caminho = destino / f"xray_{i:05d}.png"
+        Image.fromarray(pixels, mode="L").save(caminho)
+        caminhos.append(str(caminho))
+    return caminhos
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compara o pré-processamento por imagem com o pré-processamento em lote')
+    parser.add_argument('--dir', type=Path, help='Diretório com imagens reais (padrão: imagens sintéticas)')
+    parser.add_argument('--quantidade', type=int, default=64, help='Número de imagens sintéticas')
+    parser.add_argument('--tamanho', type=int, default=1024, help='Lado das imagens sintéticas em pixels')
+    parser.add_argument('--workers', type=int, default=4, help='Threads de decodificação')
+    parser.add_argument('--repeticoes', type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.dir:
+            caminhos = sorted(str(p) for p in args.dir.iterdir() if p.suffix.lower() in {".png", ".jpg", ".jpeg"})
+        else:
+            caminhos = gerar_imagens(Path(tmp), args.quantidade, args.tamanho)
+
+        n = len(caminhos)
+        if n == 0:
+            print("Nenhuma imagem encontrada.")
+            return
+
+        buffer = np.empty((n, 224, 224, 3), dtype=np.float32)
+
+        legado, lote = [], []
+        for _ in range(args.repeticoes):
+            inicio = time.perf_counter()
+            esperado = np.concatenate([preprocess_legacy(c) for c in caminhos])
+            legado.append(time.perf_counter() - inicio)
+
+            inicio = time.perf_counter()
+            preprocess_batch(caminhos, out=buffer, max_workers=args.workers)
+            lote.append(time.perf_counter() - inicio)
+
+        diferenca = float(np.max(np.abs(esperado - buffer)))
+
+    print("\n" + "=" * 50)
+    print("   BENCHMARK DE PRÉ-PROCESSAMENTO")
+    print("=" * 50)
+    print(f"Imagens:            {n}")
+    print(f"Por imagem (PIL):   {n / min(legado):8.1f} img/s")
+    print(f"Em lote ({args.workers} thr):   {n / min(lote):8.1f} img/s")
+    print(f"Speedup:            {min(legado) / min(lote):8.2f}x")
+    print(f"Diferença máxima:   {diferenca:.2e}")
+    print("=" * 50 + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import argparse
+import tempfile
+import time
+
+from sqlalchemy import event
+
+from src.agents.database.tools import ToolDatabase
+from src.config import Settings
+from src.database.connection import DatabaseConnection
+from src.database.models import Diagnosis, Patient
+
+
+def gerar_id_anterior(database: DatabaseConnection, prefixo: str, modelo) -> str:
+    """Geração de ID antes da mudança: uma sessão aninhada, fora da transação do INSERT."""
+    with database.get_session() as session:
+        ultimo = session.query(modelo).order_by(modelo.id.desc()).first()
+        if not ultimo:
+            return f"{prefixo}001"
+        try:
+            return f"{prefixo}{int(ultimo.id[1:]) + 1:03d}"
+        except ValueError:
+            return f"{prefixo}001"
+
+
+def cadastro_anterior(database: DatabaseConnection, patient_id: str):
+    """Caminho de escrita antes da mudança: SELECT do paciente, ID em sessão aninhada, commit explícito e commit do contexto."""
+    with database.get_session() as session:
+        paciente = session.query(Patient).filter(Patient.id == patient_id).first()
+        if not paciente:
+            return {"erro": "paciente"}
+        novo = Diagnosis(
+            id=gerar_id_anterior(database, "D", Diagnosis),
+            patient_id=patient_id,
+            classification="PNEUMONIA",
+            confidence=0.9,
+            priority="HIGH"
+        )
+        session.add(novo)
+        session.commit()
+        return {"diagnostico": novo.to_dict()}
+
+
+def preparar(caminho: str, total_pacientes: int, **settings) -> tuple:
+    database = DatabaseConnection(Settings(database_url=f"sqlite:///{caminho}", **settings))
+    database.init_database()
+    tool = ToolDatabase(database)
+    pacientes = [
+        tool.cadastrar_paciente(f"Paciente {i}", cpf=f"{i:011d}")["paciente"]["id"]
+        for i in range(total_pacientes)
+    ]
+    tool.cadastrar_diagnostico(pacientes[0], "NORMAL", 0.5, "BAIXA")
+    return database, pacientes
+
+
+def medir(database: DatabaseConnection, funcao, pacientes: list, total: int) -> dict:
+    statements = []
+    engine = database.get_engine()
+
+    def contar(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", contar)
+    inicio = time.perf_counter()
+    for i in range(total):
+        resultado = funcao(pacientes[i % len(pacientes)])
+        assert "erro" not in resultado, resultado
+    duracao = time.perf_counter() - inicio
+    event.remove(engine, "before_cursor_execute", contar)
+
+    return {
+        "por_segundo": total / duracao,
+        "ms_por_insert": duracao * 1000.0 / total,
+        "statements_por_insert": len(statements) / total,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compara a vazão de cadastrar_diagnostico antes e depois da remoção das consultas prévias')
+    parser.add_argument('--total', type=int, default=2000, help='Diagnósticos inseridos por cenário')
+    parser.add_argument('--pacientes', type=int, default=100)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # Um banco por cenário: o alocador de IDs guarda o último ID em memória.
+        # O caminho antigo abre uma segunda sessão com a primeira ainda aberta, o que
+        # só funciona com o BEGIN implícito (diferido) da configuração anterior.
+        antes, pacientes = preparar(f"{tmp}/antes.db", args.pacientes, sqlite_begin_immediate=False)
+        depois, _ = preparar(f"{tmp}/depois.db", args.pacientes)
+        tool = ToolDatabase(depois)
+
+        resultados = {
+            "antes": medir(antes, lambda p: cadastro_anterior(antes, p), pacientes, args.total),
+            "depois": medir(depois, lambda p: tool.cadastrar_diagnostico(p, "PNEUMONIA", 0.9, "ALTA"), pacientes, args.total),
+        }
+        antes.get_engine().dispose()
+        depois.get_engine().dispose()
+
+    print("=" * 64)
+    print(f"   cadastrar_diagnostico — {args.total:,} inserts")
+    print("=" * 64)
+    print(f"{'cenário':<10}{'inserts/s':>14}{'ms/insert':>14}{'statements':>14}")
+    for nome, r in resultados.items():
+        print(f"{nome:<10}{r['por_segundo']:>14.1f}{r['ms_por_insert']:>14.3f}{r['statements_por_insert']:>14.1f}")
+    print("-" * 64)
+    print(f"speedup: {resultados['depois']['por_segundo'] / resultados['antes']['por_segundo']:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
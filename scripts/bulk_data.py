@@ -0,0 +1,66 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import argparse
+from src.container import container
+from src.database.bulk import ENTITIES, FORMATS, BulkExporter, BulkImporter
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Importa e exporta pacientes, diagnósticos e histórico em massa')
+    subparsers = parser.add_subparsers(dest='comando', required=True)
+
+    importar = subparsers.add_parser('importar', help='Importa (upsert) um arquivo CSV, JSONL ou Parquet')
+    importar.add_argument('entidade', choices=list(ENTITIES))
+    importar.add_argument('arquivo', type=Path)
+    importar.add_argument('--formato', choices=FORMATS, help='Padrão: extensão do arquivo')
+    importar.add_argument('--chunk-size', type=int, default=5000, help='Linhas por transação')
+    importar.add_argument(
+        '--on-conflict',
+        choices=['update', 'ignore'],
+        default='update',
+        help='Registro já existente (mesmo ID ou CPF): atualizar ou manter'
+    )
+
+    exportar = subparsers.add_parser('exportar', help='Exporta uma tabela para CSV, JSONL ou Parquet')
+    exportar.add_argument('entidade', choices=list(ENTITIES))
+    exportar.add_argument('arquivo', type=Path)
+    exportar.add_argument('--formato', choices=FORMATS, help='Padrão: extensão do arquivo')
+    exportar.add_argument('--chunk-size', type=int, default=5000, help='Linhas lidas por bloco')
+
+    args = parser.parse_args()
+
+    print("\n" + "=" * 50)
+    print(f"   {args.comando.upper()} {args.entidade.upper()}")
+    print("=" * 50 + "\n")
+
+    database = container.database
+    database.init_database()
+
+    if args.comando == 'importar':
+        importer = BulkImporter(database, chunk_size=args.chunk_size, on_conflict=args.on_conflict)
+        resumo = importer.import_file(args.entidade, args.arquivo, args.formato, progresso=print)
+
+        print("\n" + "-" * 50)
+        print(f"Linhas lidas:       {resumo['lidas']}")
+        print(f"Gravadas:           {resumo['gravadas']}")
+        print(f"Rejeitadas:         {resumo['rejeitadas']}")
+        print(f"Tempo:              {resumo['segundos']:.2f}s")
+        print(f"Linhas/s:           {resumo['linhas_por_segundo']:.1f}")
+        for erro in resumo['erros'][:20]:
+            print(f"   ⚠️  {erro}")
+    else:
+        exporter = BulkExporter(database, chunk_size=args.chunk_size)
+        resumo = exporter.export_file(args.entidade, args.arquivo, args.formato, progresso=print)
+
+        print("\n" + "-" * 50)
+        print(f"Linhas exportadas:  {resumo['exportadas']}")
+        print(f"Arquivo:            {resumo['arquivo']}")
+        print(f"Tempo:              {resumo['segundos']:.2f}s")
+        print(f"Linhas/s:           {resumo['linhas_por_segundo']:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import argparse
+from src.agents.triagem.bulk import BulkTriagem
+from src.container import container
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Triagem em massa de raios-X sem passar pelo LLM')
+    parser.add_argument('origem', type=Path, help='Diretório de imagens ou manifesto CSV (image_path,patient_id)')
+    parser.add_argument('--patient-id', help='Paciente de todas as imagens do diretório')
+    parser.add_argument('--batch-size', type=int, default=32, help='Imagens por lote de inferência')
+    parser.add_argument('--created-by', default='bulk', help='Valor gravado em created_by')
+
+    args = parser.parse_args()
+
+    print("\n" + "=" * 50)
+    print("   TRIAGEM EM MASSA")
+    print("=" * 50 + "\n")
+
+    container.database.init_database()
+
+    bulk = BulkTriagem(
+        container.tool_triagem,
+        container.tool_database,
+        batch_size=args.batch_size,
+        created_by=args.created_by
+    )
+    resumo = bulk.executar(args.origem, patient_id=args.patient_id)
+    # Entrega os alertas ainda enfileirados antes de sair; emails pendentes ficam na caixa de saída.
+    container.event_bus.shutdown()
+    if container.tool_notification.dispatcher is not None:
+        container.tool_notification.dispatcher.stop()
+    alerta = container.event_bus.get_metrics()["subscribers"].get("alerta")
+
+    print("\n" + "-" * 50)
+    print(f"Imagens encontradas:  {resumo['encontradas']}")
+    print(f"Já processadas:       {resumo['ja_processadas']}")
+    print(f"Sem paciente:         {resumo['sem_paciente']}")
+    print(f"Registradas agora:    {resumo['registradas']}")
+    print(f"Erros:                {len(resumo['erros'])}")
+    print(f"Throughput:           {resumo['imagens_por_segundo']} img/s")
+    if alerta:
+        print(f"Alertas prioritários: {alerta['delivered']} (inferência → fila: p95 {alerta['end_to_end_ms']['p95']:.1f} ms)")
+    for erro in resumo['erros'][:20]:
+        print(f"  ❌ {erro['image_path']}: {erro['erro']}")
+    print("=" * 50 + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,7 +5,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 import argparse
 from src.database.seed import Seed
-from src.database.connection import DatabaseConnection
+from src.container import container
 
 def main():
     parser = argparse.ArgumentParser(description='Configura o banco de dados do sistema')
@@ -31,7 +31,7 @@ def main():
     print("   CONFIGURAÇÃO DO BANCO DE DADOS")
     print("=" * 50 + "\n")
     
-    database = DatabaseConnection()
+    database = container.database
     
     if args.reset:
         confirm = input("⚠️  ATENÇÃO: Isso irá APAGAR todos os dados. Confirmar? (s/N): ")
@@ -49,7 +49,7 @@ def main():
     
     if args.seed:
         print("\n" + "-" * 50)
-        seed = Seed()
+        seed = Seed(database)
         seed.run_seed()
     
     print("\n" + "=" * 50)
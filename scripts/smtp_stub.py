@@ -0,0 +1,117 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import argparse
+import asyncio
+import itertools
+import time
+
+
+class SMTPStub():
+    """Servidor SMTP mínimo (sem TLS/autenticação) para testar o envio de emails localmente.
+
+    Aceita EHLO/HELO, MAIL, RCPT, DATA, RSET, NOOP e QUIT, conta conexões e
+    mensagens e, opcionalmente, responde 451 a cada N mensagens para exercitar
+    as novas tentativas do dispatcher.
+    """
+
+    def __init__(self, fail_every: int = 0, latency_ms: float = 0.0, verbose: bool = False):
+        self.fail_every = fail_every
+        self.latency_ms = latency_ms
+        self.verbose = verbose
+        self.connections = 0
+        self.messages = 0
+        self.rejected = 0
+        self._counter = itertools.count(1)
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.connections += 1
+
+        async def reply(line: str):
+            writer.write(f"{line}\r\n".encode())
+            await writer.drain()
+
+        await reply("220 smtp-stub pronto")
+        destinatarios = []
+        try:
+            while line := await reader.readline():
+                comando = line.decode(errors="replace").strip()
+                verbo = comando.split(" ", 1)[0].upper()
+
+                if verbo == "EHLO":
+                    await reply("250-smtp-stub")
+                    await reply("250 8BITMIME")
+                elif verbo == "HELO":
+                    await reply("250 smtp-stub")
+                elif verbo == "MAIL":
+                    destinatarios = []
+                    await reply("250 OK")
+                elif verbo == "RCPT":
+                    destinatarios.append(comando.split(":", 1)[-1].strip())
+                    await reply("250 OK")
+                elif verbo == "DATA":
+                    await reply("354 Termine com <CRLF>.<CRLF>")
+                    tamanho = 0
+                    while (dados := await reader.readline()) not in (b".\r\n", b".\n", b""):
+                        tamanho += len(dados)
+                    if self.latency_ms:
+                        await asyncio.sleep(self.latency_ms / 1000.0)
+
+                    numero = next(self._counter)
+                    if self.fail_every and numero % self.fail_every == 0:
+                        self.rejected += 1
+                        await reply("451 Falha temporária simulada")
+                    else:
+                        self.messages += 1
+                        if self.verbose:
+                            print(f"📨 {', '.join(destinatarios)} ({tamanho} bytes)")
+                        await reply("250 OK: mensagem aceita")
+                elif verbo in ("RSET", "NOOP"):
+                    await reply("250 OK")
+                elif verbo == "QUIT":
+                    await reply("221 Até logo")
+                    break
+                else:
+                    await reply("502 Comando não implementado")
+        finally:
+            writer.close()
+
+    async def report(self, interval: float):
+        inicio = time.perf_counter()
+        while True:
+            await asyncio.sleep(interval)
+            decorrido = time.perf_counter() - inicio
+            print(
+                f"conexões: {self.connections}  mensagens: {self.messages}  "
+                f"rejeitadas: {self.rejected}  ({self.messages / decorrido:.1f} msg/s)"
+            )
+
+
+async def serve(args):
+    stub = SMTPStub(fail_every=args.falhar_a_cada, latency_ms=args.latencia_ms, verbose=args.verbose)
+    server = await asyncio.start_server(stub.handle, args.host, args.porta)
+    print(f"SMTP stub em {args.host}:{args.porta} (use SMTP_HOST={args.host} SMTP_PORT={args.porta} SMTP_USE_TLS=false)")
+    async with server:
+        await asyncio.gather(server.serve_forever(), stub.report(args.intervalo))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Servidor SMTP local para testar o envio de emails')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--porta', type=int, default=1025)
+    parser.add_argument('--falhar-a-cada', type=int, default=0, help='Responde 451 a cada N mensagens (0 = nunca)')
+    parser.add_argument('--latencia-ms', type=float, default=0.0, help='Atraso simulado por mensagem')
+    parser.add_argument('--intervalo', type=float, default=5.0, help='Segundos entre relatórios')
+    parser.add_argument('--verbose', action='store_true', help='Mostra cada mensagem recebida')
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
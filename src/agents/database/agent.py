@@ -1,18 +1,15 @@
-from src.config import Settings
-from .tools import ToolDatabase
+from src.container import container
 from google.adk.agents.llm_agent import Agent
-from google.adk.models.lite_llm import LiteLlm
-from src.database.connection import DatabaseConnection
 
 INSTRUCAO = """
 Você é o Agente de Banco de Dados do Sistema de Triagem Médica.
 
 FERRAMENTAS DISPONÍVEIS:
 • obter_paciente(paciente_id: str) - busca dados de UM paciente específico
-• listar_pacientes() - lista TODOS os pacientes cadastrados
+• listar_pacientes(limit, cursor, offset) - lista os pacientes cadastrados, em páginas
 • obter_historico_paciente(paciente_id: str) - busca histórico médico
-• obter_diagnostico(identificador: str) - busca diagnóstico por ID do paciente ou ID do diagnóstico
-• obter_diagnosticos() - busca todos os diagnósticos
+• obter_diagnostico(identificador: str, limit, cursor) - busca diagnóstico por ID do diagnóstico, ou os diagnósticos de um paciente (mais recentes primeiro)
+• obter_diagnosticos(limit, cursor, offset, priority, classification, data_inicio, data_fim) - busca diagnósticos com filtros, em páginas
 • cadastrar_paciente(name, ...) - cadastra um NOVO paciente e gera ID automaticamente
 • cadastrar_diagnostico(patient_id, classification, ...) - registra um NOVO diagnóstico
 • cadastrar_historico(patient_id, description, ...) - adiciona item ao histórico médico
@@ -70,6 +67,11 @@ REGRAS IMPORTANTES:
 - Responda em português brasileiro
 - Seja educado e profissional
 
+PAGINAÇÃO:
+- listar_pacientes, obter_diagnosticos e obter_diagnostico (por paciente) retornam uma página e o campo `proximo_cursor`.
+- Se `proximo_cursor` não for nulo e o usuário quiser mais resultados, chame a mesma ferramenta passando cursor=<proximo_cursor>.
+- Use os filtros (priority, classification, data_inicio, data_fim) em vez de buscar tudo e filtrar na resposta.
+
 TRATAMENTO DE DATAS E DADOS:
 - Se o usuário disser "hoje", "ontem", converta para o formato YYYY-MM-DD com base na data atual.
 - Se faltarem parâmetros OBRIGATÓRIOS (ex: tentar cadastrar paciente só com o nome), NÃO CHAME A TOOL.
@@ -77,11 +79,11 @@ TRATAMENTO DE DATAS E DADOS:
   Ex: "Para cadastrar, preciso também de pelo menos um contato ou data de nascimento."
 """
 
-database_connection = DatabaseConnection()
-tools_database = ToolDatabase(database_connection)
+database_connection = container.database
+tools_database = container.async_tool_database if container.settings.db_async_tools else container.tool_database
 
 database_agent = Agent(
-    model=LiteLlm(model=f"{Settings().ollama_model}", api_key=Settings().groq_api_key),
+    model=container.llm,
     name='database_agent',
     description='Agente de Banco de Dados. Responsável por buscar e CADASTRAR pacientes, históricos e diagnósticos.',
     instruction=INSTRUCAO,
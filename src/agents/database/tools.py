@@ -1,10 +1,23 @@
+import datetime
+
+from src.database import queries
+from src.database.async_connection import AsyncDatabaseConnection
 from src.database.connection import DatabaseConnection
+from src.database.errors import constraint_violation
+from src.database.ids import id_allocator
 from src.database.models import Patient, MedicalHistory, Diagnosis
-from sqlalchemy import or_
+from src.database.stats import diagnosis_stats
+from src.events import EventBus
+from sqlalchemy import insert, select
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+
+PACIENTE_SEM_DIAGNOSTICO = "Paciente {patient_id} não encontrado. Cadastre o paciente antes de registrar diagnóstico."
+PACIENTE_SEM_HISTORICO = "Paciente {patient_id} não encontrado."
 
 class ToolDatabase():
-    def __init__(self, database: DatabaseConnection):
+    def __init__(self, database: DatabaseConnection, events: EventBus = None):
         self.database = database
+        self.events = events
 
     def obter_paciente(self, paciente_id: str) -> dict:
         """Busca os dados de um paciente pelo ID.
@@ -15,7 +28,7 @@ class ToolDatabase():
         Returns:
             Dicionário com os dados do paciente
         """
-        with self.database.get_session() as session:
+        with self.database.get_read_session() as session:
             paciente = session.query(Patient).filter(Patient.id == paciente_id).first()
             if not paciente:
                 return {"erro": f"Paciente {paciente_id} não encontrado"}
@@ -30,70 +43,114 @@ class ToolDatabase():
         Returns:
             Lista com os registros do histórico médico
         """
-        with self.database.get_session() as session:
-            historico = session.query(MedicalHistory).filter(
-                MedicalHistory.patient_id == paciente_id
-            ).all()
-            if not historico:
-                return []
-            return [h.to_dict() for h in historico]
-
-    def listar_pacientes(self) -> list:
-        """Lista todos os pacientes cadastrados no sistema.
+        with self.database.get_read_session() as session:
+            historico = session.execute(queries.history_for_patient(paciente_id)).all()
+            return [queries.history_row_to_dict(h) for h in historico]
+
+    def listar_pacientes(self, limit: int = 50, cursor: str = None, offset: int = 0) -> dict:
+        """Lista os pacientes cadastrados no sistema, em páginas.
         
+        Args:
+            limit: Quantidade máxima de pacientes na página (padrão 50, máximo 200)
+            cursor: Valor de `proximo_cursor` da página anterior - opcional
+            offset: Quantidade de pacientes a pular quando não há cursor - opcional
+            
         Returns:
-            Lista com os dados de todos os pacientes
+            Dicionário com a lista de pacientes e o `proximo_cursor` (None na última página)
         """
-        with self.database.get_session() as session:
-            pacientes = session.query(Patient).all()
-            return [p.to_dict() for p in pacientes]
+        limit = queries.clamp_limit(limit)
+        try:
+            stmt = queries.patients_page(limit, cursor, offset)
+        except ValueError:
+            return {"erro": "Cursor inválido"}
+        
+        with self.database.get_read_session() as session:
+            linhas = session.execute(stmt).all()
+        
+        pagina, tem_mais = queries.split_page(linhas, limit)
+        return {
+            "pacientes": [queries.patient_row_to_dict(p) for p in pagina],
+            "proximo_cursor": str(pagina[-1].row_number) if tem_mais else None,
+        }
 
-    def obter_diagnosticos(self) -> list:
-        """Lista todos os diagnosticos cadastrados no sistema.
+    def obter_diagnosticos(
+        self,
+        limit: int = 50,
+        cursor: str = None,
+        offset: int = 0,
+        priority: str = None,
+        classification: str = None,
+        data_inicio: str = None,
+        data_fim: str = None
+    ) -> dict:
+        """Lista os diagnósticos cadastrados, do mais recente para o mais antigo, em páginas.
         
+        Args:
+            limit: Quantidade máxima de diagnósticos na página (padrão 50, máximo 200)
+            cursor: Valor de `proximo_cursor` da página anterior - opcional
+            offset: Quantidade de diagnósticos a pular quando não há cursor - opcional
+            priority: Filtra por prioridade (BAIXA, MÉDIA, ALTA, CRÍTICA) - opcional
+            classification: Filtra por classificação (NORMAL ou PNEUMONIA) - opcional
+            data_inicio: Data inicial (YYYY-MM-DD) - opcional
+            data_fim: Data final, inclusiva (YYYY-MM-DD) - opcional
+            
         Returns:
-            Lista com os dados de todos os diagnosticos
+            Dicionário com a lista de diagnósticos e o `proximo_cursor` (None na última página)
         """
-        with self.database.get_session() as session:
-            diagnosticos = session.query(Diagnosis).all()
-            return [d.to_dict() for d in diagnosticos]
-            
+        return self._pagina_diagnosticos(
+            limit, cursor, offset,
+            priority=priority,
+            classification=classification,
+            start=data_inicio,
+            end=data_fim
+        )
 
-    def obter_diagnostico(self, identificador: str) -> dict:
+    def _pagina_diagnosticos(self, limit: int, cursor: str, offset: int, **filtros) -> dict:
+        limit = queries.clamp_limit(limit)
+        try:
+            stmt = queries.diagnoses_page(limit, cursor, offset, **filtros)
+        except ValueError as e:
+            return {"erro": f"Parâmetro de paginação ou data inválido: {str(e)}"}
+        
+        with self.database.get_read_session() as session:
+            linhas = session.execute(stmt).all()
+        
+        pagina, tem_mais = queries.split_page(linhas, limit)
+        return {
+            "diagnosticos": [queries.diagnosis_row_to_dict(d) for d in pagina],
+            "proximo_cursor": queries.encode_diagnosis_cursor(pagina[-1]) if tem_mais else None,
+        }
+
+    def obter_diagnostico(self, identificador: str, limit: int = 20, cursor: str = None) -> dict:
         """Busca diagnóstico por ID do paciente ou ID do diagnóstico.
         
         Args:
             identificador: ID do paciente (ex: P001) ou ID do diagnóstico
+            limit: Para pacientes, quantidade máxima de diagnósticos na página (padrão 20)
+            cursor: Para pacientes, valor de `proximo_cursor` da página anterior - opcional
             
         Returns:
-            Dicionário ou lista com os dados do(s) diagnóstico(s)
+            Dicionário com o diagnóstico, ou com a página de diagnósticos do paciente
+            (mais recentes primeiro) e o `proximo_cursor`
         """
-        with self.database.get_session() as session:
-            diagnostico = session.query(Diagnosis).filter(Diagnosis.id == identificador).first()
+        with self.database.get_read_session() as session:
+            diagnostico = session.execute(
+                select(Diagnosis.__table__.c).where(Diagnosis.id == identificador)
+            ).first()
             if diagnostico:
-                return diagnostico.to_dict()
-            
-            diagnosticos = session.query(Diagnosis).filter(Diagnosis.patient_id == identificador).all()
-            if diagnosticos:
-                diagnosticos_ordenados = sorted(diagnosticos, key=lambda d: d.timestamp, reverse=True)
-                return [d.to_dict() for d in diagnosticos_ordenados]
-            
-            return {"erro": f"Nenhum diagnóstico encontrado para '{identificador}'"}
+                return queries.diagnosis_row_to_dict(diagnostico)
+        
+        resultado = self._pagina_diagnosticos(limit, cursor, 0, patient_id=identificador)
+        if resultado.get("diagnosticos"):
+            return resultado
+        if "erro" in resultado:
+            return resultado
+        
+        return {"erro": f"Nenhum diagnóstico encontrado para '{identificador}'"}
 
-    def _gerar_proximo_id(self, prefixo: str, modelo) -> str:
-        """Gera o próximo ID sequencial para um modelo (ex: P001 -> P002)."""
-        with self.database.get_session() as session:
-            ultimo = session.query(modelo).order_by(modelo.id.desc()).first()
-            
-            if not ultimo:
-                return f"{prefixo}001"
-            
-            try:
-                numero_atual = int(ultimo.id[1:])
-                proximo_numero = numero_atual + 1
-                return f"{prefixo}{proximo_numero:03d}"
-            except ValueError:
-                return f"{prefixo}001"
+    def _gerar_proximo_id(self, prefixo: str, modelo, session) -> str:
+        """Gera o próximo ID sequencial para um modelo (ex: P001 -> P002) na transação da sessão."""
+        return id_allocator.next_id(session, prefixo, modelo)
 
     def cadastrar_paciente(
         self, 
@@ -117,34 +174,66 @@ class ToolDatabase():
         Returns:
             Dicionário com os dados do paciente cadastrado e seu novo ID
         """
-        with self.database.get_session() as session:
-            if cpf:
-                existente = session.query(Patient).filter(Patient.cpf == cpf).first()
-                if existente:
-                    return {"erro": f"CPF {cpf} já cadastrado para o paciente {existente.name} (ID: {existente.id})"}
+        try:
+            with self.database.get_session() as session:
+                try:
+                    novo_paciente = Patient(
+                        id=self._gerar_proximo_id("P", Patient, session),
+                        name=name,
+                        birth_date=birth_date,
+                        cpf=cpf,
+                        contact=contact,
+                        email=email,
+                        address=address
+                    )
+                    session.add(novo_paciente)
+                    session.flush()
+                except IntegrityError as e:
+                    session.rollback()
+                    return self._erro_cadastro_paciente(e, cpf)
             
-            novo_id = self._gerar_proximo_id("P", Patient)
-            
-            novo_paciente = Patient(
-                id=novo_id,
-                name=name,
-                birth_date=birth_date,
-                cpf=cpf,
-                contact=contact,
-                email=email,
-                address=address
-            )
-            
-            try:
-                session.add(novo_paciente)
-                session.commit()
                 return {
                     "mensagem": "Paciente cadastrado com sucesso",
                     "paciente": novo_paciente.to_dict()
                 }
-            except Exception as e:
-                session.rollback()
-                return {"erro": f"Erro ao cadastrar paciente: {str(e)}"}
+        except SQLAlchemyError as e:
+            return self._erro_banco(e, "cadastrar paciente")
+
+    def _erro_cadastro_paciente(self, erro: IntegrityError, cpf: str) -> dict:
+        """Traduz a violação de restrição do INSERT de paciente; só consulta o banco no caminho de erro."""
+        tipo, alvo = constraint_violation(erro)
+        if tipo == "unique" and alvo == "patients.cpf":
+            with self.database.get_read_session() as session:
+                existente = session.execute(
+                    select(Patient.id, Patient.name).where(Patient.cpf == cpf)
+                ).first()
+            if existente:
+                return {"erro": f"CPF {cpf} já cadastrado para o paciente {existente.name} (ID: {existente.id})"}
+            return {"erro": f"CPF {cpf} já cadastrado"}
+        return {"erro": f"Erro ao cadastrar paciente: {str(erro.orig)}"}
+
+    def _erro_registro(self, erro: IntegrityError, patient_id: str, mensagem_paciente: str, contexto: str) -> dict:
+        """Traduz a violação de restrição do INSERT de diagnóstico/histórico."""
+        tipo, _ = constraint_violation(erro)
+        if tipo == "foreign_key":
+            return {"erro": mensagem_paciente.format(patient_id=patient_id)}
+        return {"erro": f"Erro ao registrar {contexto}: {str(erro.orig)}"}
+
+    def _erro_banco(self, erro: SQLAlchemyError, contexto: str) -> dict:
+        """Falha de banco que não é violação de restrição (ex: banco bloqueado); a sessão já desfez a transação."""
+        return {"erro": f"Erro ao {contexto}: {str(getattr(erro, 'orig', None) or erro)}"}
+
+    def _normalizar_diagnostico(self, classification: str, confidence, priority: str) -> dict:
+        """Valida e normaliza classificação, confiança e prioridade de um diagnóstico."""
+        try:
+            return queries.normalize_diagnosis(classification, confidence, priority)
+        except ValueError as e:
+            return {"erro": str(e)}
+
+    def _publicar(self, diagnosticos: list):
+        """Publica os diagnósticos já confirmados no banco; os de prioridade alta disparam alertas."""
+        if self.events is not None:
+            self.events.publish_diagnoses(diagnosticos)
 
     def cadastrar_diagnostico(
         self, 
@@ -170,56 +259,81 @@ class ToolDatabase():
         Returns:
             Dicionário com os dados do diagnóstico cadastrado
         """
-        if classification.upper() not in ["NORMAL", "PNEUMONIA"]:
-            return {"erro": f"Classificação inválida: {classification}. Use NORMAL ou PNEUMONIA."}
+        normalizado = self._normalizar_diagnostico(classification, confidence, priority)
+        if "erro" in normalizado:
+            return normalizado
 
-        prioridades_validas = ["BAIXA", "MÉDIA", "ALTA", "CRÍTICA", "LOW", "MEDIUM", "HIGH", "CRITICAL"]
-        if priority.upper() not in prioridades_validas:
-             return {"erro": f"Prioridade inválida: {priority}. Valores aceitos: {prioridades_validas}"}
+        try:
+            with self.database.get_session() as session:
+                try:
+                    novo_diagnostico = Diagnosis(
+                        id=self._gerar_proximo_id("D", Diagnosis, session),
+                        patient_id=patient_id,
+                        image_path=image_path,
+                        classification=normalizado["classification"],
+                        confidence=normalizado["confidence"],
+                        priority=normalizado["priority"],
+                        notes=notes,
+                        created_by=created_by
+                    )
+                    session.add(novo_diagnostico)
+                    session.flush()
+                    diagnosis_stats.record(session, [novo_diagnostico])
+                    diagnostico = novo_diagnostico.to_dict()
+                except IntegrityError as e:
+                    session.rollback()
+                    return self._erro_registro(e, patient_id, PACIENTE_SEM_DIAGNOSTICO, "diagnóstico")
+        except SQLAlchemyError as e:
+            return self._erro_banco(e, "registrar diagnóstico")
 
-        mapa_prioridade = {
-            "BAIXA": "LOW", "MÉDIA": "MEDIUM", "ALTA": "HIGH", "CRÍTICA": "CRITICAL",
-            "LOW": "LOW", "MEDIUM": "MEDIUM", "HIGH": "HIGH", "CRITICAL": "CRITICAL"
+        self._publicar([diagnostico])
+        return {
+            "mensagem": "Diagnóstico registrado com sucesso",
+            "diagnostico": diagnostico
         }
-        priority_en = mapa_prioridade.get(priority.upper(), priority.upper())
-
-        conf_float = confidence
-        if isinstance(confidence, str):
-            try:
-                conf_clean = confidence.replace("%", "")
-                conf_float = float(conf_clean)
-                if conf_float > 1.0:
-                     conf_float = conf_float / 100.0
-            except ValueError:
-                pass
-
-        with self.database.get_session() as session:
-            paciente = session.query(Patient).filter(Patient.id == patient_id).first()
-            if not paciente:
-                return {"erro": f"Paciente {patient_id} não encontrado. Cadastre o paciente antes de registrar diagnóstico."}
-            novo_id = self._gerar_proximo_id("D", Diagnosis)
-            
-            novo_diagnostico = Diagnosis(
-                id=novo_id,
-                patient_id=patient_id,
-                image_path=image_path,
-                classification=classification.upper(),
-                confidence=float(conf_float),
-                priority=priority_en,
-                notes=notes,
-                created_by=created_by
-            )
-            
-            try:
-                session.add(novo_diagnostico)
-                session.commit()
-                return {
-                    "mensagem": "Diagnóstico registrado com sucesso",
-                    "diagnostico": novo_diagnostico.to_dict()
-                }
-            except Exception as e:
-                session.rollback()
-                return {"erro": f"Erro ao registrar diagnóstico: {str(e)}"}
+
+    def cadastrar_diagnosticos_em_lote(self, diagnosticos: list) -> dict:
+        """Registra vários diagnósticos em uma única transação (uso interno, fora do LLM).
+
+        Cada item segue a mesma validação de `cadastrar_diagnostico` e precisa de
+        `patient_id`, `classification`, `confidence` e `priority`.
+
+        Returns:
+            Dicionário com os IDs inseridos e os itens rejeitados
+        """
+        linhas, aceitos, rejeitados = [], [], []
+        for item in diagnosticos:
+            normalizado = self._normalizar_diagnostico(item["classification"], item["confidence"], item["priority"])
+            if "erro" in normalizado:
+                rejeitados.append({"item": item, "erro": normalizado["erro"]})
+                continue
+            linhas.append({
+                "patient_id": item["patient_id"],
+                "image_path": item.get("image_path"),
+                "notes": item.get("notes"),
+                "created_by": item.get("created_by", "system"),
+                "timestamp": datetime.datetime.utcnow(),
+                **normalizado,
+            })
+            aceitos.append(item)
+
+        if not linhas:
+            return {"inseridos": [], "rejeitados": rejeitados}
+
+        try:
+            with self.database.get_session() as session:
+                novos_ids = id_allocator.reserve(session, "D", Diagnosis, len(linhas))
+                for linha, novo_id in zip(linhas, novos_ids):
+                    linha["id"] = novo_id
+                session.execute(insert(Diagnosis), linhas)
+                diagnosis_stats.record(session, linhas)
+        except SQLAlchemyError as e:
+            erro = self._erro_banco(e, "registrar diagnósticos")["erro"]
+            rejeitados.extend({"item": item, "erro": erro} for item in aceitos)
+            return {"inseridos": [], "rejeitados": rejeitados, "erro": erro}
+
+        self._publicar([{**linha, "timestamp": linha["timestamp"].isoformat()} for linha in linhas])
+        return {"inseridos": [linha["id"] for linha in linhas], "rejeitados": rejeitados}
 
     def cadastrar_historico(
         self, 
@@ -239,26 +353,286 @@ class ToolDatabase():
         Returns:
             Dicionário com o registro criado ou erro.
         """
-        with self.database.get_session() as session:
-            paciente = session.query(Patient).filter(Patient.id == patient_id).first()
-            if not paciente:
-                return {"erro": f"Paciente {patient_id} não encontrado."}
+        try:
+            with self.database.get_session() as session:
+                try:
+                    novo_historico = MedicalHistory(
+                        patient_id=patient_id,
+                        description=description,
+                        condition_type=condition_type,
+                        recorded_by=recorded_by
+                    )
+                    session.add(novo_historico)
+                    session.flush()
+                except IntegrityError as e:
+                    session.rollback()
+                    return self._erro_registro(e, patient_id, PACIENTE_SEM_HISTORICO, "histórico")
             
-            novo_historico = MedicalHistory(
-                patient_id=patient_id,
-                description=description,
-                condition_type=condition_type,
-                recorded_by=recorded_by
-            )
-            
-            try:
-                session.add(novo_historico)
-                session.commit()
                 return {
                     "mensagem": "Histórico registrado com sucesso",
                     "historico": novo_historico.to_dict()
                 }
-            except Exception as e:
-                session.rollback()
-                return {"erro": f"Erro ao registrar histórico: {str(e)}"}
-        
\ No newline at end of file
+        except SQLAlchemyError as e:
+            return self._erro_banco(e, "registrar histórico")
+        
+
+class AsyncToolDatabase(ToolDatabase):
+    """Mesmas ferramentas de `ToolDatabase`, com I/O assíncrono (aiosqlite).
+
+    Registradas no agente quando `db_async_tools` está ativo: as consultas não
+    bloqueiam o event loop do runner, então sessões de chat concorrentes
+    sobrepõem suas esperas no banco. Consultas e validações são as mesmas da
+    versão síncrona (`queries`, `_normalizar_diagnostico`, `id_allocator`).
+    """
+
+    def __init__(self, database: AsyncDatabaseConnection, events: EventBus = None):
+        self.database = database
+        self.events = events
+
+    async def obter_paciente(self, paciente_id: str) -> dict:
+        async with self.database.get_read_session() as session:
+            paciente = (await session.execute(
+                select(Patient.__table__.c).where(Patient.id == paciente_id)
+            )).first()
+            if not paciente:
+                return {"erro": f"Paciente {paciente_id} não encontrado"}
+            return queries.patient_row_to_dict(paciente)
+
+    async def obter_historico_paciente(self, paciente_id: str) -> list:
+        async with self.database.get_read_session() as session:
+            historico = (await session.execute(queries.history_for_patient(paciente_id))).all()
+            return [queries.history_row_to_dict(h) for h in historico]
+
+    async def listar_pacientes(self, limit: int = 50, cursor: str = None, offset: int = 0) -> dict:
+        limit = queries.clamp_limit(limit)
+        try:
+            stmt = queries.patients_page(limit, cursor, offset)
+        except ValueError:
+            return {"erro": "Cursor inválido"}
+
+        async with self.database.get_read_session() as session:
+            linhas = (await session.execute(stmt)).all()
+
+        pagina, tem_mais = queries.split_page(linhas, limit)
+        return {
+            "pacientes": [queries.patient_row_to_dict(p) for p in pagina],
+            "proximo_cursor": str(pagina[-1].row_number) if tem_mais else None,
+        }
+
+    async def obter_diagnosticos(
+        self,
+        limit: int = 50,
+        cursor: str = None,
+        offset: int = 0,
+        priority: str = None,
+        classification: str = None,
+        data_inicio: str = None,
+        data_fim: str = None
+    ) -> dict:
+        return await self._pagina_diagnosticos(
+            limit, cursor, offset,
+            priority=priority,
+            classification=classification,
+            start=data_inicio,
+            end=data_fim
+        )
+
+    async def _pagina_diagnosticos(self, limit: int, cursor: str, offset: int, **filtros) -> dict:
+        limit = queries.clamp_limit(limit)
+        try:
+            stmt = queries.diagnoses_page(limit, cursor, offset, **filtros)
+        except ValueError as e:
+            return {"erro": f"Parâmetro de paginação ou data inválido: {str(e)}"}
+
+        async with self.database.get_read_session() as session:
+            linhas = (await session.execute(stmt)).all()
+
+        pagina, tem_mais = queries.split_page(linhas, limit)
+        return {
+            "diagnosticos": [queries.diagnosis_row_to_dict(d) for d in pagina],
+            "proximo_cursor": queries.encode_diagnosis_cursor(pagina[-1]) if tem_mais else None,
+        }
+
+    async def obter_diagnostico(self, identificador: str, limit: int = 20, cursor: str = None) -> dict:
+        async with self.database.get_read_session() as session:
+            diagnostico = (await session.execute(
+                select(Diagnosis.__table__.c).where(Diagnosis.id == identificador)
+            )).first()
+            if diagnostico:
+                return queries.diagnosis_row_to_dict(diagnostico)
+
+        resultado = await self._pagina_diagnosticos(limit, cursor, 0, patient_id=identificador)
+        if resultado.get("diagnosticos"):
+            return resultado
+        if "erro" in resultado:
+            return resultado
+
+        return {"erro": f"Nenhum diagnóstico encontrado para '{identificador}'"}
+
+    async def _reservar_ids(self, session, prefixo: str, modelo, quantidade: int = 1) -> list:
+        return await session.run_sync(lambda s: id_allocator.reserve(s, prefixo, modelo, quantidade))
+
+    async def cadastrar_paciente(
+        self,
+        name: str,
+        birth_date: str = None,
+        cpf: str = None,
+        contact: str = None,
+        email: str = None,
+        address: str = None
+    ) -> dict:
+        try:
+            async with self.database.get_session() as session:
+                try:
+                    [novo_id] = await self._reservar_ids(session, "P", Patient)
+                    novo_paciente = Patient(
+                        id=novo_id,
+                        name=name,
+                        birth_date=birth_date,
+                        cpf=cpf,
+                        contact=contact,
+                        email=email,
+                        address=address
+                    )
+                    session.add(novo_paciente)
+                    await session.flush()
+                except IntegrityError as e:
+                    await session.rollback()
+                    return await self._erro_cadastro_paciente(e, cpf)
+
+                return {
+                    "mensagem": "Paciente cadastrado com sucesso",
+                    "paciente": novo_paciente.to_dict()
+                }
+        except SQLAlchemyError as e:
+            return self._erro_banco(e, "cadastrar paciente")
+
+    async def _erro_cadastro_paciente(self, erro: IntegrityError, cpf: str) -> dict:
+        tipo, alvo = constraint_violation(erro)
+        if tipo == "unique" and alvo == "patients.cpf":
+            async with self.database.get_read_session() as session:
+                existente = (await session.execute(
+                    select(Patient.id, Patient.name).where(Patient.cpf == cpf)
+                )).first()
+            if existente:
+                return {"erro": f"CPF {cpf} já cadastrado para o paciente {existente.name} (ID: {existente.id})"}
+            return {"erro": f"CPF {cpf} já cadastrado"}
+        return {"erro": f"Erro ao cadastrar paciente: {str(erro.orig)}"}
+
+    async def cadastrar_diagnostico(
+        self,
+        patient_id: str,
+        classification: str,
+        confidence: float,
+        priority: str,
+        image_path: str = None,
+        notes: str = None,
+        created_by: str = "system"
+    ) -> dict:
+        normalizado = self._normalizar_diagnostico(classification, confidence, priority)
+        if "erro" in normalizado:
+            return normalizado
+
+        try:
+            async with self.database.get_session() as session:
+                try:
+                    [novo_id] = await self._reservar_ids(session, "D", Diagnosis)
+                    novo_diagnostico = Diagnosis(
+                        id=novo_id,
+                        patient_id=patient_id,
+                        image_path=image_path,
+                        classification=normalizado["classification"],
+                        confidence=normalizado["confidence"],
+                        priority=normalizado["priority"],
+                        notes=notes,
+                        created_by=created_by
+                    )
+                    session.add(novo_diagnostico)
+                    await session.flush()
+                    await session.run_sync(lambda s: diagnosis_stats.record(s, [novo_diagnostico]))
+                    diagnostico = novo_diagnostico.to_dict()
+                except IntegrityError as e:
+                    await session.rollback()
+                    return self._erro_registro(e, patient_id, PACIENTE_SEM_DIAGNOSTICO, "diagnóstico")
+        except SQLAlchemyError as e:
+            return self._erro_banco(e, "registrar diagnóstico")
+
+        self._publicar([diagnostico])
+        return {
+            "mensagem": "Diagnóstico registrado com sucesso",
+            "diagnostico": diagnostico
+        }
+
+    async def cadastrar_diagnosticos_em_lote(self, diagnosticos: list) -> dict:
+        linhas, aceitos, rejeitados = [], [], []
+        for item in diagnosticos:
+            normalizado = self._normalizar_diagnostico(item["classification"], item["confidence"], item["priority"])
+            if "erro" in normalizado:
+                rejeitados.append({"item": item, "erro": normalizado["erro"]})
+                continue
+            linhas.append({
+                "patient_id": item["patient_id"],
+                "image_path": item.get("image_path"),
+                "notes": item.get("notes"),
+                "created_by": item.get("created_by", "system"),
+                "timestamp": datetime.datetime.utcnow(),
+                **normalizado,
+            })
+            aceitos.append(item)
+
+        if not linhas:
+            return {"inseridos": [], "rejeitados": rejeitados}
+
+        try:
+            async with self.database.get_session() as session:
+                novos_ids = await self._reservar_ids(session, "D", Diagnosis, len(linhas))
+                for linha, novo_id in zip(linhas, novos_ids):
+                    linha["id"] = novo_id
+                await session.execute(insert(Diagnosis), linhas)
+                await session.run_sync(lambda s: diagnosis_stats.record(s, linhas))
+        except SQLAlchemyError as e:
+            erro = self._erro_banco(e, "registrar diagnósticos")["erro"]
+            rejeitados.extend({"item": item, "erro": erro} for item in aceitos)
+            return {"inseridos": [], "rejeitados": rejeitados, "erro": erro}
+
+        self._publicar([{**linha, "timestamp": linha["timestamp"].isoformat()} for linha in linhas])
+        return {"inseridos": [linha["id"] for linha in linhas], "rejeitados": rejeitados}
+
+    async def cadastrar_historico(
+        self,
+        patient_id: str,
+        description: str,
+        condition_type: str = "observacao",
+        recorded_by: str = "system"
+    ) -> dict:
+        try:
+            async with self.database.get_session() as session:
+                try:
+                    novo_historico = MedicalHistory(
+                        patient_id=patient_id,
+                        description=description,
+                        condition_type=condition_type,
+                        recorded_by=recorded_by
+                    )
+                    session.add(novo_historico)
+                    await session.flush()
+                except IntegrityError as e:
+                    await session.rollback()
+                    return self._erro_registro(e, patient_id, PACIENTE_SEM_HISTORICO, "histórico")
+
+                return {
+                    "mensagem": "Histórico registrado com sucesso",
+                    "historico": novo_historico.to_dict()
+                }
+        except SQLAlchemyError as e:
+            return self._erro_banco(e, "registrar histórico")
+
+
+# O agente lê a documentação das ferramentas: mantém as versões assíncronas
+# com o mesmo texto das síncronas.
+for _nome in (
+    "obter_paciente", "obter_historico_paciente", "listar_pacientes", "obter_diagnosticos",
+    "obter_diagnostico", "cadastrar_paciente", "cadastrar_diagnostico", "cadastrar_diagnosticos_em_lote",
+    "cadastrar_historico",
+):
+    getattr(AsyncToolDatabase, _nome).__doc__ = getattr(ToolDatabase, _nome).__doc__
@@ -1,7 +1,5 @@
 from google.adk.agents.llm_agent import Agent
-from google.adk.models.lite_llm import LiteLlm
-from .tools import ToolNotification
-from src.config import Settings
+from src.container import container
 
 
 INSTRUCAO = """
@@ -26,6 +24,14 @@ FERRAMENTAS DISPONÍVEIS:
      • diagnostico: resultado do diagnóstico
      • recomendacao: ação recomendada para a equipe
 
+3. listar_alertas(apenas_nao_lidos, cursor, limit)
+   - Lista os alertas registrados para a equipe (por padrão, só os não lidos), em páginas
+   - Use quando: perguntarem por alertas pendentes ou recentes
+
+4. marcar_alertas_lidos(alerta_ids)
+   - Marca alertas como lidos, pelo `id` retornado em listar_alertas
+   - Use quando: a equipe confirmar que viu os alertas
+
 QUANDO USAR CADA FERRAMENTA:
 
 | Situação                           | Ação                    |
@@ -35,6 +41,10 @@ QUANDO USAR CADA FERRAMENTA:
 | Resultado normal                   | Apenas Email            |
 | Caso crítico/urgente               | Alerta imediato         |
 
+Diagnósticos com prioridade ALTA ou CRÍTICA já geram alerta automático ao
+serem cadastrados (origem "automatico" em listar_alertas): não envie outro
+alerta para o mesmo diagnóstico.
+
 FORMATO DA RESPOSTA:
 Após enviar as notificações, confirme ao usuário:
 
@@ -52,12 +62,17 @@ Não use frases como "Aqui estão os dados", "Vou buscar no banco".
 Formate direto com negrito e listas. Seja extremamente técnico.
 """
 
-notification_tools = ToolNotification()
+notification_tools = container.tool_notification
 
 notification_agent = Agent(
-    model=LiteLlm(model=f"{Settings().ollama_model}", api_key=Settings().groq_api_key),
+    model=container.llm,
     name='notification_agent',
     description='Agente de Notificação, envia notificação para o paciente e alerta de caso crítico para a equipe utilizando as ferramentas disponiveis.',
     instruction=INSTRUCAO,
-    tools=[notification_tools.enviar_alerta, notification_tools.enviar_email]
+    tools=[
+        notification_tools.enviar_alerta,
+        notification_tools.enviar_email,
+        notification_tools.listar_alertas,
+        notification_tools.marcar_alertas_lidos
+    ]
 )   
\ No newline at end of file
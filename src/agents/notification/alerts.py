@@ -0,0 +1,220 @@
+import datetime
+import json
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+from src.metrics import LatencyTracker
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS alerts (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    timestamp TEXT NOT NULL,
+    paciente TEXT,
+    diagnostico TEXT,
+    recomendacao TEXT,
+    dados TEXT
+);
+CREATE TABLE IF NOT EXISTS alert_reads (
+    seq INTEGER PRIMARY KEY,
+    read_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS alert_consumers (
+    consumer TEXT PRIMARY KEY,
+    seq INTEGER NOT NULL
+);
+"""
+
+COLUMNS = "a.seq, a.timestamp, a.paciente, a.diagnostico, a.recomendacao, a.dados, r.read_at"
+
+
+def _row_to_dict(row) -> dict:
+    alerta = {
+        "id": row[0],
+        "timestamp": row[1],
+        "paciente": row[2],
+        "diagnostico": row[3],
+        "recomendacao": row[4],
+        "lido": row[6] is not None,
+    }
+    if row[5]:
+        alerta["dados"] = json.loads(row[5])
+    return alerta
+
+
+class AlertStore():
+    """Fila de alertas append-only em SQLite (WAL), substituindo o `alerts_queue.json`.
+
+    Cada alerta é um único INSERT, com custo independente do tamanho da fila,
+    e escritores concorrentes (threads ou processos) não perdem alertas. O
+    `id` (seq) é crescente e serve de cursor para os consumidores, que podem
+    registrar até onde leram com `commit`. Marcar como lido grava em uma
+    tabela à parte, sem reescrever o histórico; `compact` remove alertas já
+    lidos e consumidos por todos.
+    """
+
+    def __init__(self, db_path: Path, busy_timeout_ms: int = 5000):
+        self.db_path = Path(db_path)
+        self.busy_timeout_ms = busy_timeout_ms
+        self._local = threading.local()
+        self.append_ms = LatencyTracker()
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._connection().executescript(SCHEMA)
+
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(
+                self.db_path,
+                timeout=self.busy_timeout_ms / 1000.0,
+                isolation_level=None,
+                check_same_thread=False
+            )
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute(f"PRAGMA busy_timeout={int(self.busy_timeout_ms)}")
+            self._local.connection = connection
+        return connection
+
+
+    def append(self, paciente: str, diagnostico: str, recomendacao: str, **dados) -> int:
+        """Registra um alerta e retorna seu id (seq)."""
+        inicio = time.perf_counter()
+        cursor = self._connection().execute(
+            "INSERT INTO alerts (timestamp, paciente, diagnostico, recomendacao, dados) VALUES (?, ?, ?, ?, ?)",
+            (
+                datetime.datetime.now().isoformat(),
+                paciente,
+                diagnostico,
+                recomendacao,
+                json.dumps(dados, ensure_ascii=False) if dados else None,
+            )
+        )
+        self.append_ms.observe((time.perf_counter() - inicio) * 1000.0)
+        return cursor.lastrowid
+
+
+    def read(self, after: int = 0, limit: int = 100, unread_only: bool = False) -> list:
+        """Alertas com id maior que `after`, em ordem de chegada."""
+        sql = f"SELECT {COLUMNS} FROM alerts a LEFT JOIN alert_reads r ON r.seq = a.seq WHERE a.seq > ?"
+        if unread_only:
+            sql += " AND r.seq IS NULL"
+        sql += " ORDER BY a.seq LIMIT ?"
+        return [_row_to_dict(row) for row in self._connection().execute(sql, (int(after or 0), int(limit)))]
+
+
+    def mark_read(self, ids: list) -> int:
+        """Marca alertas como lidos; retorna quantos não estavam marcados."""
+        agora = datetime.datetime.now().isoformat()
+        connection = self._connection()
+        antes = connection.total_changes
+        connection.executemany(
+            "INSERT OR IGNORE INTO alert_reads (seq, read_at) "
+            "SELECT seq, ? FROM alerts WHERE seq = ?",
+            [(agora, int(i)) for i in ids]
+        )
+        return connection.total_changes - antes
+
+
+    def offset(self, consumer: str) -> int:
+        row = self._connection().execute("SELECT seq FROM alert_consumers WHERE consumer = ?", (consumer,)).fetchone()
+        return row[0] if row else 0
+
+
+    def consume(self, consumer: str, limit: int = 100) -> list:
+        """Próximos alertas ainda não confirmados por `consumer` (confirme com `commit`)."""
+        return self.read(self.offset(consumer), limit)
+
+
+    def commit(self, consumer: str, seq: int):
+        """Avança o cursor do consumidor; nunca retrocede."""
+        self._connection().execute(
+            "INSERT INTO alert_consumers (consumer, seq) VALUES (?, ?) "
+            "ON CONFLICT(consumer) DO UPDATE SET seq = max(seq, excluded.seq)",
+            (consumer, int(seq))
+        )
+
+
+    def compact(self, retention_days: int = 30) -> int:
+        """Remove alertas lidos, mais antigos que `retention_days` e já consumidos por todos os consumidores.
+
+        Returns:
+            Quantidade de alertas removidos
+        """
+        limite = (datetime.datetime.now() - datetime.timedelta(days=retention_days)).isoformat()
+        connection = self._connection()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            removidos = connection.execute(
+                "DELETE FROM alerts WHERE timestamp < ? "
+                "AND seq IN (SELECT seq FROM alert_reads) "
+                "AND seq <= coalesce((SELECT min(seq) FROM alert_consumers), "
+                "                    (SELECT max(seq) FROM alerts))",
+                (limite,)
+            ).rowcount
+            connection.execute("DELETE FROM alert_reads WHERE seq NOT IN (SELECT seq FROM alerts)")
+            connection.execute("COMMIT")
+        except Exception:
+            connection.execute("ROLLBACK")
+            raise
+
+        if removidos:
+            connection.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            logger.info(f"Compactação de alertas: {removidos} removidos")
+        return removidos
+
+
+    def count(self, unread_only: bool = False) -> int:
+        sql = "SELECT count(*) FROM alerts"
+        if unread_only:
+            sql += " WHERE seq NOT IN (SELECT seq FROM alert_reads)"
+        return self._connection().execute(sql).fetchone()[0]
+
+
+    def import_legacy(self, json_path: Path) -> int:
+        """Migra um `alerts_queue.json` antigo (lista de alertas) e o renomeia para `.migrated`."""
+        json_path = Path(json_path)
+        if not json_path.exists():
+            return 0
+
+        with open(json_path, 'r') as f:
+            fila = json.load(f)
+
+        connection = self._connection()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            for alerta in fila:
+                seq = connection.execute(
+                    "INSERT INTO alerts (timestamp, paciente, diagnostico, recomendacao) VALUES (?, ?, ?, ?)",
+                    (
+                        alerta.get("timestamp") or datetime.datetime.now().isoformat(),
+                        alerta.get("paciente"),
+                        alerta.get("diagnostico"),
+                        alerta.get("recomendacao"),
+                    )
+                ).lastrowid
+                if alerta.get("lido"):
+                    connection.execute(
+                        "INSERT INTO alert_reads (seq, read_at) VALUES (?, ?)",
+                        (seq, datetime.datetime.now().isoformat())
+                    )
+            connection.execute("COMMIT")
+        except Exception:
+            connection.execute("ROLLBACK")
+            raise
+
+        json_path.rename(json_path.with_name(json_path.name + ".migrated"))
+        logger.info(f"{len(fila)} alertas migrados de {json_path}")
+        return len(fila)
+
+
+    def get_metrics(self) -> dict:
+        return {
+            "append_ms": self.append_ms.snapshot(),
+        }
@@ -0,0 +1,304 @@
+import datetime
+import logging
+import smtplib
+import sqlite3
+import threading
+import time
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+from pathlib import Path
+
+from src.config import Settings
+from src.metrics import LatencyTracker
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS email_outbox (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    created_at TEXT NOT NULL,
+    destinatario TEXT NOT NULL,
+    assunto TEXT NOT NULL,
+    corpo TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at REAL NOT NULL DEFAULT 0,
+    last_error TEXT,
+    sent_at TEXT
+);
+CREATE INDEX IF NOT EXISTS ix_email_outbox_pending ON email_outbox (status, next_attempt_at);
+"""
+
+
+def _is_connection_error(erro: Exception) -> bool:
+    """Falha da conexão (não da mensagem): a sessão SMTP é descartada e recriada."""
+    if isinstance(erro, (smtplib.SMTPServerDisconnected, smtplib.SMTPConnectError)):
+        return True
+    return isinstance(erro, OSError) and not isinstance(erro, smtplib.SMTPException)
+
+
+def _is_permanent(erro: Exception) -> bool:
+    """Respostas 5xx e destinatários recusados não melhoram com novas tentativas."""
+    if isinstance(erro, smtplib.SMTPRecipientsRefused):
+        return True
+    return isinstance(erro, smtplib.SMTPResponseException) and erro.smtp_code >= 500
+
+
+class EmailDispatcher():
+    """Envio de emails em segundo plano, a partir de uma caixa de saída durável.
+
+    `enqueue` só grava a mensagem na tabela `email_outbox` (SQLite) e retorna;
+    `workers` threads, cada uma com sua própria sessão SMTP reutilizada entre
+    envios (STARTTLS e login uma vez por conexão), reivindicam lotes de até
+    `batch_size` mensagens e as enviam em sequência. Falhas voltam para a fila
+    com backoff exponencial até `max_attempts`; mensagens que estavam em envio
+    quando o processo parou são retomadas na próxima inicialização.
+    """
+
+    def __init__(
+        self,
+        settings: Settings,
+        db_path: Path,
+        workers: int = 2,
+        batch_size: int = 20,
+        max_attempts: int = 5,
+        backoff_seconds: float = 2.0,
+        idle_timeout: float = 60.0
+    ):
+        self.settings = settings
+        self.db_path = Path(db_path)
+        self.workers = max(1, workers)
+        self.batch_size = max(1, batch_size)
+        self.max_attempts = max(1, max_attempts)
+        self.backoff_seconds = backoff_seconds
+        self.idle_timeout = idle_timeout
+
+        self._local = threading.local()
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._threads = []
+        self._lock = threading.Lock()
+
+        self.sent = 0
+        self.failed = 0
+        self.retried = 0
+        self.connections_opened = 0
+        self.send_ms = LatencyTracker()
+        self.batch_size_observed = LatencyTracker()
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._connection().executescript(SCHEMA)
+
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "db", None)
+        if connection is None:
+            connection = sqlite3.connect(
+                self.db_path,
+                timeout=self.settings.sqlite_busy_timeout_ms / 1000.0,
+                isolation_level=None,
+                check_same_thread=False
+            )
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.db = connection
+        return connection
+
+
+    def enqueue(self, destinatario: str, assunto: str, corpo: str) -> int:
+        """Grava a mensagem na caixa de saída e acorda os workers; não faz I/O de rede."""
+        cursor = self._connection().execute(
+            "INSERT INTO email_outbox (created_at, destinatario, assunto, corpo) VALUES (?, ?, ?, ?)",
+            (datetime.datetime.now().isoformat(), destinatario, assunto, corpo)
+        )
+        self._wakeup.set()
+        return cursor.lastrowid
+
+
+    def start(self):
+        with self._lock:
+            if self._threads:
+                return
+            recuperadas = self._connection().execute(
+                "UPDATE email_outbox SET status = 'pending' WHERE status = 'sending'"
+            ).rowcount
+            if recuperadas:
+                logger.info(f"{recuperadas} emails retomados da execução anterior")
+
+            self._stopping.clear()
+            self._threads = [
+                threading.Thread(target=self._run, name=f"email-dispatcher-{i}", daemon=True)
+                for i in range(self.workers)
+            ]
+            for thread in self._threads:
+                thread.start()
+
+
+    def stop(self, timeout: float = 10.0):
+        self._stopping.set()
+        self._wakeup.set()
+        for thread in self._threads:
+            thread.join(timeout=timeout)
+        self._threads = []
+
+
+    def is_running(self) -> bool:
+        return any(thread.is_alive() for thread in self._threads)
+
+
+    def _claim(self) -> list:
+        """Reivindica atomicamente o próximo lote de mensagens prontas para envio."""
+        return self._connection().execute(
+            "UPDATE email_outbox SET status = 'sending', attempts = attempts + 1 "
+            "WHERE id IN ("
+            "    SELECT id FROM email_outbox WHERE status = 'pending' AND next_attempt_at <= ? "
+            "    ORDER BY id LIMIT ?"
+            ") RETURNING id, destinatario, assunto, corpo, attempts",
+            (time.time(), self.batch_size)
+        ).fetchall()
+
+
+    def _smtp(self) -> smtplib.SMTP:
+        smtp = getattr(self._local, "smtp", None)
+        if smtp is not None and time.monotonic() - self._local.last_used > self.idle_timeout:
+            self._close_smtp()
+            smtp = None
+
+        if smtp is None:
+            smtp = smtplib.SMTP(self.settings.smtp_host, self.settings.smtp_port, timeout=30)
+            try:
+                if self.settings.smtp_use_tls:
+                    smtp.starttls()
+                if self.settings.smtp_user and self.settings.smtp_password:
+                    smtp.login(self.settings.smtp_user, self.settings.smtp_password)
+            except Exception:
+                smtp.close()
+                raise
+            self._local.smtp = smtp
+            self.connections_opened += 1
+        return smtp
+
+
+    def _close_smtp(self):
+        smtp = getattr(self._local, "smtp", None)
+        self._local.smtp = None
+        if smtp is not None:
+            try:
+                smtp.quit()
+            except Exception:
+                smtp.close()
+
+
+    def _message(self, destinatario: str, assunto: str, corpo: str) -> MIMEMultipart:
+        msg = MIMEMultipart()
+        msg['From'] = self.settings.smtp_user or f"triagem@{self.settings.smtp_host}"
+        msg['To'] = destinatario
+        msg['Subject'] = assunto
+        msg.attach(MIMEText(corpo, 'plain'))
+        return msg
+
+
+    def _send(self, email_id: int, destinatario: str, assunto: str, corpo: str, attempts: int):
+        inicio = time.perf_counter()
+        try:
+            self._smtp().send_message(self._message(destinatario, assunto, corpo))
+            self._local.last_used = time.monotonic()
+        except Exception as e:
+            if _is_connection_error(e):
+                self._close_smtp()
+            self._fail(email_id, self.max_attempts if _is_permanent(e) else attempts, e)
+            return
+
+        self.send_ms.observe((time.perf_counter() - inicio) * 1000.0)
+        self._connection().execute(
+            "UPDATE email_outbox SET status = 'sent', sent_at = ?, last_error = NULL WHERE id = ?",
+            (datetime.datetime.now().isoformat(), email_id)
+        )
+        self.sent += 1
+
+
+    def _fail(self, email_id: int, attempts: int, erro: Exception):
+        if attempts >= self.max_attempts:
+            status, next_attempt_at = "failed", 0
+            self.failed += 1
+            logger.error(f"Email {email_id} descartado após {attempts} tentativas: {erro}")
+        else:
+            status = "pending"
+            next_attempt_at = time.time() + min(self.backoff_seconds * 2 ** (attempts - 1), 300.0)
+            self.retried += 1
+            logger.warning(f"Falha ao enviar email {email_id} (tentativa {attempts}): {erro}")
+
+        self._connection().execute(
+            "UPDATE email_outbox SET status = ?, next_attempt_at = ?, last_error = ? WHERE id = ?",
+            (status, next_attempt_at, str(erro), email_id)
+        )
+
+
+    def _requeue(self, lote: list):
+        """Devolve à fila as mensagens do lote que ficaram presas em envio."""
+        if not lote:
+            return
+        ids = [linha[0] for linha in lote]
+        try:
+            self._connection().execute(
+                f"UPDATE email_outbox SET status = 'pending' "
+                f"WHERE status = 'sending' AND id IN ({', '.join('?' * len(ids))})",
+                ids
+            )
+        except sqlite3.Error as e:
+            logger.warning(f"Não foi possível devolver o lote à fila: {e}")
+
+
+    def _next_wakeup(self) -> float:
+        row = self._connection().execute(
+            "SELECT min(next_attempt_at) FROM email_outbox WHERE status = 'pending'"
+        ).fetchone()
+        if row[0] is None:
+            return self.idle_timeout
+        return min(max(row[0] - time.time(), 0.05), self.idle_timeout)
+
+
+    def _run(self):
+        self._local.last_used = time.monotonic()
+        while not self._stopping.is_set():
+            # Limpa antes de reivindicar: um enqueue concorrente nunca perde o aviso.
+            self._wakeup.clear()
+            lote = []
+            try:
+                lote = self._claim()
+                if not lote:
+                    self._wakeup.wait(self._next_wakeup())
+                    continue
+
+                self.batch_size_observed.observe(len(lote))
+                for email_id, destinatario, assunto, corpo, attempts in lote:
+                    self._send(email_id, destinatario, assunto, corpo, attempts)
+            except sqlite3.OperationalError as e:
+                logger.warning(f"Caixa de saída ocupada: {e}")
+                self._requeue(lote)
+                self._stopping.wait(self.backoff_seconds)
+            except Exception as e:
+                # Um erro inesperado não pode derrubar o worker: devolve o lote à fila e segue.
+                logger.exception(f"Erro no envio de e-mails: {e}")
+                self._close_smtp()
+                self._requeue(lote)
+                self._stopping.wait(self.backoff_seconds)
+
+        self._close_smtp()
+
+
+    def get_metrics(self) -> dict:
+        pendentes = dict(self._connection().execute(
+            "SELECT status, count(*) FROM email_outbox WHERE status IN ('pending', 'sending', 'failed') GROUP BY status"
+        ).fetchall())
+        return {
+            "running": self.is_running(),
+            "workers": self.workers,
+            "sent": self.sent,
+            "failed": self.failed,
+            "retried": self.retried,
+            "connections_opened": self.connections_opened,
+            "queue": pendentes,
+            "batch_size": self.batch_size_observed.snapshot(),
+            "send_ms": self.send_ms.snapshot(),
+        }
@@ -0,0 +1,88 @@
+import json
+import urllib.request
+
+from src.config import Settings
+from src.events import DIAGNOSTICO_PRIORITARIO, Event, EventBus
+from .tools import ToolNotification
+
+PRIORIDADES = {"HIGH": "ALTA", "CRITICAL": "CRÍTICA"}
+
+
+def _resumo(diagnostico: dict) -> str:
+    prioridade = PRIORIDADES.get(diagnostico.get("priority"), diagnostico.get("priority"))
+    return f"{diagnostico.get('classification')} - prioridade {prioridade} (diagnóstico {diagnostico.get('id')})"
+
+
+class AlertSubscriber():
+    """Registra o diagnóstico prioritário na fila de alertas da equipe."""
+
+    def __init__(self, tool_notification: ToolNotification):
+        self.alerts = tool_notification.alerts
+
+    def __call__(self, event: Event):
+        diagnostico = event.payload
+        self.alerts.append(
+            diagnostico.get("patient_id"),
+            _resumo(diagnostico),
+            diagnostico.get("notes") or "Avaliação médica imediata",
+            diagnostico_id=diagnostico.get("id"),
+            origem="automatico"
+        )
+
+
+class EmailSubscriber():
+    """Enfileira um email para a equipe médica (não para o paciente) na caixa de saída."""
+
+    def __init__(self, tool_notification: ToolNotification, destinatarios: list):
+        self.tool_notification = tool_notification
+        self.destinatarios = destinatarios
+
+    def __call__(self, event: Event):
+        diagnostico = event.payload
+        dispatcher = self.tool_notification.get_dispatcher()
+        corpo = f"""
+        Caso prioritário registrado no sistema de triagem.
+
+        Paciente: {diagnostico.get('patient_id')}
+        Resultado: {_resumo(diagnostico)}
+        Recomendação: {diagnostico.get('notes') or '-'}
+        Imagem: {diagnostico.get('image_path') or '-'}
+        """
+        for destinatario in self.destinatarios:
+            dispatcher.enqueue(destinatario, f"[ALERTA] Paciente {diagnostico.get('patient_id')}", corpo)
+
+
+class WebhookSubscriber():
+    """Envia o diagnóstico como JSON (POST) para um endpoint externo."""
+
+    def __init__(self, url: str, timeout: float = 5.0):
+        self.url = url
+        self.timeout = timeout
+
+    def __call__(self, event: Event):
+        corpo = json.dumps({"evento": event.topic, "diagnostico": event.payload}, ensure_ascii=False, default=str)
+        request = urllib.request.Request(
+            self.url,
+            data=corpo.encode("utf-8"),
+            headers={"Content-Type": "application/json"},
+            method="POST"
+        )
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            response.read()
+
+
+def register_subscribers(event_bus: EventBus, settings: Settings, tool_notification: ToolNotification) -> list:
+    """Assina alerta, email (se houver destinatários) e webhook (se houver URL) nos diagnósticos prioritários."""
+    subscriptions = [event_bus.subscribe(DIAGNOSTICO_PRIORITARIO, "alerta", AlertSubscriber(tool_notification))]
+
+    destinatarios = [email.strip() for email in settings.alert_email_to.split(",") if email.strip()]
+    if destinatarios and not tool_notification.simula_email():
+        subscriptions.append(event_bus.subscribe(
+            DIAGNOSTICO_PRIORITARIO, "email", EmailSubscriber(tool_notification, destinatarios)
+        ))
+
+    if settings.alert_webhook_url:
+        subscriptions.append(event_bus.subscribe(
+            DIAGNOSTICO_PRIORITARIO, "webhook", WebhookSubscriber(settings.alert_webhook_url, settings.alert_webhook_timeout)
+        ))
+    return subscriptions
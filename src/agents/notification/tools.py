@@ -1,23 +1,53 @@
-import smtplib
-import json
-import datetime
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
+import threading
 from pathlib import Path
-from src.config import Settings
+from src.config import Settings, settings as default_settings
+from .alerts import AlertStore
+from .dispatcher import EmailDispatcher
 
 class ToolNotification():
-    def __init__(self):
-        self.settings = Settings()
-        self.alerts_file = self.settings.data_dir / "alerts_queue.json"
-        
-        if not self.alerts_file.exists():
-            with open(self.alerts_file, 'w') as f:
-                json.dump([], f)
+    def __init__(self, settings: Settings = None):
+        self.settings = settings if settings is not None else default_settings
+        self.alerts = AlertStore(
+            self.settings.data_dir / "notifications.db",
+            busy_timeout_ms=self.settings.sqlite_busy_timeout_ms
+        )
+        self.alerts.import_legacy(self.settings.data_dir / "alerts_queue.json")
+        self.dispatcher = None
+        self._dispatcher_lock = threading.Lock()
+
+    def simula_email(self) -> bool:
+        """Envio apenas simulado: `EMAIL_SIMULATE` explícito ou, sem ele, servidor SMTP não configurado.
+
+        Sem `SMTP_HOST` (ou com o exemplo padrão) não há para onde enviar; com
+        usuário e sem senha o login falharia. Relays sem autenticação enviam de verdade.
+        """
+        if self.settings.email_simulate is not None:
+            return self.settings.email_simulate
+        host = self.settings.smtp_host.strip()
+        if not host or host == Settings.model_fields["smtp_host"].default:
+            return True
+        return bool(self.settings.smtp_user) and not self.settings.smtp_password
+
+    def get_dispatcher(self) -> EmailDispatcher:
+        """Dispatcher de emails, criado e iniciado no primeiro uso."""
+        with self._dispatcher_lock:
+            if self.dispatcher is None:
+                self.dispatcher = EmailDispatcher(
+                    self.settings,
+                    self.settings.data_dir / "notifications.db",
+                    workers=self.settings.email_workers,
+                    batch_size=self.settings.email_batch_size,
+                    max_attempts=self.settings.email_max_attempts
+                )
+            if not self.dispatcher.is_running():
+                self.dispatcher.start()
+            return self.dispatcher
 
     def enviar_email(self, email: str, paciente: str, diagnostico: str, recomendacao: str) -> dict:
         """Envia um email para o paciente com o resultado do seu exame.
         
+        O email é gravado na fila de envio e despachado em segundo plano.
+        
         Args:
             email: O endereço de email do paciente
             paciente: Nome completo do paciente
@@ -25,18 +55,13 @@ class ToolNotification():
             recomendacao: As recomendações médicas a serem seguidas
             
         Returns:
-            Dicionário confirmando o status do envio
+            Dicionário confirmando o status do envio e o ID do email na fila
         """
-        if not self.settings.smtp_user or not self.settings.smtp_password:
+        if self.simula_email():
             print(f"[SIMULADO] Email para {email}: Diagnóstico {diagnostico}")
             return {"status": "sucesso", "mensagem": f"Email simualdo enviado para {email} (Configure SMTP no .env para envio real)"}
 
         try:
-            msg = MIMEMultipart()
-            msg['From'] = self.settings.smtp_user
-            msg['To'] = email
-            msg['Subject'] = f"Resultado de Exame - {paciente}"
-
             corpo = f"""
             Olá {paciente},
 
@@ -47,16 +72,14 @@ class ToolNotification():
             Atenciosamente,
             Equipe do Sistema de Triagem Médica
             """
-            msg.attach(MIMEText(corpo, 'plain'))
-
-            with smtplib.SMTP(self.settings.smtp_host, self.settings.smtp_port) as server:
-                server.starttls()
-                server.login(self.settings.smtp_user, self.settings.smtp_password)
-                server.send_message(msg)
-
-            return {"status": "sucesso", "mensagem": f"Email enviado com sucesso para {email}"}
+            email_id = self.get_dispatcher().enqueue(email, f"Resultado de Exame - {paciente}", corpo)
+            return {
+                "status": "sucesso",
+                "mensagem": f"Email para {email} na fila de envio",
+                "email_id": email_id
+            }
         except Exception as e:
-            return {"status": "erro", "mensagem": f"Falha ao enviar email: {str(e)}"}
+            return {"status": "erro", "mensagem": f"Falha ao enfileirar email: {str(e)}"}
 
     def enviar_alerta(self, paciente: str, diagnostico: str, recomendacao: str) -> dict:
         """Envia um alerta para o sistema (fila de comunicação interna).
@@ -70,22 +93,48 @@ class ToolNotification():
             Dicionário confirmando o registro do alerta
         """
         try:
-            alerta = {
-                "timestamp": datetime.datetime.now().isoformat(),
-                "paciente": paciente,
-                "diagnostico": diagnostico,
-                "recomendacao": recomendacao,
-                "lido": False
+            alerta_id = self.alerts.append(paciente, diagnostico, recomendacao)
+            return {
+                "status": "sucesso",
+                "mensagem": f"Alerta registrado no sistema para o paciente {paciente}",
+                "alerta_id": alerta_id
             }
+        except Exception as e:
+            return {"status": "erro", "mensagem": f"Falha ao registrar alerta: {str(e)}"}
 
-            with open(self.alerts_file, 'r') as f:
-                fila = json.load(f)
-
-            fila.append(alerta)
-
-            with open(self.alerts_file, 'w') as f:
-                json.dump(fila, f, indent=4)
+    def listar_alertas(self, apenas_nao_lidos: bool = True, cursor: int = 0, limit: int = 20) -> dict:
+        """Lista os alertas da equipe médica, dos mais antigos para os mais novos.
+        
+        Args:
+            apenas_nao_lidos: Se True, retorna só os alertas ainda não lidos (padrão True)
+            cursor: Valor de `proximo_cursor` da página anterior - opcional
+            limit: Quantidade máxima de alertas (padrão 20, máximo 200)
+            
+        Returns:
+            Dicionário com a lista de alertas e o `proximo_cursor` (None na última página)
+        """
+        try:
+            limit = max(1, min(int(limit), 200))
+            alertas = self.alerts.read(after=cursor or 0, limit=limit + 1, unread_only=apenas_nao_lidos)
+            pagina = alertas[:limit]
+            return {
+                "alertas": pagina,
+                "proximo_cursor": pagina[-1]["id"] if len(alertas) > limit else None
+            }
+        except Exception as e:
+            return {"status": "erro", "mensagem": f"Falha ao listar alertas: {str(e)}"}
 
-            return {"status": "sucesso", "mensagem": f"Alerta registrado no sistema para o paciente {paciente}"}
+    def marcar_alertas_lidos(self, alerta_ids: list) -> dict:
+        """Marca alertas como lidos pela equipe.
+        
+        Args:
+            alerta_ids: Lista com os IDs dos alertas (campo `id` de listar_alertas)
+            
+        Returns:
+            Dicionário com a quantidade de alertas marcados
+        """
+        try:
+            marcados = self.alerts.mark_read(alerta_ids)
+            return {"status": "sucesso", "marcados": marcados}
         except Exception as e:
-            return {"status": "erro", "mensagem": f"Falha ao registrar alerta: {str(e)}"}
\ No newline at end of file
+            return {"status": "erro", "mensagem": f"Falha ao marcar alertas: {str(e)}"}
\ No newline at end of file
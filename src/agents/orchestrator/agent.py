@@ -1,7 +1,6 @@
 # src/agents/orchestrator/agent.py
 from google.adk.agents.llm_agent import Agent
-from google.adk.models.lite_llm import LiteLlm
-from src.config import Settings
+from src.container import container
 from src.agents.database.agent import database_agent
 from src.agents.notification.agent import notification_agent
 from src.agents.report.agent import report_agent
@@ -31,7 +30,7 @@ Estou aqui para coordenar todos os agentes especializados e facilitar seu trabal
 
 4 **report_agent** - Especialista em Relatórios
    • Função: Gera relatórios PDF e Estatísticas.
-   • COMO DELEGAR: "Peça ao report_agent para gerar estatísticas usando estes dados: [dados]".
+   • COMO DELEGAR: "Peça ao report_agent para gerar estatísticas [do período X]".
 
 ═══════════════════════════════════════════════════════════════════════
 
@@ -48,7 +47,9 @@ Estou aqui para coordenar todos os agentes especializados e facilitar seu trabal
       - Delegue para `triagem_agent` para analisar a imagem.
    4. Recebeu o resultado?
       - **AÇÃO AUTOMÁTICA:** Delegue para `database_agent` para CADASTRAR O DIAGNÓSTICO.
-   5. Informe o médico e PERGUNTE sobre notificação da equipe.
+      - Prioridade ALTA ou CRÍTICA: o alerta para a equipe é disparado automaticamente ao cadastrar.
+        NÃO peça ao `notification_agent` um alerta repetido para o mesmo diagnóstico.
+   5. Informe o médico e PERGUNTE sobre notificação do paciente.
 
 **FLUXO 2: Consulta e Cadastro**
    - Transfira o pedido para o `database_agent` descrevendo o que deve ser feito.
@@ -60,8 +61,10 @@ Estou aqui para coordenar todos os agentes especializados e facilitar seu trabal
 
 **FLUXO 4: Relatórios e Estatísticas (IMPORTANTE)**
    1. Usuário: "Gere estatísticas..."
-   2. PRIMEIRO: Delegue para `database_agent` buscando todos os diagnósticos.
-   3. DEPOIS: Com a resposta, delegue para `report_agent` enviando os dados para gerar estatísticas.
+   2. Delegue direto para `report_agent` (informando o período, se houver).
+      - NÃO busque a lista de diagnósticos antes: o `report_agent` lê as estatísticas já agregadas no banco.
+   3. Relatório PDF: delegue direto para `report_agent` com o ID do diagnóstico ou do paciente.
+      - NÃO busque nem repasse os dados do diagnóstico: o `report_agent` os lê do banco.
 
 ═══════════════════════════════════════════════════════════════════════
 
@@ -96,7 +99,7 @@ Formate direto com negrito e listas. Seja extremamente técnico.
 """
 
 root_agent = Agent(
-    model=LiteLlm(model=f"{Settings().ollama_model}", api_key=Settings().groq_api_key),
+    model=container.llm,
     name='orchestrator',
     description='Orquestrador central do sistema de triagem médica por raio-X. Coordena análise de imagens, gerenciamento de dados, notificações e relatórios.',
     instruction=INSTRUCAO,
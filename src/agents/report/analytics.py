@@ -0,0 +1,158 @@
+import datetime
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import select
+
+from src.database import queries
+from src.database.connection import DatabaseConnection
+from src.database.models import Diagnosis
+
+COLUMNS = ("timestamp", "classification", "priority", "confidence", "created_by")
+
+CATEGORIES = ("classification", "priority", "created_by")
+
+
+def normalize_confidence(values: pd.Series) -> pd.Series:
+    """Converte confianças mistas (0.87, "87%", "0.87", 87) para frações em [0, 1], de forma vetorizada.
+
+    Valores com "%" são sempre percentuais ("0.5%" é 0.005); só números sem
+    "%" acima de 1 são tratados como percentuais.
+    """
+    percent = pd.Series(False, index=values.index)
+    if not pd.api.types.is_numeric_dtype(values):
+        text = values.astype("string").str.strip()
+        percent = text.str.endswith("%").fillna(False).astype(bool)
+        values = pd.to_numeric(text.str.rstrip("%"), errors="coerce")
+    values = values.astype("float64")
+    return values.where(~percent & (values <= 1.0), values / 100.0)
+
+
+def _rate_series(frame: pd.DataFrame, freq: str, window: int, limit: int, **resample) -> list:
+    """Taxa de positividade por período e sua média móvel (ponderada pelo volume)."""
+    grouped = frame.set_index("timestamp").resample(freq, **resample)["positive"].agg(["sum", "count"])
+    rolling = grouped.rolling(window, min_periods=1).sum()
+    rate = (grouped["sum"] / grouped["count"].where(grouped["count"] > 0)).round(4)
+    rolling_rate = (rolling["sum"] / rolling["count"].where(rolling["count"] > 0)).round(4)
+
+    result = pd.DataFrame({
+        "periodo": grouped.index.strftime("%Y-%m-%d"),
+        "total": grouped["count"].to_numpy(),
+        "positivos": grouped["sum"].to_numpy().astype(int),
+        "taxa": rate.to_numpy(),
+        "taxa_movel": rolling_rate.to_numpy(),
+    }).tail(limit)
+    return result.replace({np.nan: None}).to_dict("records")
+
+
+class DiagnosisAnalytics():
+    """Estatísticas de séries temporais dos diagnósticos, vetorizadas com pandas/NumPy.
+
+    Os diagnósticos são lidos coluna a coluna direto do SQLite (engine somente
+    leitura), sem passar por dicts nem pelo LLM; as saídas são resumos
+    compactos (séries cortadas nos últimos períodos) para o agente de
+    relatórios apresentar.
+    """
+
+    def __init__(self, database: DatabaseConnection):
+        self.database = database
+
+    def load(self, start: str = None, end: str = None, patient_id: str = None) -> pd.DataFrame:
+        columns = Diagnosis.__table__.c
+        stmt = select(*(columns[name] for name in COLUMNS))
+        if patient_id:
+            stmt = stmt.where(columns.patient_id == patient_id)
+        if start:
+            stmt = stmt.where(columns.timestamp >= queries.parse_date(start))
+        if end:
+            stmt = stmt.where(columns.timestamp < queries.parse_date(end) + datetime.timedelta(days=1))
+
+        with self.database.get_read_engine().connect() as connection:
+            frame = pd.read_sql_query(stmt, connection, parse_dates=["timestamp"])
+        return self.prepare(frame)
+
+    @staticmethod
+    def prepare(frame: pd.DataFrame) -> pd.DataFrame:
+        """Normaliza tipos: confiança em fração, categorias, classificação/prioridade em maiúsculas."""
+        frame = frame.copy()
+        for name in CATEGORIES:
+            if name not in frame:
+                frame[name] = None
+            frame[name] = frame[name].astype("string").str.strip()
+        frame["classification"] = frame["classification"].str.upper()
+        frame["priority"] = frame["priority"].str.upper().replace(queries.PRIORITY_MAP)
+        for name in CATEGORIES:
+            frame[name] = frame[name].fillna("DESCONHECIDO").astype("category")
+
+        frame["confidence"] = normalize_confidence(frame["confidence"]) if "confidence" in frame else np.nan
+        if "timestamp" in frame:
+            frame["timestamp"] = pd.to_datetime(frame["timestamp"], errors="coerce")
+        frame["positive"] = (frame["classification"] == "PNEUMONIA").astype("int8")
+        return frame
+
+    def positivity(self, frame: pd.DataFrame, window_days: int = 7, limit: int = 30) -> dict:
+        dated = frame.dropna(subset=["timestamp"])
+        if dated.empty:
+            return {"diaria": [], "semanal": []}
+        return {
+            "diaria": _rate_series(dated, "D", window_days, limit),
+            # Semanas de segunda a domingo, rotuladas pela segunda-feira em que começam.
+            "semanal": _rate_series(dated, "W-MON", 4, max(1, limit // 2), closed="left", label="left"),
+        }
+
+    def priority_distribution(self, frame: pd.DataFrame) -> dict:
+        counts = frame["priority"].value_counts(sort=True)
+        counts = counts[counts > 0]
+        share = (counts / max(len(frame), 1)).round(4)
+        return {str(p): {"total": int(counts[p]), "proporcao": float(share[p])} for p in counts.index}
+
+    def confidence_histogram(self, frame: pd.DataFrame, bins: int = 10) -> dict:
+        values = frame["confidence"].dropna().to_numpy()
+        counts, edges = np.histogram(values, bins=bins, range=(0.0, 1.0))
+        return {
+            "faixas": [f"{edges[i]:.1f}-{edges[i + 1]:.1f}" for i in range(len(counts))],
+            "contagens": counts.tolist(),
+            "media": round(float(values.mean()), 4) if values.size else None,
+            "mediana": round(float(np.median(values)), 4) if values.size else None,
+            "invalidas": int(frame["confidence"].isna().sum()),
+        }
+
+    def operator_throughput(self, frame: pd.DataFrame, limit: int = 20) -> list:
+        dated = frame.assign(day=frame["timestamp"].dt.floor("D"))
+        grouped = dated.groupby("created_by", observed=True).agg(
+            total=("positive", "size"),
+            positivos=("positive", "sum"),
+            dias_ativos=("day", "nunique"),
+            confianca_media=("confidence", "mean"),
+        )
+        grouped["por_dia"] = (grouped["total"] / grouped["dias_ativos"].clip(lower=1)).round(2)
+        grouped["taxa_positividade"] = (grouped["positivos"] / grouped["total"]).round(4)
+        grouped["confianca_media"] = grouped["confianca_media"].round(4)
+        grouped = grouped.sort_values("total", ascending=False).head(limit)
+        return (
+            grouped.reset_index()
+            .astype({"created_by": str})
+            .replace({np.nan: None})
+            .to_dict("records")
+        )
+
+    def summary(self, frame: pd.DataFrame, window_days: int = 7, limit: int = 30) -> dict:
+        total = len(frame)
+        if total == 0:
+            return {"total_diagnosticos": 0}
+        positives = int(frame["positive"].sum())
+        dated = frame["timestamp"].dropna()
+        return {
+            "total_diagnosticos": total,
+            "pneumonia": positives,
+            "normal": total - positives,
+            "taxa_pneumonia": round(positives / total, 4),
+            "periodo": {
+                "inicio": dated.min().strftime("%Y-%m-%d") if not dated.empty else None,
+                "fim": dated.max().strftime("%Y-%m-%d") if not dated.empty else None,
+            },
+            "positividade": self.positivity(frame, window_days, limit),
+            "por_prioridade": self.priority_distribution(frame),
+            "confianca": self.confidence_histogram(frame),
+            "por_operador": self.operator_throughput(frame),
+        }
@@ -0,0 +1,88 @@
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from .pdf import DEFAULT_TEMPLATE, load_template
+
+_template_path = DEFAULT_TEMPLATE
+_thumbnail_px = 256
+
+
+def _init_worker(template_path: str, thumbnail_px: int):
+    """Compila o template uma vez por processo, antes do primeiro relatório."""
+    global _template_path, _thumbnail_px
+    _template_path, _thumbnail_px = Path(template_path), thumbnail_px
+    load_template(_template_path)
+
+
+def render_job(job: tuple) -> tuple:
+    """Renderiza um relatório: (context, image_path, output_path) -> (output_path, páginas, erro)."""
+    context, image_path, output_path = job
+    try:
+        template = load_template(_template_path)
+        data = template.render(context, image_path, thumbnail_px=_thumbnail_px)
+        output_path = Path(output_path)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        temporario = output_path.with_suffix(f".{os.getpid()}.tmp")
+        temporario.write_bytes(data)
+        os.replace(temporario, output_path)
+        return str(output_path), template.pages, None
+    except Exception as e:
+        return str(output_path), 0, str(e)
+
+
+class BatchReportRenderer():
+    """Geração de relatórios PDF em lote, distribuída em um pool de processos.
+
+    Cada processo compila o template (e as tabelas de fonte) na inicialização
+    e reaproveita para todos os relatórios que receber; lotes pequenos, em que
+    subir o pool custaria mais que renderizar, rodam no próprio processo.
+    """
+
+    def __init__(
+        self,
+        workers: int = 0,
+        template_path: Path = DEFAULT_TEMPLATE,
+        thumbnail_px: int = 256,
+        chunksize: int = 8,
+        min_parallel: int = 32
+    ):
+        self.workers = workers if workers > 0 else (os.cpu_count() or 1)
+        self.template_path = Path(template_path)
+        self.thumbnail_px = thumbnail_px
+        self.chunksize = max(1, chunksize)
+        self.min_parallel = min_parallel
+
+    def render(self, jobs: list) -> dict:
+        """Renderiza os jobs `(context, image_path, output_path)`.
+
+        Returns:
+            Resumo com relatórios e páginas gerados, erros, tempo e páginas por segundo
+        """
+        inicio = time.perf_counter()
+        if self.workers <= 1 or len(jobs) < self.min_parallel:
+            _init_worker(str(self.template_path), self.thumbnail_px)
+            resultados = [render_job(job) for job in jobs]
+        else:
+            # spawn: o servidor já tem threads (TF, agendador, eventos, SMTP) e um fork
+            # herdaria travas que elas seguram.
+            with ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(str(self.template_path), self.thumbnail_px)
+            ) as pool:
+                resultados = list(pool.map(render_job, jobs, chunksize=self.chunksize))
+        segundos = time.perf_counter() - inicio
+
+        paginas = sum(p for _, p, _ in resultados)
+        return {
+            "relatorios": sum(1 for _, _, erro in resultados if erro is None),
+            "paginas": paginas,
+            "arquivos": [caminho for caminho, _, erro in resultados if erro is None],
+            "erros": [{"arquivo": caminho, "erro": erro} for caminho, _, erro in resultados if erro],
+            "segundos": round(segundos, 3),
+            "paginas_por_segundo": round(paginas / segundos, 1) if segundos > 0 else None,
+        }
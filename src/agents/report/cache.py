@@ -0,0 +1,68 @@
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+
+
+def report_fingerprint(context: dict, image_path: str, template_version: str) -> str:
+    """Impressão digital do conteúdo do relatório: muda quando diagnóstico, paciente, histórico ou template mudam.
+
+    O horário de emissão (`gerado_em`) fica de fora, para que o mesmo
+    diagnóstico inalterado reaproveite o PDF já gerado.
+    """
+    dados = {k: v for k, v in context.items() if k != "gerado_em"}
+    payload = json.dumps([dados, image_path, template_version], sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+class ReportCache():
+    """PDFs já renderizados, um arquivo por diagnóstico e impressão digital.
+
+    Um relatório é reaproveitado enquanto a impressão digital do seu conteúdo
+    for a mesma; ao gravar uma nova versão de um diagnóstico (porque ele, o
+    paciente ou o template mudaram), as versões anteriores são removidas.
+    """
+
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidated = 0
+
+    def path_for(self, diagnosis_id: str, fingerprint: str) -> Path:
+        return self.directory / f"relatorio_{diagnosis_id}_{fingerprint}.pdf"
+
+    def get(self, diagnosis_id: str, fingerprint: str) -> Path:
+        """Caminho do PDF em cache, ou None se não existe versão com essa impressão digital."""
+        caminho = self.path_for(diagnosis_id, fingerprint)
+        with self._lock:
+            if caminho.exists():
+                self.hits += 1
+                return caminho
+            self.misses += 1
+            return None
+
+    def put(self, diagnosis_id: str, fingerprint: str, data: bytes) -> Path:
+        caminho = self.path_for(diagnosis_id, fingerprint)
+        temporario = caminho.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        temporario.write_bytes(data)
+        os.replace(temporario, caminho)
+        self.prune(diagnosis_id, fingerprint)
+        return caminho
+
+    def prune(self, diagnosis_id: str, fingerprint: str) -> int:
+        """Remove as versões de `diagnosis_id` com impressão digital diferente da atual."""
+        removidos = 0
+        for antigo in self.directory.glob(f"relatorio_{diagnosis_id}_*.pdf"):
+            if antigo.name != self.path_for(diagnosis_id, fingerprint).name:
+                antigo.unlink(missing_ok=True)
+                removidos += 1
+        with self._lock:
+            self.invalidated += removidos
+        return removidos
+
+    def get_metrics(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses, "invalidated": self.invalidated}
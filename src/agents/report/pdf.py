@@ -0,0 +1,322 @@
+import datetime
+import functools
+import io
+import json
+import re
+import unicodedata
+import zlib
+from pathlib import Path
+
+TEMPLATES_DIR = Path(__file__).parent / "templates"
+DEFAULT_TEMPLATE = TEMPLATES_DIR / "diagnostico.json"
+
+# Larguras (1/1000 em) dos caracteres 32-126 das fontes padrão do PDF, das AFM da Adobe.
+# Letras acentuadas têm a largura da letra base.
+FONT_WIDTHS = {
+    "Helvetica": (
+        "278 278 355 556 556 889 667 191 333 333 389 584 278 333 278 278 556 556 556 556 556 556 556 556 556 556 "
+        "278 278 584 584 584 556 1015 667 667 722 722 667 611 778 722 278 500 667 556 833 722 778 667 778 722 667 "
+        "611 722 667 944 667 667 611 278 278 278 469 556 333 556 556 500 556 556 278 556 556 222 222 500 222 833 "
+        "556 556 556 556 333 500 278 556 500 722 500 500 500 334 260 334 584"
+    ),
+    "Helvetica-Bold": (
+        "278 333 474 556 556 889 722 238 333 333 389 584 278 333 278 278 556 556 556 556 556 556 556 556 556 556 "
+        "333 333 584 584 584 611 975 722 722 722 722 667 611 778 722 278 556 722 611 833 722 778 667 778 722 667 "
+        "611 722 667 944 667 667 611 333 278 333 584 556 333 556 611 556 611 556 333 611 611 278 278 556 278 889 "
+        "611 611 611 611 389 556 333 611 556 778 556 556 500 389 280 389 584"
+    ),
+}
+
+PRIORIDADES = {"LOW": "BAIXA", "MEDIUM": "MÉDIA", "HIGH": "ALTA", "CRITICAL": "CRÍTICA"}
+
+PLACEHOLDER = re.compile(r"\{(\w+)\}")
+
+
+@functools.lru_cache(maxsize=None)
+def font_widths(font: str) -> dict:
+    """Tabela de larguras da fonte, montada uma única vez por processo."""
+    return {32 + i: int(w) for i, w in enumerate(FONT_WIDTHS[font].split())}
+
+
+@functools.lru_cache(maxsize=4096)
+def _char_width(font: str, char: str) -> int:
+    widths = font_widths(font)
+    base = unicodedata.normalize("NFD", char)[0]
+    return widths.get(ord(base), 556)
+
+
+def text_width(text: str, font: str, size: float) -> float:
+    return sum(_char_width(font, c) for c in text) * size / 1000.0
+
+
+def wrap(text: str, font: str, size: float, width: float) -> list:
+    """Quebra o texto em linhas que cabem em `width` pontos."""
+    linhas = []
+    for paragrafo in str(text).splitlines() or [""]:
+        atual = ""
+        for palavra in paragrafo.split():
+            candidata = f"{atual} {palavra}" if atual else palavra
+            if atual and text_width(candidata, font, size) > width:
+                linhas.append(atual)
+                atual = palavra
+            else:
+                atual = candidata
+        linhas.append(atual)
+    return linhas
+
+
+def _pdf_string(text: str) -> bytes:
+    data = str(text).encode("cp1252", errors="replace")
+    return b"(" + data.replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)") + b")"
+
+
+def _color(rgb, stroke: bool = False) -> bytes:
+    return f"{rgb[0]:.3f} {rgb[1]:.3f} {rgb[2]:.3f} {'RG' if stroke else 'rg'}\n".encode()
+
+
+def percentual(value) -> str:
+    """Formata confiança em fração (0.87), percentual (87) ou texto ("87%") como "87.00%"."""
+    texto = str(value).strip()
+    try:
+        numero = float(texto.rstrip("%"))
+    except (TypeError, ValueError):
+        return "N/A"
+    # "0.5%" é meio por cento; só números sem "%" podem já estar em fração.
+    if texto.endswith("%") or numero > 1.0:
+        numero /= 100.0
+    return f"{numero:.2%}"
+
+
+def thumbnail(image_path, max_px: int = 256, quality: int = 80) -> tuple:
+    """Miniatura JPEG em tons de cinza da imagem: (bytes, largura, altura), ou None se ilegível."""
+    from PIL import Image
+
+    try:
+        with Image.open(image_path) as img:
+            img = img.convert("L")
+            img.thumbnail((max_px, max_px))
+            buffer = io.BytesIO()
+            img.save(buffer, format="JPEG", quality=quality)
+            return buffer.getvalue(), img.width, img.height
+    except (OSError, ValueError):
+        return None
+
+
+def _historico(history: list) -> str:
+    linhas = []
+    for item in history or []:
+        data = str(item.get("date_recorded") or "")[:10]
+        tipo = item.get("condition_type") or "registro"
+        linhas.append(f"{data} - {tipo}: {item.get('description') or ''}".strip(" -"))
+    return "\n".join(linhas) or "Sem histórico registrado."
+
+
+def diagnosis_context(
+    patient: dict,
+    diagnosis: dict,
+    generated_at: datetime.datetime = None,
+    history: list = None
+) -> dict:
+    """Campos do template a partir dos dicts de paciente, diagnóstico e histórico (mais recente primeiro)."""
+    generated_at = generated_at or datetime.datetime.now()
+    prioridade = str(diagnosis.get("priority") or "N/A").upper()
+    registrado = diagnosis.get("timestamp")
+    return {
+        "gerado_em": generated_at.strftime("%d/%m/%Y %H:%M"),
+        "paciente_id": patient.get("id") or diagnosis.get("patient_id") or "N/A",
+        "paciente_nome": patient.get("name") or "N/A",
+        "paciente_nascimento": patient.get("birth_date") or "N/A",
+        "paciente_cpf": patient.get("cpf") or "N/A",
+        "paciente_contato": patient.get("contact") or patient.get("email") or "N/A",
+        "diagnostico_id": diagnosis.get("id") or "N/A",
+        "registrado_em": str(registrado)[:16].replace("T", " ") if registrado else "N/A",
+        "classificacao": str(diagnosis.get("classification") or "N/A").upper(),
+        "confianca": percentual(diagnosis.get("confidence")),
+        "prioridade": PRIORIDADES.get(prioridade, prioridade),
+        "observacoes": diagnosis.get("notes") or "Sem observações.",
+        "responsavel": diagnosis.get("created_by") or "system",
+        "historico": _historico(history),
+    }
+
+
+class ReportTemplate():
+    """Template de relatório (JSON) compilado para operadores de conteúdo PDF.
+
+    Elementos sem campos (`{nome}`) viram bytes prontos na compilação, assim
+    como os objetos de fonte; a cada relatório só os elementos com campos são
+    formatados. Coordenadas `y` do template partem do topo da página.
+    """
+
+    def __init__(self, spec: dict, version: str = ""):
+        self.version = version
+        self.width = spec["page"]["width"]
+        self.height = spec["page"]["height"]
+        self.title = spec.get("title", "Relatório")
+        self.fonts = spec["fonts"]
+        self.pages = 1
+
+        self._font_names = {alias: f"F{i + 1}" for i, alias in enumerate(self.fonts)}
+        self._font_objects = [
+            f"<< /Type /Font /Subtype /Type1 /BaseFont /{base} /Encoding /WinAnsiEncoding >>".encode()
+            for base in self.fonts.values()
+        ]
+
+        self._static = b""
+        self._dynamic = []
+        self._image = None
+        for element in spec["elements"]:
+            if element["type"] == "image":
+                self._image = element
+            elif self._fields(element):
+                self._dynamic.append(element)
+            else:
+                self._static += self._draw(element, {})
+
+    @staticmethod
+    def _fields(element: dict) -> set:
+        texto = " ".join(str(element.get(k, "")) for k in ("text", "field"))
+        return set(PLACEHOLDER.findall(texto)) | ({element["field"]} if "field" in element else set())
+
+    def _y(self, y: float) -> float:
+        return self.height - y
+
+    def _text(self, x: float, y: float, text: str, font: str, size: float) -> bytes:
+        return (
+            f"BT /{self._font_names[font]} {size} Tf {x:.2f} {self._y(y):.2f} Td ".encode()
+            + _pdf_string(text) + b" Tj ET\n"
+        )
+
+    def _draw(self, element: dict, context: dict) -> bytes:
+        kind = element["type"]
+        font = element.get("font", "regular")
+        size = element.get("size", 10)
+        out = _color(element["color"]) if "color" in element else b"0 g\n"
+
+        if kind == "rect":
+            return _color(element["fill"]) + (
+                f"{element['x']} {self._y(element['y'] + element['h']):.2f} {element['w']} {element['h']} re f\n"
+            ).encode()
+
+        if kind == "line":
+            return _color(element.get("color", (0.6, 0.6, 0.6)), stroke=True) + (
+                f"{element.get('width', 0.5)} w {element['x1']} {self._y(element['y1']):.2f} m "
+                f"{element['x2']} {self._y(element['y2']):.2f} l S\n"
+            ).encode()
+
+        if kind == "text":
+            texto = element["text"].format_map(context)
+            x = element["x"]
+            if element.get("align") == "right":
+                x -= text_width(texto, self.fonts[font], size)
+            return out + self._text(x, element["y"], texto, font, size)
+
+        if kind == "badge":
+            valor = str(context.get(element["field"], ""))
+            cor = element["colors"].get(valor, element["colors"].get("default", (0.4, 0.4, 0.4)))
+            largura = text_width(valor, self.fonts[font], size) + 2 * element.get("padding", 6)
+            return (
+                _color(cor)
+                + f"{element['x']} {self._y(element['y'] + element['h']):.2f} {largura:.2f} {element['h']} re f\n".encode()
+                + _color((1, 1, 1))
+                + self._text(element["x"] + element.get("padding", 6), element["y"] + element["h"] - (element["h"] - size) / 2 - 1,
+                             valor, font, size)
+            )
+
+        if kind == "paragraph":
+            texto = element["text"].format_map(context)
+            leading = element.get("leading", size * 1.3)
+            linhas = wrap(texto, self.fonts[font], size, element["w"])
+            maximo = element.get("max_lines", len(linhas))
+            if len(linhas) > maximo:
+                linhas = linhas[:maximo]
+                linhas[-1] = linhas[-1].rstrip(" .") + "..."
+            for i, linha in enumerate(linhas):
+                out += self._text(element["x"], element["y"] + i * leading, linha, font, size)
+            return out
+
+        raise ValueError(f"Elemento de template desconhecido: {kind}")
+
+    def _draw_image(self, thumb) -> tuple:
+        box = self._image
+        if thumb is None:
+            aviso = "Imagem indisponível"
+            x = box["x"] + (box["w"] - text_width(aviso, self.fonts["regular"], 9)) / 2
+            return (
+                _color((0.93, 0.93, 0.93))
+                + f"{box['x']} {self._y(box['y'] + box['h']):.2f} {box['w']} {box['h']} re f\n".encode()
+                + b"0.4 g\n" + self._text(x, box["y"] + box["h"] / 2, aviso, "regular", 9)
+            ), None
+
+        data, largura, altura = thumb
+        escala = min(box["w"] / largura, box["h"] / altura)
+        w, h = largura * escala, altura * escala
+        x = box["x"] + (box["w"] - w) / 2
+        y = self._y(box["y"] + (box["h"] + h) / 2)
+        imagem = (
+            f"<< /Type /XObject /Subtype /Image /Width {largura} /Height {altura} "
+            f"/ColorSpace /DeviceGray /BitsPerComponent 8 /Filter /DCTDecode /Length {len(data)} >>\nstream\n"
+        ).encode() + data + b"\nendstream"
+        return f"q {w:.2f} 0 0 {h:.2f} {x:.2f} {y:.2f} cm /Im1 Do Q\n".encode(), imagem
+
+    def render(self, context: dict, image_path=None, thumbnail_px: int = 256) -> bytes:
+        """Gera o PDF (uma página) com os campos de `context` e a miniatura da imagem."""
+        content = self._static
+        for element in self._dynamic:
+            content += self._draw(element, context)
+
+        imagem = None
+        if self._image is not None:
+            thumb = thumbnail(image_path, thumbnail_px) if image_path and Path(image_path).exists() else None
+            operadores, imagem = self._draw_image(thumb)
+            content += operadores
+
+        stream = zlib.compress(content, 6)
+        fontes = " ".join(f"/{nome} {5 + i} 0 R" for i, nome in enumerate(self._font_names.values()))
+        proximo = 5 + len(self._font_objects)
+        xobject = f" /XObject << /Im1 {proximo + 1} 0 R >>" if imagem else ""
+
+        objetos = [
+            b"<< /Type /Catalog /Pages 2 0 R >>",
+            b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+            (
+                f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {self.width} {self.height}] "
+                f"/Resources << /Font << {fontes} >>{xobject} >> /Contents {proximo} 0 R >>"
+            ).encode(),
+            b"<< /Title " + _pdf_string(f"{self.title} {context.get('diagnostico_id', '')}".strip())
+            + b" /Producer (Sistema de Triagem Medica) /CreationDate "
+            + _pdf_string(datetime.datetime.now().strftime("D:%Y%m%d%H%M%S")) + b" >>",
+            *self._font_objects,
+            f"<< /Length {len(stream)} /Filter /FlateDecode >>\nstream\n".encode() + stream + b"\nendstream",
+        ]
+        if imagem:
+            objetos.append(imagem)
+        return _serialize(objetos, info=4)
+
+
+def _serialize(objetos: list, info: int) -> bytes:
+    saida = bytearray(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+    offsets = []
+    for numero, corpo in enumerate(objetos, start=1):
+        offsets.append(len(saida))
+        saida += f"{numero} 0 obj\n".encode() + corpo + b"\nendobj\n"
+
+    xref = len(saida)
+    saida += f"xref\n0 {len(objetos) + 1}\n0000000000 65535 f \n".encode()
+    saida += b"".join(f"{offset:010d} 00000 n \n".encode() for offset in offsets)
+    saida += (
+        f"trailer\n<< /Size {len(objetos) + 1} /Root 1 0 R /Info {info} 0 R >>\n"
+        f"startxref\n{xref}\n%%EOF\n"
+    ).encode()
+    return bytes(saida)
+
+
+@functools.lru_cache(maxsize=16)
+def _load_template(path: str, mtime_ns: int) -> ReportTemplate:
+    with open(path, "r", encoding="utf-8") as f:
+        return ReportTemplate(json.load(f), version=f"{Path(path).name}:{mtime_ns}")
+
+
+def load_template(path: Path = DEFAULT_TEMPLATE) -> ReportTemplate:
+    """Template compilado, em cache por processo; é recompilado se o arquivo mudar."""
+    path = Path(path)
+    return _load_template(str(path), path.stat().st_mtime_ns)
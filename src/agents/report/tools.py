@@ -1,71 +1,174 @@
+import asyncio
 import datetime
 import json
+import shutil
 from pathlib import Path
 from typing import Optional, List, Union
-from src.config import Settings
+import pandas as pd
+from src.config import Settings, settings as default_settings
+from src.database import queries
+from src.database.connection import DatabaseConnection
+from src.database.stats import diagnosis_stats
+from .analytics import DiagnosisAnalytics
+from .batch import BatchReportRenderer
+from .cache import ReportCache, report_fingerprint
+from .pdf import diagnosis_context, load_template
 
 class ToolReport():
-    def __init__(self):
-        self.settings = Settings()
+    def __init__(self, settings: Settings = None, database: DatabaseConnection = None):
+        self.settings = settings if settings is not None else default_settings
+        self.database = database
         self.reports_dir = self.settings.reports_dir
+        self.report_cache = ReportCache(self.reports_dir / "diagnosticos")
 
-    def generate_pdf(self, patient_id: str, diagnosis_data: dict, output_path: str = None) -> dict:
-        """Gera um relatório em PDF com o diagnóstico do paciente.
+    def _contexto(self, linha, gerado_em: datetime.datetime = None) -> tuple:
+        """Contexto do template e impressão digital a partir de uma linha de `queries.diagnoses_with_patient`."""
+        context = diagnosis_context(
+            queries.patient_from_row(linha),
+            queries.diagnosis_row_to_dict(linha),
+            gerado_em,
+            queries.history_from_row(linha)
+        )
+        return context, report_fingerprint(context, linha.image_path, load_template().version)
+
+    def gerar_relatorio(self, diagnostico_id: str = None, paciente_id: str = None, output_path: str = None) -> dict:
+        """Gera o relatório PDF de um diagnóstico, buscando paciente, diagnóstico e histórico direto no banco.
+        
+        Informe o ID do diagnóstico, ou o ID do paciente para usar o último diagnóstico dele.
+        Não é preciso buscar os dados antes.
         
         Args:
-            patient_id: ID do paciente
-            diagnosis_data: Dados do diagnóstico (dict com classification, confidence, priority, etc)
+            diagnostico_id: ID do diagnóstico (ex: D001) - opcional
+            paciente_id: ID do paciente (ex: P001), usado se não houver diagnostico_id - opcional
             output_path: Caminho de saída do PDF (opcional)
             
         Returns:
-            Dicionário confirmando o status da geração
+            Dicionário com o status, o arquivo gerado e o resumo do diagnóstico
         """
+        if self.database is None:
+            return {"status": "erro", "mensagem": "Banco de dados não configurado para relatórios"}
+        if not diagnostico_id and not paciente_id:
+            return {"status": "erro", "mensagem": "Informe o ID do diagnóstico ou do paciente"}
         try:
-            if output_path is None:
-                timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-                filename = f"relatorio_{patient_id}_{timestamp}.txt"
-                output_path = self.reports_dir / filename
-            else:
+            stmt = queries.diagnoses_with_patient(
+                diagnosis_id=diagnostico_id,
+                patient_id=None if diagnostico_id else paciente_id
+            ).limit(1)
+            with self.database.get_read_session() as session:
+                linha = session.execute(stmt).first()
+            if linha is None:
+                if diagnostico_id:
+                    return {"status": "erro", "mensagem": f"Diagnóstico {diagnostico_id} não encontrado"}
+                return {"status": "erro", "mensagem": f"Nenhum diagnóstico encontrado para o paciente {paciente_id}"}
+
+            context, fingerprint = self._contexto(linha)
+            arquivo = self.report_cache.get(linha.id, fingerprint)
+            em_cache = arquivo is not None
+            if not em_cache:
+                data = load_template().render(context, linha.image_path, self.settings.report_thumbnail_px)
+                arquivo = self.report_cache.put(linha.id, fingerprint, data)
+
+            if output_path:
                 output_path = Path(output_path)
-            
-            output_path.parent.mkdir(parents=True, exist_ok=True)
-            
-            # Gera o relatório em texto simples (simulação de PDF)
-            with open(output_path, 'w', encoding='utf-8') as f:
-                f.write("=" * 80 + "\n")
-                f.write("SISTEMA DE TRIAGEM MÉDICA - RELATÓRIO DE DIAGNÓSTICO\n")
-                f.write("=" * 80 + "\n\n")
-                
-                f.write(f"Data: {datetime.datetime.now().strftime('%d/%m/%Y %H:%M:%S')}\n")
-                f.write(f"Código do Paciente: {patient_id}\n\n")
-                
-                f.write("-" * 80 + "\n")
-                f.write("RESULTADO DO DIAGNÓSTICO\n")
-                f.write("-" * 80 + "\n\n")
-                
-                f.write(f"Classificação: {diagnosis_data.get('classification', 'N/A')}\n")
-                f.write(f"Confiança: {diagnosis_data.get('confidence', 0):.2%}\n")
-                f.write(f"Prioridade: {diagnosis_data.get('priority', 'N/A')}\n")
-                
-                if diagnosis_data.get('notes'):
-                    f.write(f"\nObservações: {diagnosis_data['notes']}\n")
-                
-                f.write("\n" + "-" * 80 + "\n")
-                f.write("DISCLAIMER\n")
-                f.write("-" * 80 + "\n\n")
-                f.write("Este é um sistema de triagem automatizada.\n")
-                
-                f.write("=" * 80 + "\n")
-            
+                output_path.parent.mkdir(parents=True, exist_ok=True)
+                shutil.copyfile(arquivo, output_path)
+                arquivo = output_path
+
             return {
-                "status": "sucesso", 
-                "mensagem": f"Relatório gerado com sucesso",
-                "arquivo": str(output_path)
+                "status": "sucesso",
+                "mensagem": "Relatório gerado com sucesso",
+                "arquivo": str(arquivo),
+                "paciente": context["paciente_nome"],
+                "diagnostico": context["classificacao"],
+                "prioridade": context["prioridade"],
+                "em_cache": em_cache
             }
         except Exception as e:
             print(f"Erro ao gerar relatório: {str(e)}")
             return {"status": "erro", "mensagem": f"Falha ao gerar relatório: {str(e)}"}
 
+    def gerar_relatorios_lote(
+        self,
+        data_inicio: str = None,
+        data_fim: str = None,
+        prioridade: str = None,
+        classificacao: str = None
+    ) -> dict:
+        """Gera os relatórios PDF de todos os diagnósticos de um período (ex: fechamento do turno).
+        
+        Relatórios de diagnósticos que não mudaram desde a última geração são reaproveitados.
+        
+        Args:
+            data_inicio: Data inicial (YYYY-MM-DD) - opcional
+            data_fim: Data final, inclusiva (YYYY-MM-DD) - opcional
+            prioridade: Só diagnósticos desta prioridade (BAIXA, MÉDIA, ALTA, CRÍTICA) - opcional
+            classificacao: Só diagnósticos desta classificação (NORMAL, PNEUMONIA) - opcional
+            
+        Returns:
+            Dicionário com relatórios gerados e reaproveitados, pasta, erros e páginas por segundo
+        """
+        if self.database is None:
+            return {"status": "erro", "mensagem": "Banco de dados não configurado para relatórios"}
+        try:
+            stmt = queries.diagnoses_with_patient(data_inicio, data_fim, prioridade, classificacao)
+            with self.database.get_read_session() as session:
+                linhas = session.execute(stmt).all()
+        except ValueError as e:
+            return {"status": "erro", "mensagem": f"Data inválida: {str(e)}"}
+        except Exception as e:
+            return {"status": "erro", "mensagem": f"Falha ao buscar diagnósticos: {str(e)}"}
+
+        if not linhas:
+            return {"status": "sucesso", "mensagem": "Nenhum diagnóstico no período", "relatorios": 0}
+
+        gerado_em = datetime.datetime.now()
+        jobs, versoes, reaproveitados = [], [], 0
+        for linha in linhas:
+            context, fingerprint = self._contexto(linha, gerado_em)
+            if self.report_cache.get(linha.id, fingerprint) is not None:
+                reaproveitados += 1
+                continue
+            jobs.append((context, linha.image_path, str(self.report_cache.path_for(linha.id, fingerprint))))
+            versoes.append((linha.id, fingerprint))
+
+        renderer = BatchReportRenderer(self.settings.report_workers, thumbnail_px=self.settings.report_thumbnail_px)
+        resumo = renderer.render(jobs)
+        gerados = set(resumo.pop("arquivos"))
+        for diagnosis_id, fingerprint in versoes:
+            if str(self.report_cache.path_for(diagnosis_id, fingerprint)) in gerados:
+                self.report_cache.prune(diagnosis_id, fingerprint)
+
+        return {
+            "status": "sucesso",
+            "pasta": str(self.report_cache.directory),
+            **resumo,
+            "reaproveitados": reaproveitados,
+            "erros": resumo["erros"][:20]
+        }
+
+    def get_tools(self) -> list:
+        """Ferramentas registradas no agente.
+
+        A geração em lote renderiza centenas de PDFs: roda em uma thread, para
+        não bloquear o event loop do runner enquanto os processos trabalham.
+        """
+        async def gerar_relatorios_lote(
+            data_inicio: str = None,
+            data_fim: str = None,
+            prioridade: str = None,
+            classificacao: str = None
+        ) -> dict:
+            return await asyncio.to_thread(self.gerar_relatorios_lote, data_inicio, data_fim, prioridade, classificacao)
+
+        gerar_relatorios_lote.__doc__ = ToolReport.gerar_relatorios_lote.__doc__
+        return [
+            self.gerar_relatorio,
+            gerar_relatorios_lote,
+            self.estatisticas_diagnosticos,
+            self.analise_temporal,
+            self.generate_stats
+        ]
+
     def generate_stats(self, diagnosticos: Union[List[dict], str]) -> dict:
         """Gera estatísticas a partir de uma lista de diagnósticos.
         
@@ -90,28 +193,99 @@ class ToolReport():
                     "total": 0
                 }
             
-            pneumonia_count = sum(1 for d in diagnosticos if d.get('classification') == "PNEUMONIA")
-            normal_count = total - pneumonia_count
-            
-            priority_stats = {}
-            for d in diagnosticos:
-                priority = d.get('priority', 'DESCONHECIDO')
-                priority_stats[priority] = priority_stats.get(priority, 0) + 1
-            
-            confidences = [d.get('confidence', 0) for d in diagnosticos]
-            avg_confidence = sum(confidences) / total if total > 0 else 0
+            frame = DiagnosisAnalytics.prepare(pd.DataFrame.from_records(diagnosticos))
+            pneumonia_count = int(frame["positive"].sum())
+            avg_confidence = frame["confidence"].mean()
+            priority_stats = frame["priority"].value_counts()
             
             stats = {
                 "status": "sucesso",
                 "total_diagnosticos": total,
                 "pneumonia": pneumonia_count,
-                "normal": normal_count,
+                "normal": total - pneumonia_count,
                 "taxa_pneumonia": f"{(pneumonia_count/total*100):.1f}%",
-                "confianca_media": f"{avg_confidence:.2%}",
-                "por_prioridade": priority_stats
+                "confianca_media": f"{avg_confidence:.2%}" if pd.notna(avg_confidence) else "N/A",
+                "por_prioridade": {str(p): int(n) for p, n in priority_stats.items() if n > 0}
             }
             
             return stats
                 
         except Exception as e:
-            return {"status": "erro", "mensagem": f"Falha ao gerar estatísticas: {str(e)}"}
\ No newline at end of file
+            return {"status": "erro", "mensagem": f"Falha ao gerar estatísticas: {str(e)}"}
+
+    def estatisticas_diagnosticos(self, data_inicio: str = None, data_fim: str = None) -> dict:
+        """Gera estatísticas de todos os diagnósticos registrados, direto das tabelas agregadas.
+        
+        Não precisa receber a lista de diagnósticos: responde em tempo constante,
+        qualquer que seja o tamanho do histórico.
+        
+        Args:
+            data_inicio: Data inicial (YYYY-MM-DD) - opcional
+            data_fim: Data final, inclusiva (YYYY-MM-DD) - opcional
+            
+        Returns:
+            Dicionário com estatísticas calculadas (e contagem por dia, quando há período)
+        """
+        if self.database is None:
+            return {"status": "erro", "mensagem": "Banco de dados não configurado para estatísticas"}
+        try:
+            with self.database.get_read_session() as session:
+                resumo = diagnosis_stats.summary(session, data_inicio, data_fim)
+        except ValueError as e:
+            return {"status": "erro", "mensagem": f"Data inválida: {str(e)}"}
+        except Exception as e:
+            return {"status": "erro", "mensagem": f"Falha ao gerar estatísticas: {str(e)}"}
+
+        total = resumo["total"]
+        if total == 0:
+            return {
+                "status": "sucesso",
+                "mensagem": "Nenhum diagnóstico registrado no período",
+                "total": 0
+            }
+
+        pneumonia_count = resumo["by_classification"].get("PNEUMONIA", 0)
+        stats = {
+            "status": "sucesso",
+            "total_diagnosticos": total,
+            "pneumonia": pneumonia_count,
+            "normal": total - pneumonia_count,
+            "taxa_pneumonia": f"{(pneumonia_count/total*100):.1f}%",
+            "confianca_media": f"{resumo['confidence_sum'] / total:.2%}",
+            "por_prioridade": resumo["by_priority"]
+        }
+        if "by_day" in resumo:
+            stats["por_dia"] = resumo["by_day"]
+        return stats
+
+    def analise_temporal(
+        self,
+        data_inicio: str = None,
+        data_fim: str = None,
+        paciente_id: str = None,
+        janela_dias: int = 7
+    ) -> dict:
+        """Gera a análise temporal dos diagnósticos registrados, direto do banco.
+        
+        Inclui taxa de positividade diária e semanal (com média móvel), distribuição
+        por prioridade, histograma de confiança e produtividade por operador (created_by).
+        
+        Args:
+            data_inicio: Data inicial (YYYY-MM-DD) - opcional
+            data_fim: Data final, inclusiva (YYYY-MM-DD) - opcional
+            paciente_id: Restringe a um paciente (ex: P001) - opcional
+            janela_dias: Janela da média móvel diária, em dias (padrão 7)
+            
+        Returns:
+            Dicionário com o resumo da análise
+        """
+        if self.database is None:
+            return {"status": "erro", "mensagem": "Banco de dados não configurado para análises"}
+        try:
+            analytics = DiagnosisAnalytics(self.database)
+            frame = analytics.load(data_inicio, data_fim, paciente_id)
+            return {"status": "sucesso", **analytics.summary(frame, window_days=max(1, int(janela_dias)))}
+        except ValueError as e:
+            return {"status": "erro", "mensagem": f"Parâmetro inválido: {str(e)}"}
+        except Exception as e:
+            return {"status": "erro", "mensagem": f"Falha ao gerar análise: {str(e)}"}
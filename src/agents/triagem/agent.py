@@ -1,7 +1,5 @@
 from google.adk.agents.llm_agent import Agent
-from google.adk.models.lite_llm import LiteLlm
-from src.config import Settings
-from .tools import ToolTriagem
+from src.container import container
 
 
 INSTRUCAO = """
@@ -114,12 +112,12 @@ Após análise bem-sucedida, você pode orientar o usuário a:
 Responda sempre em português brasileiro de forma profissional e empática.
 """
 
-tool_triagem = ToolTriagem()
+tool_triagem = container.tool_triagem
 
 triagem_agent = Agent(
-    model=LiteLlm(model=f"{Settings().ollama_model}", api_key=Settings().groq_api_key),
+    model=container.llm,
     name='triagem_agent',
     description='Agente de Triagem, analisa imagens de raio-x e fornece diagnósticos utilizando as ferramentas disponiveis.',
     instruction=INSTRUCAO,
-    tools=[tool_triagem.analisar_imagem]
+    tools=[tool_triagem.get_tool()]
 )   
@@ -0,0 +1,217 @@
+import csv
+import io
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+from sqlalchemy import select
+
+from src.agents.database.tools import ToolDatabase
+from src.database.models import Diagnosis, Patient
+from src.inference import INPUT_SHAPE, normalize_inplace, preprocess_batch
+from src.inference.preprocessing import decode_into
+from .tools import ToolTriagem
+
+IMAGE_EXTENSIONS = {".png", ".jpg", ".jpeg"}
+
+
+class BulkTriagem():
+    """Triagem em massa sem LLM: percorre um diretório ou manifesto e grava os diagnósticos em lote.
+
+    A execução é retomável: imagens que já têm diagnóstico registrado (mesmo
+    `image_path`) são ignoradas, e cada lote é gravado em sua própria transação.
+    """
+
+    def __init__(
+        self,
+        tool_triagem: ToolTriagem,
+        tool_database: ToolDatabase,
+        batch_size: int = 32,
+        created_by: str = "bulk"
+    ):
+        self.tool_triagem = tool_triagem
+        self.tool_database = tool_database
+        self.batch_size = max(1, batch_size)
+        self.created_by = created_by
+        self._buffers = [np.empty((self.batch_size, *INPUT_SHAPE), dtype=np.float32) for _ in range(2)]
+
+
+    def coletar(self, origem: Path, patient_id: str = None) -> list:
+        """Lista pares (image_path, patient_id) a partir de um diretório ou manifesto CSV.
+
+        Em diretórios, o paciente vem de `patient_id` ou do nome da subpasta
+        (ex: uploads/P001/raio_x.png). O manifesto CSV deve ter as colunas
+        `image_path` e `patient_id`; caminhos relativos partem da pasta do manifesto.
+        """
+        origem = Path(origem)
+        itens = []
+
+        if origem.is_dir():
+            for caminho in sorted(origem.rglob("*")):
+                if caminho.suffix.lower() not in IMAGE_EXTENSIONS:
+                    continue
+                paciente = patient_id or (caminho.parent.name if caminho.parent != origem else None)
+                itens.append((str(caminho.absolute()), paciente))
+        else:
+            with open(origem, newline="", encoding="utf-8") as f:
+                for linha in csv.DictReader(f):
+                    caminho = Path(linha["image_path"])
+                    if not caminho.is_absolute():
+                        caminho = origem.parent / caminho
+                    itens.append((str(caminho.absolute()), linha.get("patient_id") or patient_id))
+
+        return itens
+
+
+    def _pendentes(self, itens: list) -> tuple:
+        """Separa itens ainda não processados e itens cujo paciente não existe."""
+        processados = set()
+        caminhos = [caminho for caminho, _ in itens]
+        with self.tool_database.database.get_read_session() as session:
+            for inicio in range(0, len(caminhos), 500):
+                bloco = caminhos[inicio:inicio + 500]
+                processados.update(
+                    session.execute(select(Diagnosis.image_path).where(Diagnosis.image_path.in_(bloco))).scalars()
+                )
+            pacientes = {paciente for _, paciente in itens}
+            existentes = set(session.execute(select(Patient.id).where(Patient.id.in_(pacientes))).scalars())
+
+        pendentes = [item for item in itens if item[0] not in processados and item[1] in existentes]
+        invalidos = [item for item in itens if item[0] not in processados and item[1] not in existentes]
+        return pendentes, invalidos
+
+
+    def _preparar(self, lote: list, buffer: np.ndarray) -> dict:
+        """Lê os arquivos, consulta o cache e decodifica apenas as imagens sem predição."""
+        cache = self.tool_triagem._get_cache()
+        preparado = {"chaves": {}, "confiancas": {}, "erros": {}, "pendentes": [], "batch": None}
+        dados = {}
+
+        for caminho, _ in lote:
+            try:
+                with open(caminho, "rb") as f:
+                    dados[caminho] = f.read()
+            except OSError as e:
+                preparado["erros"][caminho] = str(e)
+                continue
+
+            chave = self.tool_triagem._chave_cache(dados[caminho])
+            preparado["chaves"][caminho] = chave
+            confianca = cache.get(chave)
+            if confianca is None:
+                preparado["pendentes"].append(caminho)
+            else:
+                preparado["confiancas"][caminho] = confianca
+
+        pendentes = preparado["pendentes"]
+        if not pendentes:
+            return preparado
+
+        batch = buffer[:len(pendentes)]
+        try:
+            preprocess_batch([io.BytesIO(dados[c]) for c in pendentes], out=batch,
+                             max_workers=self.tool_triagem.settings.preprocess_workers)
+        except Exception:
+            validos = []
+            for caminho in pendentes:
+                try:
+                    decode_into(io.BytesIO(dados[caminho]), buffer[len(validos)])
+                    validos.append(caminho)
+                except Exception as e:
+                    preparado["erros"][caminho] = f"Imagem inválida: {e}"
+            pendentes = preparado["pendentes"] = validos
+            batch = normalize_inplace(buffer[:len(validos)])
+
+        preparado["batch"] = batch if pendentes else None
+        return preparado
+
+
+    def _inferir(self, preparado: dict) -> dict:
+        if preparado["batch"] is not None:
+            cache = self.tool_triagem._get_cache()
+            predicoes = self.tool_triagem._predict_batch(preparado["batch"])
+            for caminho, predicao in zip(preparado["pendentes"], predicoes):
+                confianca = float(predicao[0])
+                cache.put(preparado["chaves"][caminho], confianca)
+                preparado["confiancas"][caminho] = confianca
+        if self.tool_triagem.events is not None:
+            for caminho in preparado["confiancas"]:
+                self.tool_triagem.events.mark_inference(caminho)
+        return preparado["confiancas"]
+
+
+    def _registros(self, lote: list, confiancas: dict) -> list:
+        registros = []
+        for caminho, paciente in lote:
+            if caminho not in confiancas:
+                continue
+            score = confiancas[caminho]
+            diagnostico = self.tool_triagem._montar_diagnostico(score)
+            registros.append({
+                "patient_id": paciente,
+                "image_path": caminho,
+                "classification": diagnostico["classification"],
+                "confidence": score if diagnostico["classification"] == "PNEUMONIA" else 1.0 - score,
+                "priority": diagnostico["priority"],
+                "notes": diagnostico["notes"],
+                "created_by": self.created_by,
+            })
+        return registros
+
+
+    def executar(self, origem: Path, patient_id: str = None, progresso=print) -> dict:
+        """Processa todas as imagens pendentes da origem.
+
+        Enquanto um lote está na inferência, o próximo já é lido e decodificado
+        em paralelo.
+
+        Returns:
+            Resumo com totais, erros e imagens por segundo
+        """
+        itens = self.coletar(origem, patient_id)
+        sem_paciente = [caminho for caminho, paciente in itens if not paciente]
+        itens = [item for item in itens if item[1]]
+        pendentes, invalidos = self._pendentes(itens)
+
+        lotes = [pendentes[i:i + self.batch_size] for i in range(0, len(pendentes), self.batch_size)]
+        resumo = {
+            "encontradas": len(itens) + len(sem_paciente),
+            "ja_processadas": len(itens) - len(pendentes) - len(invalidos),
+            "sem_paciente": len(sem_paciente),
+            "registradas": 0,
+            "erros": [
+                {"image_path": caminho, "erro": f"Paciente {paciente} não encontrado"}
+                for caminho, paciente in invalidos
+            ],
+        }
+
+        inicio = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="bulk-prefetch") as prefetch:
+            proximo = prefetch.submit(self._preparar, lotes[0], self._buffers[0]) if lotes else None
+
+            for indice, lote in enumerate(lotes):
+                preparado = proximo.result()
+                if indice + 1 < len(lotes):
+                    proximo = prefetch.submit(self._preparar, lotes[indice + 1], self._buffers[(indice + 1) % 2])
+
+                confiancas = self._inferir(preparado)
+                resultado = self.tool_database.cadastrar_diagnosticos_em_lote(self._registros(lote, confiancas))
+
+                resumo["registradas"] += len(resultado["inseridos"])
+                resumo["erros"].extend({"image_path": c, "erro": e} for c, e in preparado["erros"].items())
+                resumo["erros"].extend(
+                    {"image_path": r["item"]["image_path"], "erro": r["erro"]} for r in resultado["rejeitados"]
+                )
+
+                decorrido = time.perf_counter() - inicio
+                if progresso:
+                    progresso(
+                        f"[{indice + 1}/{len(lotes)}] {resumo['registradas']} registradas "
+                        f"({resumo['registradas'] / decorrido:.1f} img/s)"
+                    )
+
+        decorrido = time.perf_counter() - inicio
+        resumo["segundos"] = round(decorrido, 3)
+        resumo["imagens_por_segundo"] = round(resumo["registradas"] / decorrido, 2) if decorrido > 0 else 0.0
+        return resumo
@@ -1,38 +1,128 @@
+import io
 import numpy as np
-from PIL import Image
 from pathlib import Path
-from tensorflow import keras
-from src.config import Settings
+from src.config import Settings, settings as default_settings
+from src.events import EventBus
+from src.inference import (
+    BatchScheduler,
+    DEFAULT_MODEL,
+    InferenceWorkerPool,
+    PredictionCache,
+    content_hash,
+    model_registry,
+    preprocess_batch,
+)
 
 class ToolTriagem():
-    def __init__(self):
-        self.settings = Settings()
-        self.model = None
+    def __init__(self, settings: Settings = None, events: EventBus = None):
+        self.settings = settings if settings is not None else default_settings
+        self.events = events
+        self.scheduler = None
+        self.cache = None
+        self.pool = None
 
     def _load_model(self):
-        if self.model is None:
-            self.model = keras.models.load_model(self.settings.model_path)
-        return self.model
+        return model_registry.get(
+            DEFAULT_MODEL,
+            self.settings.get_inference_artifact(),
+            backend=self.settings.inference_backend,
+            num_threads=self.settings.inference_num_threads
+        )
 
-    def _preprocess_image(self, image_path: str) -> np.ndarray:
+    def _predict_batch(self, img_batch: np.ndarray) -> np.ndarray:
+        model = self._load_model()
+        return model.predict(img_batch)
+
+    def _get_scheduler(self) -> BatchScheduler:
+        if self.scheduler is None:
+            self.scheduler = BatchScheduler(
+                predict_fn=self._predict_batch,
+                max_batch_size=self.settings.inference_max_batch_size,
+                max_wait_ms=self.settings.inference_max_wait_ms
+            )
+        return self.scheduler
+
+    def _get_cache(self) -> PredictionCache:
+        if self.cache is None:
+            db_path = None
+            if self.settings.prediction_cache_persist:
+                db_path = self.settings.data_dir / "prediction_cache.db"
+            self.cache = PredictionCache(
+                max_entries=self.settings.prediction_cache_size,
+                db_path=db_path
+            )
+        return self.cache
+
+    def get_pool(self) -> InferenceWorkerPool:
+        if self.pool is None:
+            self.pool = InferenceWorkerPool(
+                workers=self.settings.inference_workers,
+                max_pending=self.settings.inference_max_pending,
+                timeout=self.settings.inference_timeout
+            )
+        return self.pool
+
+    def get_metrics(self) -> dict:
+        """Métricas de inferência: agendador (lote, espera na fila), cache de predições e pool de processos."""
+        return {
+            "scheduler": self.scheduler.get_metrics() if self.scheduler else {},
+            "cache": self.cache.get_metrics() if self.cache else {},
+            "workers": self.pool.get_metrics() if self.pool else {},
+        }
+
+    def get_tool(self):
+        """Ferramenta de análise registrada no agente.
+
+        Com `INFERENCE_WORKERS` > 0 a análise roda no pool de processos e a
+        ferramenta é assíncrona, liberando o event loop do servidor MCP.
+        """
+        if self.settings.inference_workers <= 0:
+            return self.analisar_imagem
+
+        pool = self.get_pool()
+
+        async def analisar_imagem(image_path: str) -> dict:
+            resultado = await pool.analisar(image_path)
+            self._marcar_inferencia(image_path, resultado)
+            return resultado
+
+        analisar_imagem.__doc__ = ToolTriagem.analisar_imagem.__doc__
+        return analisar_imagem
+
+    def _marcar_inferencia(self, image_path: str, resultado: dict):
+        """Guarda o instante da análise para medir a latência até o alerta do diagnóstico gravado."""
+        if self.events is not None and resultado.get("status") == "sucesso":
+            self.events.mark_inference(image_path)
+
+    def _chave_cache(self, data: bytes) -> str:
+        self._load_model()
+        fingerprint = model_registry.fingerprint(DEFAULT_MODEL)
+        return PredictionCache.make_key(content_hash(data), fingerprint)
+
+    def _predizer(self, image_path: str) -> float:
+        """Retorna a saída do modelo para a imagem, consultando o cache antes da inferência."""
+        with open(image_path, "rb") as f:
+            data = f.read()
+
+        key = self._chave_cache(data)
+        cache = self._get_cache()
+        confidence = cache.get(key)
+        if confidence is None:
+            img_batch = self._preprocess_image(io.BytesIO(data))
+            prediction = self._get_scheduler().predict(img_batch[0])
+            confidence = float(prediction[0])
+            cache.put(key, confidence)
+
+        return confidence
+
+    def _preprocess_image(self, image_path) -> np.ndarray:
         """Pré-processa a imagem para o modelo CNN.
         
         Aplica as mesmas transformações usadas no treinamento:
         - Redimensionamento para 224x224
+        - Padronização por imagem (média zero, desvio unitário)
         """
-        img = Image.open(image_path).convert('RGB')
-        img = img.resize((224, 224))
-
-        img_array = np.array(img, dtype=np.float32)
-        img_array = img_array - np.mean(img_array)
-        
-        std = np.std(img_array)
-        if std > 0:
-            img_array = img_array / std
-        
-        img_batch = np.expand_dims(img_array, axis=0)
-        
-        return img_batch
+        return preprocess_batch([image_path], max_workers=self.settings.preprocess_workers)
 
     def analisar_imagem(self, image_path: str) -> dict:
         """Analisa uma imagem de raio-X e retorna o diagnóstico.
@@ -50,39 +140,15 @@ class ToolTriagem():
                     "mensagem": f"Arquivo não encontrado: {image_path}"
                 }
             
-            model = self._load_model()
-            
-            img_batch = self._preprocess_image(image_path)
-            
-            prediction = model.predict(img_batch, verbose=0)
-            confidence = float(prediction[0][0])
-            
-            class_name = "PNEUMONIA" if confidence >= 0.5 else "NORMAL"
+            confidence = self._predizer(image_path)
             
-            priority = "BAIXA"
-            notes = "Exame dentro da normalidade. Acompanhamento de rotina se sintomas persistirem."
-            if 0.45 <= confidence < 0.5:
-                priority = "MÉDIA"
-                notes = "Sinais suspeitos detectados. Recomenda-se acompanhamento médico em 24-48h."
-            elif 0.5 <= confidence < 0.7:
-                priority = "ALTA"
-                notes = "Pneumonia detectada. Tratamento urgente recomendado. Avaliação médica no mesmo dia."
-            elif confidence >= 0.7: 
-                priority = "CRÍTICA"
-                notes = "Caso grave detectado. ATENÇÃO MÉDICA IMEDIATA OBRIGATÓRIA"
-           
-            diagnosis = {
-                "classification": class_name,
-                "confidence": f"{100 - confidence:.2%}",
-                "priority": priority,
-                "notes": notes
-            }
-            
-            return {
+            resultado = {
                 "status": "sucesso", 
                 "mensagem": "Imagem analisada com sucesso",
-                "diagnostico": diagnosis
+                "diagnostico": self._montar_diagnostico(confidence)
             }
+            self._marcar_inferencia(image_path, resultado)
+            return resultado
 
         except Exception as e:
             import traceback
@@ -90,4 +156,27 @@ class ToolTriagem():
             return {
                 "status": "erro", 
                 "mensagem": f"Falha ao analisar imagem: {str(e)}"
-            }
\ No newline at end of file
+            }
+
+    def _montar_diagnostico(self, confidence: float) -> dict:
+        """Converte a saída sigmoide do modelo em classificação, prioridade e observações."""
+        class_name = "PNEUMONIA" if confidence >= 0.5 else "NORMAL"
+        
+        priority = "BAIXA"
+        notes = "Exame dentro da normalidade. Acompanhamento de rotina se sintomas persistirem."
+        if 0.45 <= confidence < 0.5:
+            priority = "MÉDIA"
+            notes = "Sinais suspeitos detectados. Recomenda-se acompanhamento médico em 24-48h."
+        elif 0.5 <= confidence < 0.7:
+            priority = "ALTA"
+            notes = "Pneumonia detectada. Tratamento urgente recomendado. Avaliação médica no mesmo dia."
+        elif confidence >= 0.7: 
+            priority = "CRÍTICA"
+            notes = "Caso grave detectado. ATENÇÃO MÉDICA IMEDIATA OBRIGATÓRIA"
+
+        return {
+            "classification": class_name,
+            "confidence": f"{100 - confidence:.2%}",
+            "priority": priority,
+            "notes": notes
+        }
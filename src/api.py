@@ -4,15 +4,64 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from fastapi import FastAPI, HTTPException, UploadFile, File
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, StreamingResponse
 from pydantic import BaseModel
+import contextlib
+import json
 import shutil
 import httpx
+import time
 import uuid
 
+from src.container import container
+from src.health import HealthAggregator
+from src.mcp_client import MCPClientPool
+from src.metrics import LatencyTracker
+
+MCP_SERVER_URL = "http://localhost:8001"
+
+settings = container.settings
+
+mcp_pool = MCPClientPool(
+    MCP_SERVER_URL,
+    size=settings.mcp_pool_size,
+    max_inflight=settings.mcp_pool_max_inflight
+)
+
+stream_ttft_ms = LatencyTracker()
+
+http_client = None
+health_aggregator = None
+
+
+@contextlib.asynccontextmanager
+async def lifespan(app):
+    global http_client, health_aggregator
+
+    http_client = httpx.AsyncClient(
+        timeout=httpx.Timeout(120.0, connect=5.0),
+        limits=httpx.Limits(max_connections=50, max_keepalive_connections=10)
+    )
+    health_aggregator = HealthAggregator(
+        http_client,
+        MCP_SERVER_URL,
+        container.database,
+        settings,
+        interval=settings.health_check_interval
+    )
+
+    await mcp_pool.start()
+    await health_aggregator.start()
+    yield
+    await health_aggregator.stop()
+    await mcp_pool.close()
+    await http_client.aclose()
+
+
 app = FastAPI(
     title="Sistema de Triagem Médica",
-    description="Frontend API que conecta ao MCP Server"
+    description="Frontend API que conecta ao MCP Server",
+    lifespan=lifespan
 )
 
 app.add_middleware(
@@ -23,8 +72,6 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-MCP_SERVER_URL = "http://localhost:8001"
-
 class ChatRequest(BaseModel):
     message: str
     session_id: str = "default"
@@ -37,37 +84,26 @@ class ChatResponse(BaseModel):
 async def chat(request: ChatRequest):
     try:
         print(f"[API] Mensagem recebida: {request.message}")
-        print(f"[API] Conectando ao MCP Server via SSE em {MCP_SERVER_URL}...")
         
-        from mcp.client.sse import sse_client
-        from mcp.client.session import ClientSession
+        result = await mcp_pool.call_tool(
+            name="chat",
+            arguments={
+                "message": request.message,
+                "session_id": request.session_id
+            }
+        )
         
-        async with sse_client(f"{MCP_SERVER_URL}/sse", timeout=120.0) as (read_stream, write_stream):
-            async with ClientSession(read_stream, write_stream) as session:
-                await session.initialize()
-                
-                # tools = await session.list_tools()
-                # print(f"[API] Ferramentas disponíveis: {tools}")
-                
-                result = await session.call_tool(
-                    name="chat",
-                    arguments={
-                        "message": request.message,
-                        "session_id": request.session_id
-                    }
-                )
-                
-                response_text = ""
-                for content in result.content:
-                    if hasattr(content, 'text'):
-                        response_text += content.text
-                    elif isinstance(content, str):
-                        response_text += content
-                
-                if not response_text:
-                    response_text = "Desculpe, não consegui processar sua solicitação."
-                
-                return ChatResponse(response=response_text, session_id=request.session_id)
+        response_text = ""
+        for content in result.content:
+            if hasattr(content, 'text'):
+                response_text += content.text
+            elif isinstance(content, str):
+                response_text += content
+        
+        if not response_text:
+            response_text = "Desculpe, não consegui processar sua solicitação."
+        
+        return ChatResponse(response=response_text, session_id=request.session_id)
         
     except Exception as e:
         import traceback
@@ -75,19 +111,52 @@ async def chat(request: ChatRequest):
         print(traceback.format_exc())   
         raise HTTPException(status_code=500, detail=f"Erro de comunicação com MCP: {str(e)}")
 
+@app.post("/chat/stream")
+async def chat_stream(request: ChatRequest):
+    """Repassa ao cliente, em SSE, a resposta parcial do orquestrador conforme é gerada."""
+    print(f"[API] Mensagem recebida (stream): {request.message}")
+
+    async def eventos():
+        inicio = time.perf_counter()
+        primeiro = True
+        try:
+            async with http_client.stream(
+                "POST",
+                f"{MCP_SERVER_URL}/chat/stream",
+                json={"message": request.message, "session_id": request.session_id}
+            ) as response:
+                response.raise_for_status()
+                async for chunk in response.aiter_raw():
+                    if primeiro:
+                        primeiro = False
+                        stream_ttft_ms.observe((time.perf_counter() - inicio) * 1000.0)
+                    yield chunk
+        except Exception as e:
+            print(f"[API] Erro (stream): {str(e)}")
+            erro = {"type": "error", "message": f"Erro de comunicação com MCP: {str(e)}"}
+            yield f"data: {json.dumps(erro, ensure_ascii=False)}\n\n".encode()
+
+    return StreamingResponse(
+        eventos(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@app.get("/metrics")
+async def metrics():
+    return {
+        "chat_stream_ttft_ms": stream_ttft_ms.snapshot(),
+        "mcp_pool": mcp_pool.get_metrics(),
+    }
+
 @app.get("/health")
 async def health():
-    try:
-        async with httpx.AsyncClient() as client:
-            mcp_health = await client.get(f"{MCP_SERVER_URL}/health", timeout=5.0)
-            mcp_status = mcp_health.json()
-    except:
-        mcp_status = {"status": "offline"}
-    
+    snapshot = health_aggregator.snapshot()
     return {
         "status": "ok",
         "server": "frontend-api",
-        "mcp_server": mcp_status
+        "mcp_server": snapshot["checks"].get("mcp_server", {}).get("details", {"status": "offline"}),
+        "dependencies": snapshot,
     }
 
 @app.post("/upload")
@@ -1,4 +1,5 @@
 from pathlib import Path
+from typing import Optional
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -20,19 +21,60 @@ class Settings(BaseSettings):
         default=f"sqlite:///{PROJECT_ROOT}/data/database.db",
         env="DATABASE_URL"
     )
+
+    sqlite_journal_mode: str = Field(default="WAL", env="SQLITE_JOURNAL_MODE")
+    sqlite_synchronous: str = Field(default="NORMAL", env="SQLITE_SYNCHRONOUS")
+    sqlite_busy_timeout_ms: int = Field(default=5000, env="SQLITE_BUSY_TIMEOUT_MS")
+    sqlite_cache_size_kib: int = Field(default=65536, env="SQLITE_CACHE_SIZE_KIB")
+    sqlite_mmap_size: int = Field(default=268435456, env="SQLITE_MMAP_SIZE")
+    sqlite_begin_immediate: bool = Field(default=True, env="SQLITE_BEGIN_IMMEDIATE")
+    sqlite_read_replica: bool = Field(default=True, env="SQLITE_READ_REPLICA")
+    db_pool_size: int = Field(default=5, env="DB_POOL_SIZE")
+    db_max_overflow: int = Field(default=10, env="DB_MAX_OVERFLOW")
+    db_pool_timeout: float = Field(default=30.0, env="DB_POOL_TIMEOUT")
+    db_async_tools: bool = Field(default=True, env="DB_ASYNC_TOOLS")
     
     model_path: Path = Field(
         default=PROJECT_ROOT / "models" / "pneumonia_model.keras",
         env="MODEL_PATH"
     )
+
+    inference_backend: str = Field(default="keras", env="INFERENCE_BACKEND")
+    inference_artifact_path: Optional[Path] = Field(default=None, env="INFERENCE_ARTIFACT_PATH")
+    inference_num_threads: Optional[int] = Field(default=None, env="INFERENCE_NUM_THREADS")
+    inference_max_batch_size: int = Field(default=16, env="INFERENCE_MAX_BATCH_SIZE")
+    inference_max_wait_ms: float = Field(default=5.0, env="INFERENCE_MAX_WAIT_MS")
+    preprocess_workers: int = Field(default=4, env="PREPROCESS_WORKERS")
+    inference_workers: int = Field(default=0, env="INFERENCE_WORKERS")
+    inference_max_pending: int = Field(default=8, env="INFERENCE_MAX_PENDING")
+    inference_timeout: float = Field(default=60.0, env="INFERENCE_TIMEOUT")
+    prediction_cache_size: int = Field(default=1024, env="PREDICTION_CACHE_SIZE")
+    prediction_cache_persist: bool = Field(default=False, env="PREDICTION_CACHE_PERSIST")
     
     mcp_server_host: str = Field(default="localhost", env="MCP_SERVER_HOST")
     mcp_server_port: int = Field(default=8765, env="MCP_SERVER_PORT")
+    mcp_pool_size: int = Field(default=2, env="MCP_POOL_SIZE")
+    mcp_pool_max_inflight: int = Field(default=8, env="MCP_POOL_MAX_INFLIGHT")
+    health_check_interval: float = Field(default=5.0, env="HEALTH_CHECK_INTERVAL")
+    
+    alerts_retention_days: int = Field(default=30, env="ALERTS_RETENTION_DAYS")
+    alert_fanout: bool = Field(default=True, env="ALERT_FANOUT")
+    alert_email_to: str = Field(default="", env="ALERT_EMAIL_TO")
+    alert_webhook_url: str = Field(default="", env="ALERT_WEBHOOK_URL")
+    alert_webhook_timeout: float = Field(default=5.0, env="ALERT_WEBHOOK_TIMEOUT")
     
     smtp_host: str = Field(default="smtp.example.com", env="SMTP_HOST")
     smtp_port: int = Field(default=587, env="SMTP_PORT")
     smtp_user: str = Field(default="", env="SMTP_USER")
     smtp_password: str = Field(default="", env="SMTP_PASSWORD")
+    smtp_use_tls: bool = Field(default=True, env="SMTP_USE_TLS")
+    email_simulate: Optional[bool] = Field(default=None, env="EMAIL_SIMULATE")
+    email_workers: int = Field(default=2, env="EMAIL_WORKERS")
+    email_batch_size: int = Field(default=20, env="EMAIL_BATCH_SIZE")
+    email_max_attempts: int = Field(default=5, env="EMAIL_MAX_ATTEMPTS")
+    
+    report_workers: int = Field(default=0, env="REPORT_WORKERS")
+    report_thumbnail_px: int = Field(default=256, env="REPORT_THUMBNAIL_PX")
     
     data_dir: Path = PROJECT_ROOT / "data"
     reports_dir: Path = PROJECT_ROOT / "data" / "reports"
@@ -51,7 +93,17 @@ class Settings(BaseSettings):
             directory.mkdir(parents=True, exist_ok=True)
     
     def is_model_available(self) -> bool:
-        return self.model_path.exists()
+        return self.get_inference_artifact().exists()
+
+    def get_inference_artifact(self) -> Path:
+        """Artefato servido pelo backend configurado (modelo Keras, SavedModel ou TFLite)."""
+        if self.inference_backend == "keras":
+            return self.model_path
+        if self.inference_artifact_path is not None:
+            return self.inference_artifact_path
+        if self.inference_backend == "tflite":
+            return self.model_path.with_suffix(".tflite")
+        return self.model_path.with_suffix("")
     
     def get_database_path(self) -> Path:
         if self.database_url.startswith("sqlite:///"):
@@ -79,6 +131,7 @@ if __name__ == "__main__":
     print(f"Project Root: {PROJECT_ROOT}")
     print(f"Database URL: {settings.database_url}")
     print(f"Model Path: {settings.model_path}")
+    print(f"Inference Backend: {settings.inference_backend} ({settings.get_inference_artifact()})")
     print(f"Model Available: {settings.is_model_available()}")
     print(f"MCP Server: {settings.mcp_server_host}:{settings.mcp_server_port}")
     print(f"Ollama URL: {settings.ollama_base_url}")
@@ -0,0 +1,108 @@
+import threading
+
+from src.config import Settings, settings as default_settings
+
+
+class Container():
+    """Dependências compartilhadas do processo, criadas uma única vez e sob demanda.
+
+    Configurações, conexão com o banco (e seu pool), modelo de inferência e as
+    ferramentas dos agentes saem daqui; os módulos de agentes, o servidor MCP
+    e a API recebem as mesmas instâncias em vez de construir as suas.
+    """
+
+    def __init__(self, settings: Settings = None):
+        self.settings = settings if settings is not None else default_settings
+        self._instances = {}
+        self._lock = threading.RLock()
+
+
+    def _get(self, name: str, factory):
+        instance = self._instances.get(name)
+        if instance is None:
+            with self._lock:
+                instance = self._instances.get(name)
+                if instance is None:
+                    instance = factory()
+                    self._instances[name] = instance
+        return instance
+
+
+    @property
+    def database(self):
+        from src.database.connection import DatabaseConnection
+        return self._get("database", lambda: DatabaseConnection(self.settings))
+
+
+    @property
+    def async_database(self):
+        from src.database.async_connection import AsyncDatabaseConnection
+        return self._get("async_database", lambda: AsyncDatabaseConnection(self.settings))
+
+
+    @property
+    def event_bus(self):
+        return self._get("event_bus", self._build_event_bus)
+
+
+    def _build_event_bus(self):
+        from src.events import EventBus
+        from src.agents.notification.subscribers import register_subscribers
+        event_bus = EventBus()
+        if self.settings.alert_fanout:
+            register_subscribers(event_bus, self.settings, self.tool_notification)
+        return event_bus
+
+
+    @property
+    def llm(self):
+        from google.adk.models.lite_llm import LiteLlm
+        return self._get("llm", lambda: LiteLlm(
+            model=f"{self.settings.ollama_model}",
+            api_key=self.settings.groq_api_key
+        ))
+
+
+    @property
+    def tool_database(self):
+        from src.agents.database.tools import ToolDatabase
+        return self._get("tool_database", lambda: ToolDatabase(self.database, self.event_bus))
+
+
+    @property
+    def async_tool_database(self):
+        from src.agents.database.tools import AsyncToolDatabase
+        return self._get("async_tool_database", lambda: AsyncToolDatabase(self.async_database, self.event_bus))
+
+
+    @property
+    def tool_triagem(self):
+        from src.agents.triagem.tools import ToolTriagem
+        return self._get("tool_triagem", lambda: ToolTriagem(self.settings, self.event_bus))
+
+
+    @property
+    def tool_report(self):
+        from src.agents.report.tools import ToolReport
+        return self._get("tool_report", lambda: ToolReport(self.settings, self.database))
+
+
+    @property
+    def tool_notification(self):
+        from src.agents.notification.tools import ToolNotification
+        return self._get("tool_notification", lambda: ToolNotification(self.settings))
+
+
+    def load_model(self):
+        """Carrega e aquece o modelo de triagem no registro (no-op se já carregado)."""
+        from src.inference import DEFAULT_MODEL, model_registry
+        return model_registry.load(
+            DEFAULT_MODEL,
+            self.settings.get_inference_artifact(),
+            warmup=True,
+            backend=self.settings.inference_backend,
+            num_threads=self.settings.inference_num_threads
+        )
+
+
+container = Container()
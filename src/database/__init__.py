@@ -1,10 +1,24 @@
+from .async_connection import AsyncDatabaseConnection
+from .bulk import BulkExporter, BulkImporter
 from .connection import DatabaseConnection
-from .models import Base, Patient, Diagnosis, MedicalHistory
+from .ids import IdAllocator, id_allocator
+from .models import Base, Patient, Diagnosis, MedicalHistory, IdSequence, DiagnosisStats, DiagnosisDailyStats
+from .stats import DiagnosisStatsAggregator, diagnosis_stats
 
 __all__ = [
     "DatabaseConnection",
+    "AsyncDatabaseConnection",
     "Base",
     "Patient",
     "Diagnosis",
     "MedicalHistory",
+    "IdSequence",
+    "DiagnosisStats",
+    "DiagnosisDailyStats",
+    "DiagnosisStatsAggregator",
+    "diagnosis_stats",
+    "IdAllocator",
+    "BulkImporter",
+    "BulkExporter",
+    "id_allocator",
 ]
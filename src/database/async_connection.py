@@ -0,0 +1,145 @@
+import logging
+import sqlite3
+from contextlib import asynccontextmanager
+from typing import AsyncGenerator
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from .connection import apply_sqlite_pragmas
+from ..config import Settings, settings as default_settings
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncDatabaseConnection():
+    """Variante assíncrona de `DatabaseConnection` (SQLAlchemy asyncio + aiosqlite).
+
+    Usa o mesmo arquivo, os mesmos pragmas e o mesmo BEGIN IMMEDIATE da versão
+    síncrona; criação de tabelas e migrações continuam em `DatabaseConnection`.
+    As engines ficam presas ao event loop em que foram usadas pela primeira vez.
+    """
+
+    def __init__(self, settings: Settings = None):
+        self._engine = None
+        self._read_engine = None
+        self._sessionLocal = None
+        self._readSessionLocal = None
+        self.settings = settings if settings is not None else default_settings
+
+
+    def _pool_args(self) -> dict:
+        return {
+            "poolclass": AsyncAdaptedQueuePool,
+            "pool_size": self.settings.db_pool_size,
+            "max_overflow": self.settings.db_max_overflow,
+            "pool_timeout": self.settings.db_pool_timeout,
+        }
+
+
+    def get_engine(self) -> AsyncEngine:
+        if self._engine is None:
+            db_path = self.settings.get_database_path()
+            db_path.parent.mkdir(parents=True, exist_ok=True)
+
+            self._engine = create_async_engine(
+                f"sqlite+aiosqlite:///{db_path}",
+                connect_args={"timeout": self.settings.sqlite_busy_timeout_ms / 1000.0},
+                **self._pool_args()
+            )
+
+            @event.listens_for(self._engine.sync_engine, "connect")
+            def set_sqlite_pragma(dbapi_connection, connection_record):
+                apply_sqlite_pragmas(dbapi_connection, self.settings)
+                if self.settings.sqlite_begin_immediate:
+                    dbapi_connection.isolation_level = None
+
+            if self.settings.sqlite_begin_immediate:
+                @event.listens_for(self._engine.sync_engine, "begin")
+                def do_begin(connection):
+                    connection.exec_driver_sql("BEGIN IMMEDIATE")
+
+            logger.info(f"Engine assíncrona criada: {db_path}")
+
+        return self._engine
+
+
+    def get_read_engine(self) -> AsyncEngine:
+        """Engine assíncrona somente leitura, equivalente a `DatabaseConnection.get_read_engine`."""
+        if not self.settings.sqlite_read_replica:
+            return self.get_engine()
+
+        if self._read_engine is None:
+            db_path = self.settings.get_database_path()
+            if not db_path.exists():
+                # mode=ro não cria o arquivo: numa instalação nova ele é criado aqui
+                # (já em WAL), como a versão síncrona faz pela engine de escrita.
+                db_path.parent.mkdir(parents=True, exist_ok=True)
+                conexao = sqlite3.connect(db_path, timeout=self.settings.sqlite_busy_timeout_ms / 1000.0)
+                try:
+                    apply_sqlite_pragmas(conexao, self.settings)
+                finally:
+                    conexao.close()
+
+            self._read_engine = create_async_engine(
+                f"sqlite+aiosqlite:///file:{db_path}?mode=ro&uri=true",
+                connect_args={"timeout": self.settings.sqlite_busy_timeout_ms / 1000.0},
+                **self._pool_args()
+            )
+
+            @event.listens_for(self._read_engine.sync_engine, "connect")
+            def set_sqlite_pragma(dbapi_connection, connection_record):
+                apply_sqlite_pragmas(dbapi_connection, self.settings, read_only=True)
+
+            logger.info(f"Engine assíncrona somente leitura criada: {db_path}")
+
+        return self._read_engine
+
+
+    @asynccontextmanager
+    async def get_session(self) -> AsyncGenerator[AsyncSession, None]:
+        if self._sessionLocal is None:
+            # Sem expirar no commit: os objetos continuam legíveis sem novo I/O (to_dict).
+            self._sessionLocal = async_sessionmaker(
+                bind=self.get_engine(),
+                autoflush=False,
+                expire_on_commit=False
+            )
+        session = self._sessionLocal()
+
+        try:
+            yield session
+            await session.commit()
+        except Exception as e:
+            await session.rollback()
+            logger.error(f"Erro na sessão: {e}")
+            raise
+        finally:
+            await session.close()
+
+
+    @asynccontextmanager
+    async def get_read_session(self) -> AsyncGenerator[AsyncSession, None]:
+        """Sessão assíncrona para consultas: engine somente leitura, nunca faz commit."""
+        if self._readSessionLocal is None:
+            self._readSessionLocal = async_sessionmaker(
+                bind=self.get_read_engine(),
+                autoflush=False,
+                expire_on_commit=False
+            )
+        session = self._readSessionLocal()
+
+        try:
+            yield session
+        finally:
+            await session.rollback()
+            await session.close()
+
+
+    async def dispose(self):
+        for engine in (self._read_engine, self._engine):
+            if engine is not None:
+                await engine.dispose()
+        self._engine = self._read_engine = None
+        self._sessionLocal = self._readSessionLocal = None
@@ -0,0 +1,394 @@
+import csv
+import datetime
+import itertools
+import json
+import logging
+import time
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, Optional
+
+from sqlalchemy import DateTime, Float, Integer, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from . import queries
+from .connection import DatabaseConnection
+from .ids import id_allocator
+from .models import Diagnosis, MedicalHistory, Patient
+from .stats import diagnosis_stats
+
+logger = logging.getLogger(__name__)
+
+FORMATS = ("csv", "jsonl", "parquet")
+
+ENTITIES = {
+    "patients": Patient,
+    "diagnoses": Diagnosis,
+    "history": MedicalHistory,
+}
+
+ROW_TO_DICT = {
+    "patients": queries.patient_row_to_dict,
+    "diagnoses": queries.diagnosis_row_to_dict,
+    "history": queries.history_row_to_dict,
+}
+
+ID_PREFIXES = {"patients": "P", "diagnoses": "D"}
+
+MAX_REJECTED_SAMPLES = 100
+
+
+def detect_format(path: Path, formato: str = None) -> str:
+    formato = (formato or Path(path).suffix.lstrip(".")).lower()
+    if formato == "ndjson":
+        formato = "jsonl"
+    if formato not in FORMATS:
+        raise ValueError(f"Formato não suportado: {formato}. Use um de {FORMATS}")
+    return formato
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise RuntimeError("Parquet requer o pacote pyarrow (pip install pyarrow)")
+    return pyarrow
+
+
+def _row_key(row: dict, numero: int) -> tuple:
+    """Chave de deduplicação dentro do bloco: o ID, ou a própria linha quando não há ID."""
+    return ("id", row["id"]) if row.get("id") is not None else ("linha", numero)
+
+
+def _chunked(rows: Iterable[dict], chunk_size: int) -> Iterator[list]:
+    iterator = iter(rows)
+    while chunk := list(itertools.islice(iterator, chunk_size)):
+        yield chunk
+
+
+def read_chunks(path: Path, formato: str = None, chunk_size: int = 5000) -> Iterator[list]:
+    """Lê o arquivo em blocos de até `chunk_size` linhas (dicts), sem carregá-lo inteiro."""
+    formato = detect_format(path, formato)
+
+    if formato == "parquet":
+        arquivo = _pyarrow().parquet.ParquetFile(path)
+        for batch in arquivo.iter_batches(batch_size=chunk_size):
+            yield batch.to_pylist()
+        return
+
+    with open(path, newline="", encoding="utf-8") as f:
+        if formato == "csv":
+            yield from _chunked(csv.DictReader(f), chunk_size)
+        else:
+            yield from _chunked((json.loads(linha) for linha in f if linha.strip()), chunk_size)
+
+
+class ChunkWriter():
+    """Escreve blocos de linhas (dicts) em CSV, JSONL ou Parquet, de forma incremental."""
+
+    def __init__(self, path: Path, formato: str = None, model=None):
+        self.path = Path(path)
+        self.formato = detect_format(path, formato)
+        self.model = model
+        self._file = None
+        self._writer = None
+
+    def write(self, rows: list):
+        if not rows:
+            return
+        if self.formato == "parquet":
+            pa = _pyarrow()
+            if self._writer is None:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                schema = self._arrow_schema(pa, rows[0]) if self.model is not None else pa.Table.from_pylist(rows).schema
+                self._writer = pa.parquet.ParquetWriter(self.path, schema)
+            self._writer.write_table(pa.Table.from_pylist(rows, schema=self._writer.schema))
+            return
+
+        if self._file is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = open(self.path, "w", newline="", encoding="utf-8")
+            if self.formato == "csv":
+                self._writer = csv.DictWriter(self._file, fieldnames=list(rows[0]))
+                self._writer.writeheader()
+
+        if self.formato == "csv":
+            self._writer.writerows(rows)
+        else:
+            self._file.writelines(json.dumps(row, ensure_ascii=False) + "\n" for row in rows)
+
+    def _arrow_schema(self, pa, row: dict):
+        """Tipos fixos a partir do modelo: um primeiro bloco com colunas vazias não muda o schema."""
+        tipos = {}
+        for coluna in self.model.__table__.columns:
+            if isinstance(coluna.type, Float):
+                tipos[coluna.name] = pa.float64()
+            elif isinstance(coluna.type, Integer):
+                tipos[coluna.name] = pa.int64()
+            else:
+                tipos[coluna.name] = pa.string()
+        return pa.schema([(nome, tipos.get(nome, pa.string())) for nome in row])
+
+    def close(self):
+        if self.formato == "parquet":
+            if self._writer is not None:
+                self._writer.close()
+        elif self._file is not None:
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class BulkImporter():
+    """Importação em massa de pacientes, diagnósticos e histórico.
+
+    Cada bloco do arquivo é gravado em uma transação com um único
+    `INSERT ... ON CONFLICT` (executemany). Pacientes são casados pelo CPF e
+    depois pelo ID; diagnósticos e histórico pelo ID. Linhas sem ID recebem
+    IDs do `id_allocator`, reservados de uma vez por bloco. Se o bloco violar
+    alguma restrição, ele é regravado linha a linha em savepoints para
+    rejeitar só as linhas inválidas.
+
+    `on_conflict`: "update" sobrescreve as colunas preenchidas no arquivo
+    (células vazias mantêm o valor atual); "ignore" mantém o registro existente.
+    """
+
+    def __init__(self, database: DatabaseConnection, chunk_size: int = 5000, on_conflict: str = "update"):
+        if on_conflict not in ("update", "ignore"):
+            raise ValueError(f"on_conflict inválido: {on_conflict}. Use 'update' ou 'ignore'")
+        self.database = database
+        self.chunk_size = chunk_size
+        self.on_conflict = on_conflict
+
+    def _clean(self, model, row: dict) -> dict:
+        limpo = {}
+        for coluna in model.__table__.columns:
+            if coluna.name not in row:
+                continue
+            valor = row[coluna.name]
+            if isinstance(valor, str):
+                valor = valor.strip() or None
+            if valor is None:
+                # Célula vazia: nem sobrescreve o valor existente nem anula o padrão do modelo.
+                continue
+            if isinstance(coluna.type, DateTime) and not isinstance(valor, datetime.datetime):
+                valor = datetime.datetime.fromisoformat(str(valor))
+            elif isinstance(coluna.type, Integer):
+                valor = int(valor)
+            elif isinstance(coluna.type, Float):
+                # Percentuais em texto ("87%") são normalizados por `normalize_diagnosis`.
+                valor = valor if isinstance(valor, str) else float(valor)
+            elif not isinstance(valor, str):
+                valor = str(valor)
+            limpo[coluna.name] = valor
+        return limpo
+
+    def _prepare_patients(self, session: Session, rows: list, rejeitados: list) -> list:
+        cpfs = {r["cpf"] for _, r in rows if r.get("cpf")}
+        por_cpf = dict(session.execute(
+            select(Patient.cpf, Patient.id).where(Patient.cpf.in_(cpfs))
+        ).all()) if cpfs else {}
+
+        unicos = {}
+        for numero, row in rows:
+            if not row.get("name"):
+                rejeitados.append({"linha": numero, "erro": "name é obrigatório"})
+                continue
+            if row.get("cpf") in por_cpf:
+                row["id"] = por_cpf[row["cpf"]]
+            chave = ("cpf", row["cpf"]) if row.get("cpf") else _row_key(row, numero)
+            unicos[chave] = row
+        return list(unicos.values())
+
+    def _prepare_diagnoses(self, session: Session, rows: list, rejeitados: list) -> list:
+        validos = []
+        for numero, row in rows:
+            try:
+                row.update(queries.normalize_diagnosis(
+                    row.get("classification"), row.get("confidence"), row.get("priority")
+                ))
+            except ValueError as e:
+                rejeitados.append({"linha": numero, "erro": str(e)})
+                continue
+            validos.append((numero, row))
+        return self._with_existing_patient(session, validos, rejeitados)
+
+    def _prepare_history(self, session: Session, rows: list, rejeitados: list) -> list:
+        validos = []
+        for numero, row in rows:
+            if not row.get("description"):
+                rejeitados.append({"linha": numero, "erro": "description é obrigatório"})
+                continue
+            validos.append((numero, row))
+        return self._with_existing_patient(session, validos, rejeitados)
+
+    def _with_existing_patient(self, session: Session, rows: list, rejeitados: list) -> list:
+        """Uma consulta por bloco no lugar de uma falha de FK por linha."""
+        ids = {r.get("patient_id") for _, r in rows if r.get("patient_id")}
+        existentes = set(session.execute(select(Patient.id).where(Patient.id.in_(ids))).scalars()) if ids else set()
+
+        unicos = {}
+        for numero, row in rows:
+            if row.get("patient_id") not in existentes:
+                rejeitados.append({"linha": numero, "erro": f"Paciente {row.get('patient_id')} não encontrado"})
+                continue
+            unicos[_row_key(row, numero)] = row
+        return list(unicos.values())
+
+    def _statement(self, model, colunas: list):
+        stmt = sqlite_insert(model.__table__)
+        atualizar = {c: stmt.excluded[c] for c in colunas if c != "id"}
+        if self.on_conflict == "ignore" or not atualizar:
+            return stmt.on_conflict_do_nothing(index_elements=["id"])
+        if model is Patient:
+            atualizar["updated_at"] = datetime.datetime.utcnow()
+        return stmt.on_conflict_do_update(index_elements=["id"], set_=atualizar)
+
+    def _write(self, session: Session, model, rows: list, rejeitados: list) -> int:
+        """Grava as linhas agrupadas pelas colunas preenchidas.
+
+        Colunas deixadas em branco no arquivo ficam fora do INSERT: recebem o
+        padrão do modelo em registros novos e não são tocadas pelo upsert em
+        registros existentes.
+        """
+        grupos = {}
+        for row in rows:
+            grupos.setdefault(tuple(sorted(row)), []).append(row)
+        return sum(
+            self._write_group(session, self._statement(model, list(colunas)), linhas, rejeitados)
+            for colunas, linhas in grupos.items()
+        )
+
+    def _write_group(self, session: Session, stmt, linhas: list, rejeitados: list) -> int:
+        try:
+            with session.begin_nested():
+                session.execute(stmt, linhas)
+            return len(linhas)
+        except IntegrityError:
+            pass
+
+        gravadas = 0
+        for linha in linhas:
+            try:
+                with session.begin_nested():
+                    session.execute(stmt, [linha])
+                gravadas += 1
+            except IntegrityError as e:
+                rejeitados.append({"id": linha.get("id"), "erro": str(e.orig)})
+        return gravadas
+
+    def _import_chunk(self, session: Session, entity: str, rows: list, primeira_linha: int) -> tuple:
+        model = ENTITIES[entity]
+        rejeitados = []
+
+        limpas = []
+        for numero, row in enumerate(rows, start=primeira_linha):
+            try:
+                limpas.append((numero, self._clean(model, row)))
+            except (TypeError, ValueError) as e:
+                rejeitados.append({"linha": numero, "erro": f"Valor inválido: {e}"})
+
+        preparar = {
+            "patients": self._prepare_patients,
+            "diagnoses": self._prepare_diagnoses,
+            "history": self._prepare_history,
+        }[entity]
+        linhas = preparar(session, limpas, rejeitados)
+        if not linhas:
+            return 0, rejeitados
+
+        prefixo = ID_PREFIXES.get(entity)
+        if prefixo:
+            explicitos = [row["id"] for row in linhas if row.get("id")]
+            sem_id = [row for row in linhas if not row.get("id")]
+            for row, novo_id in zip(sem_id, id_allocator.reserve(session, prefixo, model, len(sem_id))):
+                row["id"] = novo_id
+
+        gravadas = self._write(session, model, linhas, rejeitados)
+
+        if prefixo:
+            id_allocator.advance(session, prefixo, model, explicitos)
+        return gravadas, rejeitados
+
+    def import_rows(self, entity: str, rows: Iterable[dict], progresso: Optional[Callable] = None) -> dict:
+        """Importa linhas já carregadas (dicts com os nomes das colunas da tabela)."""
+        if entity not in ENTITIES:
+            raise ValueError(f"Entidade desconhecida: {entity}. Use uma de {list(ENTITIES)}")
+
+        inicio = time.perf_counter()
+        lidas = gravadas = total_rejeitadas = 0
+        amostras = []
+
+        for bloco in _chunked(rows, self.chunk_size):
+            with self.database.get_session() as session:
+                n, rejeitados = self._import_chunk(session, entity, bloco, lidas + 1)
+            lidas += len(bloco)
+            gravadas += n
+            total_rejeitadas += len(rejeitados)
+            amostras.extend(rejeitados[:MAX_REJECTED_SAMPLES - len(amostras)])
+
+            if progresso:
+                decorrido = time.perf_counter() - inicio
+                progresso(f"   {lidas:,} linhas lidas, {gravadas:,} gravadas ({lidas / decorrido:,.0f} linhas/s)")
+
+        if entity == "diagnoses" and gravadas:
+            # Upserts podem mudar classificação/prioridade de linhas já agregadas.
+            with self.database.get_session() as session:
+                diagnosis_stats.rebuild(session)
+
+        segundos = time.perf_counter() - inicio
+        resumo = {
+            "entidade": entity,
+            "lidas": lidas,
+            "gravadas": gravadas,
+            "rejeitadas": total_rejeitadas,
+            "erros": amostras,
+            "segundos": round(segundos, 3),
+            "linhas_por_segundo": round(lidas / segundos, 1) if segundos > 0 else 0.0,
+        }
+        logger.info(f"Importação de {entity}: {gravadas}/{lidas} linhas em {segundos:.2f}s")
+        return resumo
+
+    def import_file(self, entity: str, path: Path, formato: str = None, progresso: Optional[Callable] = None) -> dict:
+        linhas = itertools.chain.from_iterable(read_chunks(path, formato, self.chunk_size))
+        return self.import_rows(entity, linhas, progresso=progresso)
+
+
+class BulkExporter():
+    """Exportação em massa, lendo pela engine somente leitura em blocos (`yield_per`)."""
+
+    def __init__(self, database: DatabaseConnection, chunk_size: int = 5000):
+        self.database = database
+        self.chunk_size = chunk_size
+
+    def export_file(self, entity: str, path: Path, formato: str = None, progresso: Optional[Callable] = None) -> dict:
+        if entity not in ENTITIES:
+            raise ValueError(f"Entidade desconhecida: {entity}. Use uma de {list(ENTITIES)}")
+
+        colunas = ENTITIES[entity].__table__.c
+        row_to_dict = ROW_TO_DICT[entity]
+        stmt = select(colunas).order_by(colunas.id).execution_options(yield_per=self.chunk_size)
+
+        inicio = time.perf_counter()
+        total = 0
+        with self.database.get_read_session() as session, ChunkWriter(path, formato, ENTITIES[entity]) as writer:
+            for bloco in session.execute(stmt).partitions():
+                writer.write([row_to_dict(row) for row in bloco])
+                total += len(bloco)
+                if progresso:
+                    progresso(f"   {total:,} linhas exportadas")
+
+        segundos = time.perf_counter() - inicio
+        return {
+            "entidade": entity,
+            "exportadas": total,
+            "arquivo": str(path),
+            "segundos": round(segundos, 3),
+            "linhas_por_segundo": round(total / segundos, 1) if segundos > 0 else 0.0,
+        }
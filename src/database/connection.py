@@ -1,4 +1,5 @@
 import logging
+import sqlite3
 from contextlib import contextmanager
 from pathlib import Path
 from typing import Generator
@@ -6,18 +7,39 @@ from typing import Generator
 from sqlalchemy import create_engine, event
 from sqlalchemy.engine import Engine
 from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import QueuePool
 
+from .migrations import migrate
 from .models import Base
-from ..config import Settings
+from ..config import Settings, settings as default_settings
 
 logger = logging.getLogger(__name__)
 
+
+def apply_sqlite_pragmas(dbapi_connection, settings: Settings, read_only: bool = False):
+    """Pragmas por conexão do perfil de desempenho do SQLite (ver `Settings.sqlite_*`)."""
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.execute(f"PRAGMA busy_timeout={int(settings.sqlite_busy_timeout_ms)}")
+    cursor.execute(f"PRAGMA cache_size={-int(settings.sqlite_cache_size_kib)}")
+    cursor.execute(f"PRAGMA mmap_size={int(settings.sqlite_mmap_size)}")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    if read_only:
+        cursor.execute("PRAGMA query_only=ON")
+    else:
+        cursor.execute(f"PRAGMA journal_mode={settings.sqlite_journal_mode}")
+        cursor.execute(f"PRAGMA synchronous={settings.sqlite_synchronous}")
+    cursor.close()
+
+
 class DatabaseConnection():
-    def __init__(self):
+    def __init__(self, settings: Settings = None):
         self._engine = None
+        self._read_engine = None
         self._sessionLocal = None
+        self._readSessionLocal = None
         self._session = None
-        self.settings = Settings()
+        self.settings = settings if settings is not None else default_settings
 
 
     def get_engine(self) -> Engine:
@@ -28,20 +50,75 @@ class DatabaseConnection():
             
             self._engine = create_engine(
                 self.settings.database_url,
-                connect_args={"check_same_thread": False}
+                connect_args={
+                    "check_same_thread": False,
+                    "timeout": self.settings.sqlite_busy_timeout_ms / 1000.0,
+                },
+                pool_size=self.settings.db_pool_size,
+                max_overflow=self.settings.db_max_overflow,
+                pool_timeout=self.settings.db_pool_timeout
             )
             
             @event.listens_for(self._engine, "connect")
             def set_sqlite_pragma(dbapi_connection, connection_record):
-                cursor = dbapi_connection.cursor()
-                cursor.execute("PRAGMA foreign_keys=ON")
-                cursor.close()
+                apply_sqlite_pragmas(dbapi_connection, self.settings)
+                if self.settings.sqlite_begin_immediate:
+                    # Desliga o BEGIN implícito do pysqlite para emitir o nosso abaixo.
+                    dbapi_connection.isolation_level = None
+            
+            if self.settings.sqlite_begin_immediate:
+                @event.listens_for(self._engine, "begin")
+                def do_begin(connection):
+                    # Reserva a escrita já no início: evita o "database is locked"
+                    # de duas transações que leem e depois tentam escrever.
+                    connection.exec_driver_sql("BEGIN IMMEDIATE")
             
             logger.info(f"Engine criada: {self.settings.database_url}")
         
         return self._engine
 
 
+    def get_read_engine(self) -> Engine:
+        """Engine somente leitura (mode=ro, query_only) para as ferramentas de consulta.
+
+        Com WAL, leitores nunca esperam pelo escritor; este pool separado
+        também não disputa conexões com as transações de escrita.
+        """
+        if not self.settings.sqlite_read_replica:
+            return self.get_engine()
+        
+        if self._read_engine is None:
+            with self.get_engine().connect():
+                pass
+            
+            db_uri = f"file:{self.settings.get_database_path()}?mode=ro"
+            
+            def connect():
+                return sqlite3.connect(
+                    db_uri,
+                    uri=True,
+                    check_same_thread=False,
+                    timeout=self.settings.sqlite_busy_timeout_ms / 1000.0
+                )
+            
+            self._read_engine = create_engine(
+                "sqlite://",
+                creator=connect,
+                poolclass=QueuePool,
+                pool_size=self.settings.db_pool_size,
+                max_overflow=self.settings.db_max_overflow,
+                pool_timeout=self.settings.db_pool_timeout
+            )
+            
+            @event.listens_for(self._read_engine, "connect")
+            def set_sqlite_pragma(dbapi_connection, connection_record):
+                apply_sqlite_pragmas(dbapi_connection, self.settings, read_only=True)
+            
+            logger.info(f"Engine somente leitura criada: {db_uri}")
+        
+        return self._read_engine
+
+
     def get_session_factory(self) -> sessionmaker:
         if self._sessionLocal is None:
             engine = self.get_engine()
@@ -70,10 +147,28 @@ class DatabaseConnection():
             session.close()
 
 
+    @contextmanager
+    def get_read_session(self) -> Generator[Session, None, None]:
+        """Sessão para consultas: usa a engine somente leitura e nunca faz commit."""
+        if self._readSessionLocal is None:
+            self._readSessionLocal = sessionmaker(
+                autocommit=False,
+                autoflush=False,
+                bind=self.get_read_engine()
+            )
+        session = self._readSessionLocal()
+        
+        try:
+            yield session
+        finally:
+            session.rollback()
+            session.close()
+
+
     def init_database(self):
         engine = self.get_engine()
-        Base.metadata.create_all(bind=engine)
-        logger.info("Banco de dados inicializado")
+        criados = migrate(engine)
+        logger.info(f"Banco de dados inicializado ({len(criados)} índices criados)")
 
 
     def drop_database(self):
@@ -0,0 +1,19 @@
+from sqlalchemy.exc import IntegrityError
+
+
+def constraint_violation(error: IntegrityError) -> tuple:
+    """Identifica a restrição violada a partir da mensagem do SQLite.
+
+    Returns:
+        Tupla (tipo, alvo): ("foreign_key", None), ("unique", "tabela.coluna"),
+        ("not_null", "tabela.coluna") ou ("other", mensagem original)
+    """
+    mensagem = str(error.orig) if error.orig is not None else str(error)
+
+    if "FOREIGN KEY constraint failed" in mensagem:
+        return "foreign_key", None
+    if mensagem.startswith("UNIQUE constraint failed:"):
+        return "unique", mensagem.split(":", 1)[1].strip()
+    if mensagem.startswith("NOT NULL constraint failed:"):
+        return "not_null", mensagem.split(":", 1)[1].strip()
+    return "other", mensagem
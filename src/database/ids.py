@@ -0,0 +1,87 @@
+import logging
+
+from sqlalchemy import Integer, cast, func, select, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from .models import IdSequence
+
+logger = logging.getLogger(__name__)
+
+
+class IdAllocator():
+    """Alocação de IDs sequenciais (P001, D0042, ...) por tabela de contadores.
+
+    Cada reserva é um único `UPDATE ... RETURNING` na sessão do chamador, então
+    o ID faz parte da mesma transação do INSERT: se a transação falhar, o
+    contador volta junto, e dois escritores concorrentes nunca recebem o mesmo
+    número. O custo é constante, independente do tamanho da tabela.
+    """
+
+    def __init__(self, width: int = 3):
+        self.width = width
+
+
+    def _sequence_name(self, prefix: str, model) -> str:
+        return f"{model.__tablename__}:{prefix}"
+
+
+    def _seed(self, session: Session, name: str, prefix: str, model):
+        """Cria o contador a partir do maior ID numérico existente (bancos anteriores à tabela de sequências)."""
+        suffix = cast(func.substr(model.id, len(prefix) + 1), Integer)
+        current = session.execute(
+            select(func.max(suffix)).where(model.id.like(f"{prefix}%"))
+        ).scalar() or 0
+
+        session.execute(
+            sqlite_insert(IdSequence)
+            .values(name=name, value=current)
+            .on_conflict_do_nothing(index_elements=["name"])
+        )
+        logger.info(f"Sequência '{name}' iniciada em {current}")
+
+
+    def reserve(self, session: Session, prefix: str, model, count: int = 1) -> list:
+        """Reserva `count` IDs consecutivos para `model` e retorna a lista formatada."""
+        if count < 1:
+            return []
+
+        name = self._sequence_name(prefix, model)
+        stmt = (
+            update(IdSequence)
+            .where(IdSequence.name == name)
+            .values(value=IdSequence.value + count)
+            .returning(IdSequence.value)
+        )
+
+        last = session.execute(stmt).scalar()
+        if last is None:
+            self._seed(session, name, prefix, model)
+            last = session.execute(stmt).scalar()
+
+        first = last - count + 1
+        return [f"{prefix}{number:0{self.width}d}" for number in range(first, last + 1)]
+
+
+    def advance(self, session: Session, prefix: str, model, ids) -> None:
+        """Garante que o contador fique à frente de IDs gravados explicitamente (ex: importação)."""
+        numbers = [int(i[len(prefix):]) for i in ids if i and i.startswith(prefix) and i[len(prefix):].isdigit()]
+        if not numbers:
+            return
+
+        name = self._sequence_name(prefix, model)
+        updated = session.execute(
+            update(IdSequence)
+            .where(IdSequence.name == name)
+            .values(value=func.max(IdSequence.value, max(numbers)))
+            .returning(IdSequence.value)
+        ).scalar()
+        if updated is None:
+            self._seed(session, name, prefix, model)
+
+
+    def next_id(self, session: Session, prefix: str, model) -> str:
+        return self.reserve(session, prefix, model, 1)[0]
+
+
+id_allocator = IdAllocator()
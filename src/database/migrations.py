@@ -0,0 +1,69 @@
+import datetime
+import logging
+
+from sqlalchemy import inspect, update
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from .models import Base, Diagnosis
+from .stats import diagnosis_stats
+
+logger = logging.getLogger(__name__)
+
+
+def ensure_indexes(engine: Engine) -> list:
+    """Cria os índices declarados nos modelos que ainda não existem no banco.
+
+    `create_all` não altera tabelas já existentes, então bancos criados antes
+    da declaração dos índices precisam desta etapa. Após criar algum índice,
+    roda `ANALYZE` para o planejador do SQLite usar as novas estatísticas.
+
+    Returns:
+        Nomes dos índices criados
+    """
+    inspector = inspect(engine)
+    created = []
+
+    for table in Base.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+        existing = {index["name"] for index in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name not in existing:
+                index.create(bind=engine)
+                created.append(index.name)
+                logger.info(f"Índice criado: {index.name}")
+
+    if created:
+        with engine.begin() as connection:
+            connection.exec_driver_sql("ANALYZE")
+
+    return created
+
+
+def fill_missing_timestamps(engine: Engine) -> int:
+    """Data os diagnósticos gravados sem `timestamp` (importações antigas com a célula vazia).
+
+    Sem data eles ficavam fora da paginação por cursor; recebem o instante da
+    migração, como receberiam do padrão do modelo se tivessem sido gravados agora.
+    """
+    with engine.begin() as connection:
+        filled = connection.execute(
+            update(Diagnosis).where(Diagnosis.timestamp.is_(None)).values(timestamp=datetime.datetime.utcnow())
+        ).rowcount
+    if filled:
+        logger.warning(f"{filled} diagnósticos sem data receberam o horário da migração")
+    return filled
+
+
+def migrate(engine: Engine) -> list:
+    """Leva um banco existente ao esquema atual: tabelas novas, índices ausentes, datas e agregados."""
+    Base.metadata.create_all(bind=engine)
+    created = ensure_indexes(engine)
+    if fill_missing_timestamps(engine):
+        # Os agregados diários tinham essas linhas em "sem-data".
+        with Session(engine) as session, session.begin():
+            diagnosis_stats.rebuild(session)
+    else:
+        diagnosis_stats.ensure_backfilled(engine)
+    return created
@@ -1,6 +1,6 @@
 from datetime import datetime
 from sqlalchemy.orm import declarative_base, relationship
-from sqlalchemy import Column, DateTime, Float, ForeignKey, Integer, String, Text
+from sqlalchemy import Column, DateTime, Float, ForeignKey, Index, Integer, String, Text
 
 Base = declarative_base()
 
@@ -47,11 +47,19 @@ class Diagnosis(Base):
     confidence = Column(Float, nullable=False)
     priority = Column(String(20), nullable=False)
     notes = Column(Text, nullable=True)
-    timestamp = Column(DateTime, default=datetime.utcnow)
+    timestamp = Column(DateTime, nullable=False, default=datetime.utcnow)
     created_by = Column(String(100), default="system")
     
     patient = relationship("Patient", back_populates="diagnoses")
     
+    __table_args__ = (
+        Index("ix_diagnoses_patient_timestamp", patient_id, timestamp.desc()),
+        Index("ix_diagnoses_priority_timestamp", priority, timestamp),
+        Index("ix_diagnoses_classification_timestamp", classification, timestamp),
+        Index("ix_diagnoses_timestamp_id", timestamp, id),
+        Index("ix_diagnoses_image_path", image_path),
+    )
+    
     def to_dict(self) -> dict:
         return {
             "id": self.id,
@@ -81,6 +89,10 @@ class MedicalHistory(Base):
     
     patient = relationship("Patient", back_populates="medical_history")
     
+    __table_args__ = (
+        Index("ix_medical_history_patient_date", patient_id, date_recorded),
+    )
+    
     def to_dict(self) -> dict:
         return {
             "id": self.id,
@@ -93,3 +105,41 @@ class MedicalHistory(Base):
     
     def __repr__(self):
         return f"<MedicalHistory(id={self.id}, patient_id={self.patient_id})>"
+
+
+
+class IdSequence(Base):
+    __tablename__ = "id_sequences"
+    
+    name = Column(String(50), primary_key=True)
+    value = Column(Integer, nullable=False, default=0)
+    
+    def __repr__(self):
+        return f"<IdSequence(name={self.name}, value={self.value})>"
+
+
+class DiagnosisStats(Base):
+    """Agregado de diagnósticos por classificação e prioridade (totais de todo o histórico)."""
+    __tablename__ = "diagnosis_stats"
+    
+    classification = Column(String(20), primary_key=True)
+    priority = Column(String(20), primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+    confidence_sum = Column(Float, nullable=False, default=0.0)
+    
+    def __repr__(self):
+        return f"<DiagnosisStats({self.classification}/{self.priority}: {self.count})>"
+
+
+class DiagnosisDailyStats(Base):
+    """Mesmo agregado de `DiagnosisStats`, por dia (YYYY-MM-DD) do diagnóstico."""
+    __tablename__ = "diagnosis_daily_stats"
+    
+    day = Column(String(10), primary_key=True)
+    classification = Column(String(20), primary_key=True)
+    priority = Column(String(20), primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+    confidence_sum = Column(Float, nullable=False, default=0.0)
+    
+    def __repr__(self):
+        return f"<DiagnosisDailyStats({self.day} {self.classification}/{self.priority}: {self.count})>"
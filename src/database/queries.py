@@ -0,0 +1,253 @@
+import datetime
+import json
+
+from sqlalchemy import and_, func, literal_column, or_, select
+from sqlalchemy.sql import Select
+
+from .models import Diagnosis, MedicalHistory, Patient
+
+MAX_PAGE_SIZE = 200
+
+REPORT_HISTORY_LIMIT = 10
+
+PRIORITY_MAP = {
+    "BAIXA": "LOW", "MÉDIA": "MEDIUM", "ALTA": "HIGH", "CRÍTICA": "CRITICAL",
+    "LOW": "LOW", "MEDIUM": "MEDIUM", "HIGH": "HIGH", "CRITICAL": "CRITICAL"
+}
+
+
+def _iso(value):
+    return value.isoformat() if value else None
+
+
+def patient_row_to_dict(row) -> dict:
+    return {
+        "id": row.id,
+        "name": row.name,
+        "birth_date": row.birth_date,
+        "cpf": row.cpf,
+        "contact": row.contact,
+        "email": row.email,
+        "address": row.address,
+        "created_at": _iso(row.created_at),
+        "updated_at": _iso(row.updated_at),
+    }
+
+
+def diagnosis_row_to_dict(row) -> dict:
+    return {
+        "id": row.id,
+        "patient_id": row.patient_id,
+        "image_path": row.image_path,
+        "classification": row.classification,
+        "confidence": row.confidence,
+        "priority": row.priority,
+        "notes": row.notes,
+        "timestamp": _iso(row.timestamp),
+        "created_by": row.created_by,
+    }
+
+
+def history_row_to_dict(row) -> dict:
+    return {
+        "id": row.id,
+        "patient_id": row.patient_id,
+        "description": row.description,
+        "condition_type": row.condition_type,
+        "date_recorded": _iso(row.date_recorded),
+        "recorded_by": row.recorded_by,
+    }
+
+
+def normalize_diagnosis(classification: str, confidence, priority: str) -> dict:
+    """Valida e normaliza classificação, confiança (fração ou percentual) e prioridade.
+
+    Raises:
+        ValueError: com a mensagem exibida ao usuário quando algum campo é inválido
+    """
+    if str(classification).upper() not in ["NORMAL", "PNEUMONIA"]:
+        raise ValueError(f"Classificação inválida: {classification}. Use NORMAL ou PNEUMONIA.")
+
+    prioridades_validas = list(PRIORITY_MAP)
+    if str(priority).upper() not in prioridades_validas:
+        raise ValueError(f"Prioridade inválida: {priority}. Valores aceitos: {prioridades_validas}")
+
+    texto = str(confidence).strip() if isinstance(confidence, str) else None
+    try:
+        conf_float = float(texto.rstrip("%") if texto is not None else confidence)
+    except (TypeError, ValueError):
+        raise ValueError(f"Confiança inválida: {confidence}")
+    # "0.5%" é meio por cento; só números sem "%" acima de 1 são percentuais.
+    if (texto is not None and texto.endswith("%")) or conf_float > 1.0:
+        conf_float = conf_float / 100.0
+
+    return {
+        "classification": str(classification).upper(),
+        "confidence": conf_float,
+        "priority": PRIORITY_MAP[str(priority).upper()],
+    }
+
+
+def clamp_limit(limit: int) -> int:
+    return max(1, min(int(limit or MAX_PAGE_SIZE), MAX_PAGE_SIZE))
+
+
+def parse_date(value: str) -> datetime.datetime:
+    return datetime.datetime.strptime(value[:10], "%Y-%m-%d")
+
+
+def encode_diagnosis_cursor(row) -> str:
+    return f"{row.timestamp.isoformat()}|{row.id}"
+
+
+def decode_diagnosis_cursor(cursor: str) -> tuple:
+    timestamp, diagnosis_id = cursor.rsplit("|", 1)
+    return datetime.datetime.fromisoformat(timestamp), diagnosis_id
+
+
+def diagnoses_page(
+    limit: int,
+    cursor: str = None,
+    offset: int = 0,
+    patient_id: str = None,
+    priority: str = None,
+    classification: str = None,
+    start: str = None,
+    end: str = None
+) -> Select:
+    """Página de diagnósticos do mais recente para o mais antigo, ordenada por (timestamp, id).
+
+    Com `cursor` a página começa logo após o último item da anterior (keyset),
+    usando o índice em vez de percorrer as linhas já vistas; `offset` só é
+    aplicado quando não há cursor. Busca `limit + 1` linhas para saber se há
+    próxima página.
+    """
+    columns = Diagnosis.__table__.c
+    stmt = select(columns)
+
+    if patient_id:
+        stmt = stmt.where(columns.patient_id == patient_id)
+    if priority:
+        stmt = stmt.where(columns.priority == PRIORITY_MAP.get(priority.upper(), priority.upper()))
+    if classification:
+        stmt = stmt.where(columns.classification == classification.upper())
+    if start:
+        stmt = stmt.where(columns.timestamp >= parse_date(start))
+    if end:
+        stmt = stmt.where(columns.timestamp < parse_date(end) + datetime.timedelta(days=1))
+
+    if cursor:
+        timestamp, diagnosis_id = decode_diagnosis_cursor(cursor)
+        stmt = stmt.where(
+            columns.timestamp <= timestamp,
+            or_(columns.timestamp < timestamp, and_(columns.timestamp == timestamp, columns.id < diagnosis_id))
+        )
+    elif offset:
+        stmt = stmt.offset(offset)
+
+    return stmt.order_by(columns.timestamp.desc(), columns.id.desc()).limit(limit + 1)
+
+
+def _recent_history_json(patients, limit: int):
+    """Últimos `limit` registros de histórico do paciente como array JSON (subconsulta correlacionada)."""
+    history = MedicalHistory.__table__.c
+    recent = (
+        select(history.description, history.condition_type, history.date_recorded, history.recorded_by)
+        .where(history.patient_id == patients.id)
+        .order_by(history.date_recorded.desc(), history.id.desc())
+        .limit(limit)
+        .correlate(Patient.__table__)
+        .subquery("recent_history")
+    )
+    return select(func.json_group_array(func.json_object(
+        "description", recent.c.description,
+        "condition_type", recent.c.condition_type,
+        "date_recorded", recent.c.date_recorded,
+        "recorded_by", recent.c.recorded_by,
+    ))).scalar_subquery()
+
+
+def diagnoses_with_patient(
+    start: str = None,
+    end: str = None,
+    priority: str = None,
+    classification: str = None,
+    diagnosis_id: str = None,
+    patient_id: str = None,
+    history_limit: int = REPORT_HISTORY_LIMIT
+) -> Select:
+    """Diagnósticos com os dados do paciente (prefixo `patient_`) e seu histórico recente, em uma consulta.
+
+    Em ordem cronológica; com `patient_id` a ordem é do mais recente para o
+    mais antigo, para que o primeiro seja o último diagnóstico do paciente.
+    """
+    columns = Diagnosis.__table__.c
+    patients = Patient.__table__.c
+    stmt = select(
+        columns,
+        patients.name.label("patient_name"),
+        patients.birth_date.label("patient_birth_date"),
+        patients.cpf.label("patient_cpf"),
+        patients.contact.label("patient_contact"),
+        patients.email.label("patient_email"),
+        patients.updated_at.label("patient_updated_at"),
+        _recent_history_json(patients, history_limit).label("patient_history"),
+    ).join(Patient.__table__, patients.id == columns.patient_id)
+
+    if diagnosis_id:
+        stmt = stmt.where(columns.id == diagnosis_id)
+    if patient_id:
+        stmt = stmt.where(columns.patient_id == patient_id)
+    if priority:
+        stmt = stmt.where(columns.priority == PRIORITY_MAP.get(priority.upper(), priority.upper()))
+    if classification:
+        stmt = stmt.where(columns.classification == classification.upper())
+    if start:
+        stmt = stmt.where(columns.timestamp >= parse_date(start))
+    if end:
+        stmt = stmt.where(columns.timestamp < parse_date(end) + datetime.timedelta(days=1))
+
+    if patient_id:
+        return stmt.order_by(columns.timestamp.desc(), columns.id.desc())
+    return stmt.order_by(columns.timestamp, columns.id)
+
+
+def patient_from_row(row) -> dict:
+    """Paciente embutido em uma linha de `diagnoses_with_patient`."""
+    return {
+        "id": row.patient_id,
+        "name": row.patient_name,
+        "birth_date": row.patient_birth_date,
+        "cpf": row.patient_cpf,
+        "contact": row.patient_contact,
+        "email": row.patient_email,
+        "updated_at": _iso(row.patient_updated_at),
+    }
+
+
+def history_from_row(row) -> list:
+    """Histórico recente embutido em uma linha de `diagnoses_with_patient`."""
+    return json.loads(row.patient_history) if row.patient_history else []
+
+
+def patients_page(limit: int, cursor: str = None, offset: int = 0) -> Select:
+    """Página de pacientes na ordem de cadastro, paginada pelo rowid do SQLite."""
+    rowid = literal_column("patients.rowid")
+    stmt = select(rowid.label("row_number"), *Patient.__table__.c)
+
+    if cursor:
+        stmt = stmt.where(rowid > int(cursor))
+    elif offset:
+        stmt = stmt.offset(offset)
+
+    return stmt.order_by(rowid).limit(limit + 1)
+
+
+def history_for_patient(patient_id: str) -> Select:
+    columns = MedicalHistory.__table__.c
+    return select(columns).where(columns.patient_id == patient_id).order_by(columns.date_recorded)
+
+
+def split_page(rows: list, limit: int) -> tuple:
+    """Separa as `limit` linhas da página e informa se existe próxima."""
+    return rows[:limit], len(rows) > limit
@@ -1,14 +1,17 @@
 import random
 import logging
 from datetime import datetime, timedelta
+from .bulk import BulkImporter
 from .connection import DatabaseConnection
-from .models import Patient, Diagnosis, MedicalHistory
+from .models import Patient
 
 logger = logging.getLogger(__name__)
 
 class Seed():
-    def __init__(self):
-        self.database = DatabaseConnection()
+    def __init__(self, database: DatabaseConnection = None):
+        self.database = database if database is not None else DatabaseConnection()
+        # Dados de exemplo já existentes são mantidos (sem um SELECT por linha).
+        self.importer = BulkImporter(self.database, on_conflict="ignore")
 
     def seed_patients(self):
         """
@@ -62,14 +65,14 @@ class Seed():
         ),
     ]
     
-        with self.database.get_session() as session:
-            for patient in patients:
-                existing = session.query(Patient).filter(Patient.id == patient.id).first()
-                if not existing:
-                    session.add(patient)
-                    logger.info(f"Paciente criado: {patient.name}")
+        rows = [
+            {c.name: getattr(patient, c.name) for c in Patient.__table__.columns if getattr(patient, c.name) is not None}
+            for patient in patients
+        ]
+        resumo = self.importer.import_rows("patients", rows)
+        logger.info(f"Pacientes de exemplo: {resumo['gravadas']} gravados")
         
-            return len(patients)
+        return len(patients)
 
 
     def seed_diagnoses(self):
@@ -119,25 +122,17 @@ class Seed():
         },
     ]
     
-        with self.database.get_session() as session:
-            for i, diag_data in enumerate(diagnoses_data):
-                existing = session.query(Diagnosis).filter(Diagnosis.id == diag_data["id"]).first()
-                if not existing:
-                    # Criar com timestamp variado
-                    timestamp = datetime.now() - timedelta(days=random.randint(1, 30))
-                    
-                    diagnosis = Diagnosis(
-                        id=diag_data["id"],
-                        patient_id=diag_data["patient_id"],
-                        image_path=f"/data/sample_images/xray_{i+1}.png",
-                        classification=diag_data["classification"],
-                        confidence=diag_data["confidence"],
-                        priority=diag_data["priority"],
-                        notes=diag_data["notes"],
-                        timestamp=timestamp
-                    )
-                    session.add(diagnosis)
-                    logger.info(f"Diagnóstico criado: {diagnosis.id}")
+        rows = [
+            {
+                **diag_data,
+                "image_path": f"/data/sample_images/xray_{i+1}.png",
+                # Criar com timestamp variado
+                "timestamp": datetime.now() - timedelta(days=random.randint(1, 30)),
+            }
+            for i, diag_data in enumerate(diagnoses_data)
+        ]
+        resumo = self.importer.import_rows("diagnoses", rows)
+        logger.info(f"Diagnósticos de exemplo: {resumo['gravadas']} gravados")
         
         return len(diagnoses_data)
 
@@ -174,16 +169,11 @@ class Seed():
         },
     ]
     
-        with self.database.get_session() as session:
-            for hist_data in history_data:
-                history = MedicalHistory(
-                    patient_id=hist_data["patient_id"],
-                    description=hist_data["description"],
-                    condition_type=hist_data["condition_type"],
-                    recorded_by="sistema"
-                )
-                session.add(history)
-                logger.info(f"Histórico criado para paciente: {hist_data['patient_id']}")
+        resumo = self.importer.import_rows(
+            "history",
+            [{**hist_data, "recorded_by": "sistema"} for hist_data in history_data]
+        )
+        logger.info(f"Histórico de exemplo: {resumo['gravadas']} registros")
     
         return len(history_data)
 
@@ -0,0 +1,155 @@
+import datetime
+import logging
+from collections import defaultdict
+from typing import Iterable
+
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from .models import Diagnosis, DiagnosisDailyStats, DiagnosisStats
+
+logger = logging.getLogger(__name__)
+
+NO_DATE = "sem-data"
+
+
+def _value(diagnosis, name: str):
+    return diagnosis.get(name) if isinstance(diagnosis, dict) else getattr(diagnosis, name)
+
+
+def _day(timestamp) -> str:
+    if timestamp is None:
+        return NO_DATE
+    if isinstance(timestamp, str):
+        return timestamp[:10]
+    return timestamp.strftime("%Y-%m-%d")
+
+
+class DiagnosisStatsAggregator():
+    """Agregados de diagnósticos mantidos incrementalmente no banco.
+
+    `record` roda na mesma transação do INSERT do diagnóstico (um upsert por
+    tabela de agregado), então as estatísticas nunca divergem dos dados.
+    `summary` lê só as tabelas agregadas: o custo depende do número de
+    combinações classificação/prioridade (e dias no período), não do tamanho
+    do histórico.
+    """
+
+    def _upsert(self, session: Session, model, rows: list):
+        table = model.__table__
+        stmt = sqlite_insert(table)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[c.name for c in table.primary_key],
+            set_={
+                "count": table.c["count"] + stmt.excluded["count"],
+                "confidence_sum": table.c["confidence_sum"] + stmt.excluded["confidence_sum"],
+            }
+        )
+        session.execute(stmt, rows)
+
+
+    def record(self, session: Session, diagnoses: Iterable) -> None:
+        """Soma diagnósticos recém-gravados (objetos `Diagnosis` ou dicts) aos agregados."""
+        totals = defaultdict(lambda: [0, 0.0])
+        daily = defaultdict(lambda: [0, 0.0])
+
+        for diagnosis in diagnoses:
+            classification = _value(diagnosis, "classification")
+            priority = _value(diagnosis, "priority")
+            confidence = float(_value(diagnosis, "confidence") or 0.0)
+            day = _day(_value(diagnosis, "timestamp"))
+
+            for key, bucket in (((classification, priority), totals), ((day, classification, priority), daily)):
+                bucket[key][0] += 1
+                bucket[key][1] += confidence
+
+        if not totals:
+            return
+
+        self._upsert(session, DiagnosisStats, [
+            {"classification": c, "priority": p, "count": n, "confidence_sum": s}
+            for (c, p), (n, s) in totals.items()
+        ])
+        self._upsert(session, DiagnosisDailyStats, [
+            {"day": d, "classification": c, "priority": p, "count": n, "confidence_sum": s}
+            for (d, c, p), (n, s) in daily.items()
+        ])
+
+
+    def rebuild(self, session: Session) -> None:
+        """Recalcula os agregados a partir de `diagnoses` (bancos antigos, importações com upsert)."""
+        columns = Diagnosis.__table__.c
+        day = func.coalesce(func.substr(columns.timestamp, 1, 10), NO_DATE)
+
+        session.execute(delete(DiagnosisStats))
+        session.execute(delete(DiagnosisDailyStats))
+        session.execute(insert(DiagnosisStats).from_select(
+            ["classification", "priority", "count", "confidence_sum"],
+            select(columns.classification, columns.priority, func.count(), func.coalesce(func.sum(columns.confidence), 0.0))
+            .group_by(columns.classification, columns.priority)
+        ))
+        session.execute(insert(DiagnosisDailyStats).from_select(
+            ["day", "classification", "priority", "count", "confidence_sum"],
+            select(day, columns.classification, columns.priority, func.count(), func.coalesce(func.sum(columns.confidence), 0.0))
+            .group_by(day, columns.classification, columns.priority)
+        ))
+        logger.info("Agregados de diagnósticos recalculados")
+
+
+    def summary(self, session: Session, start: str = None, end: str = None) -> dict:
+        """Totais por classificação, prioridade e (com período) por dia.
+
+        Args:
+            start: Data inicial (YYYY-MM-DD), inclusiva - opcional
+            end: Data final (YYYY-MM-DD), inclusiva - opcional
+        """
+        if start or end:
+            table = DiagnosisDailyStats.__table__.c
+            stmt = select(table.day, table.classification, table.priority, table["count"], table.confidence_sum)
+            if start:
+                stmt = stmt.where(table.day >= datetime.date.fromisoformat(start[:10]).isoformat())
+            if end:
+                stmt = stmt.where(table.day <= datetime.date.fromisoformat(end[:10]).isoformat())
+        else:
+            table = DiagnosisStats.__table__.c
+            stmt = select(table.classification, table.priority, table["count"], table.confidence_sum)
+
+        total, confidence_sum = 0, 0.0
+        by_classification, by_priority, by_day = {}, {}, {}
+        for row in session.execute(stmt).mappings():
+            total += row["count"]
+            confidence_sum += row["confidence_sum"]
+            by_classification[row["classification"]] = by_classification.get(row["classification"], 0) + row["count"]
+            by_priority[row["priority"]] = by_priority.get(row["priority"], 0) + row["count"]
+            if "day" in row:
+                by_day[row["day"]] = by_day.get(row["day"], 0) + row["count"]
+
+        summary = {
+            "total": total,
+            "confidence_sum": confidence_sum,
+            "by_classification": by_classification,
+            "by_priority": by_priority,
+        }
+        if start or end:
+            summary["by_day"] = dict(sorted(by_day.items()))
+        return summary
+
+
+    def ensure_backfilled(self, engine: Engine) -> bool:
+        """Recalcula os agregados quando não batem com `diagnoses`.
+
+        Cobre bancos que já tinham diagnósticos antes destas tabelas e
+        importações em lote interrompidas antes do recálculo final.
+        """
+        with Session(engine) as session, session.begin():
+            agregado = session.execute(select(func.coalesce(func.sum(DiagnosisStats.count), 0))).scalar_one()
+            total = session.execute(select(func.count()).select_from(Diagnosis)).scalar_one()
+            if agregado == total:
+                return False
+            logger.warning(f"Agregados de diagnósticos divergentes ({agregado} != {total})")
+            self.rebuild(session)
+            return True
+
+diagnosis_stats = DiagnosisStatsAggregator()
@@ -0,0 +1,150 @@
+import logging
+import queue
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+
+from src.metrics import LatencyTracker
+
+logger = logging.getLogger(__name__)
+
+DIAGNOSTICO_PRIORITARIO = "diagnostico.prioritario"
+
+ALERT_PRIORITIES = {"HIGH", "CRITICAL"}
+
+
+@dataclass
+class Event():
+    topic: str
+    payload: dict
+    inferred_at: float
+    published_at: float = field(default_factory=time.time)
+
+
+class Subscription():
+    """Assinante de um tópico, com fila e thread próprias: um assinante lento não atrasa os demais."""
+
+    def __init__(self, topic: str, name: str, handler, max_pending: int = 10000):
+        self.topic = topic
+        self.name = name
+        self.handler = handler
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._thread = None
+
+        self.delivered = 0
+        self.errors = 0
+        self.dropped = 0
+        self.handler_ms = LatencyTracker()
+        self.end_to_end_ms = LatencyTracker()
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name=f"event-{self.name}", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join(timeout=timeout)
+            self._thread = None
+
+    def offer(self, event: Event):
+        try:
+            self._queue.put_nowait(event)
+        except queue.Full:
+            self.dropped += 1
+            logger.error(f"Fila do assinante {self.name} cheia; evento descartado: {event.payload.get('id')}")
+
+    def _run(self):
+        while (event := self._queue.get()) is not None:
+            inicio = time.perf_counter()
+            try:
+                self.handler(event)
+            except Exception as e:
+                self.errors += 1
+                logger.error(f"Assinante {self.name} falhou no evento {event.payload.get('id')}: {e}")
+                continue
+            self.handler_ms.observe((time.perf_counter() - inicio) * 1000.0)
+            self.end_to_end_ms.observe((time.time() - event.inferred_at) * 1000.0)
+            self.delivered += 1
+
+    def get_metrics(self) -> dict:
+        return {
+            "topic": self.topic,
+            "pending": self._queue.qsize(),
+            "delivered": self.delivered,
+            "errors": self.errors,
+            "dropped": self.dropped,
+            "handler_ms": self.handler_ms.snapshot(),
+            "end_to_end_ms": self.end_to_end_ms.snapshot(),
+        }
+
+
+class EventBus():
+    """Publica eventos do sistema para assinantes em processo, sem passar pelo LLM.
+
+    `publish` só enfileira o evento para cada assinante do tópico e retorna;
+    cada assinante consome sua fila em uma thread dedicada. A latência ponta a
+    ponta de cada entrega é medida a partir da inferência da imagem
+    (`mark_inference`) ou, sem ela, da publicação do evento.
+    """
+
+    def __init__(self, max_marks: int = 4096):
+        self._subscriptions = []
+        self._lock = threading.Lock()
+        self._marks = OrderedDict()
+        self._max_marks = max_marks
+        self.published = 0
+
+    def subscribe(self, topic: str, name: str, handler) -> Subscription:
+        subscription = Subscription(topic, name, handler)
+        with self._lock:
+            self._subscriptions.append(subscription)
+        subscription.start()
+        return subscription
+
+    def mark_inference(self, image_path: str, when: float = None):
+        """Registra o instante da inferência de uma imagem, usado na latência ponta a ponta."""
+        if not image_path:
+            return
+        with self._lock:
+            self._marks[str(image_path)] = when if when is not None else time.time()
+            self._marks.move_to_end(str(image_path))
+            while len(self._marks) > self._max_marks:
+                self._marks.popitem(last=False)
+
+    def publish(self, topic: str, payload: dict) -> int:
+        """Entrega o evento às filas dos assinantes do tópico; retorna quantos o receberam."""
+        with self._lock:
+            inferred_at = self._marks.pop(str(payload.get("image_path")), None)
+            subscriptions = [s for s in self._subscriptions if s.topic == topic]
+            self.published += 1
+
+        event = Event(topic, payload, inferred_at or time.time())
+        for subscription in subscriptions:
+            subscription.offer(event)
+        return len(subscriptions)
+
+    def publish_diagnoses(self, diagnosticos: list) -> int:
+        """Publica os diagnósticos já gravados com prioridade HIGH ou CRITICAL."""
+        publicados = 0
+        for diagnostico in diagnosticos:
+            if diagnostico.get("priority") in ALERT_PRIORITIES:
+                self.publish(DIAGNOSTICO_PRIORITARIO, diagnostico)
+                publicados += 1
+        return publicados
+
+    def shutdown(self):
+        with self._lock:
+            subscriptions = list(self._subscriptions)
+        for subscription in subscriptions:
+            subscription.stop()
+
+    def get_metrics(self) -> dict:
+        with self._lock:
+            subscriptions = list(self._subscriptions)
+        return {
+            "published": self.published,
+            "subscribers": {s.name: s.get_metrics() for s in subscriptions},
+        }
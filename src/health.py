@@ -0,0 +1,145 @@
+import asyncio
+import datetime
+import logging
+import time
+
+import httpx
+from sqlalchemy import text
+
+from src.config import Settings
+from src.database.connection import DatabaseConnection
+
+logger = logging.getLogger(__name__)
+
+
+class HealthAggregator():
+    """Verifica periodicamente as dependências do sistema e mantém o último resultado em memória.
+
+    O `/health` da API responde a partir desse snapshot, sem fazer nenhuma
+    chamada de rede no caminho da requisição.
+    """
+
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        mcp_url: str,
+        database: DatabaseConnection,
+        settings: Settings,
+        interval: float = 5.0,
+        timeout: float = 3.0
+    ):
+        self.client = client
+        self.mcp_url = mcp_url
+        self.database = database
+        self.settings = settings
+        self.interval = interval
+        self.timeout = timeout
+
+        self._snapshot = {"status": "starting", "checks": {}}
+        self._checked_at = None
+        self._task = None
+
+
+    async def start(self):
+        await self.refresh()
+        self._task = asyncio.create_task(self._loop(), name="health-aggregator")
+
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+    async def _loop(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.refresh()
+            except Exception as e:
+                logger.error(f"Falha ao atualizar health: {e}")
+
+
+    async def _check_mcp(self) -> dict:
+        inicio = time.perf_counter()
+        try:
+            response = await self.client.get(f"{self.mcp_url}/health", timeout=self.timeout)
+            return {
+                "status": "ok" if response.status_code == 200 else "degraded",
+                "latency_ms": round((time.perf_counter() - inicio) * 1000.0, 2),
+                "details": response.json(),
+            }
+        except Exception as e:
+            return {"status": "offline", "error": str(e)}
+
+
+    def _ping_database(self) -> float:
+        inicio = time.perf_counter()
+        with self.database.get_read_engine().connect() as connection:
+            connection.execute(text("SELECT 1"))
+        return (time.perf_counter() - inicio) * 1000.0
+
+
+    async def _check_database(self) -> dict:
+        try:
+            latency_ms = await asyncio.wait_for(asyncio.to_thread(self._ping_database), timeout=self.timeout)
+            return {"status": "ok", "latency_ms": round(latency_ms, 2)}
+        except Exception as e:
+            return {"status": "offline", "error": str(e)}
+
+
+    async def _check_llm(self) -> dict:
+        base_url = self.settings.ollama_base_url.rstrip("/")
+        if base_url.endswith("/v1"):
+            url = f"{base_url}/models"
+            headers = {"Authorization": f"Bearer {self.settings.groq_api_key}"} if self.settings.groq_api_key else {}
+        else:
+            url = f"{base_url}/api/tags"
+            headers = {}
+
+        inicio = time.perf_counter()
+        try:
+            response = await self.client.get(url, headers=headers, timeout=self.timeout)
+            return {
+                "status": "ok" if response.status_code < 400 else "degraded",
+                "http_status": response.status_code,
+                "latency_ms": round((time.perf_counter() - inicio) * 1000.0, 2),
+            }
+        except Exception as e:
+            return {"status": "offline", "error": str(e)}
+
+
+    async def refresh(self) -> dict:
+        mcp, database, llm = await asyncio.gather(
+            self._check_mcp(),
+            self._check_database(),
+            self._check_llm()
+        )
+
+        model_ready = bool(mcp.get("details", {}).get("model_ready"))
+        checks = {
+            "mcp_server": mcp,
+            "model": {"status": "ok" if model_ready else "not_ready"},
+            "database": database,
+            "llm": llm,
+        }
+        status = "ok" if all(c["status"] == "ok" for c in checks.values()) else "degraded"
+
+        self._checked_at = time.time()
+        self._snapshot = {
+            "status": status,
+            "checked_at": datetime.datetime.fromtimestamp(self._checked_at).isoformat(),
+            "checks": checks,
+        }
+        return self._snapshot
+
+
+    def snapshot(self) -> dict:
+        snapshot = dict(self._snapshot)
+        if self._checked_at is not None:
+            snapshot["age_seconds"] = round(time.time() - self._checked_at, 3)
+        return snapshot
@@ -0,0 +1,21 @@
+from .backends import BACKENDS, load_backend
+from .batching import BatchScheduler
+from .cache import PredictionCache, content_hash
+from .preprocessing import normalize_inplace, preprocess_batch
+from .workers import InferenceWorkerPool
+from .registry import DEFAULT_MODEL, INPUT_SHAPE, ModelRegistry, model_registry
+
+__all__ = [
+    "BACKENDS",
+    "load_backend",
+    "BatchScheduler",
+    "InferenceWorkerPool",
+    "PredictionCache",
+    "content_hash",
+    "ModelRegistry",
+    "model_registry",
+    "DEFAULT_MODEL",
+    "INPUT_SHAPE",
+    "preprocess_batch",
+    "normalize_inplace",
+]
@@ -0,0 +1,76 @@
+import threading
+from pathlib import Path
+
+import numpy as np
+
+BACKENDS = ("keras", "savedmodel", "tflite")
+
+
+class KerasBackend():
+    """Modelo Keras completo (`.keras`), caminho padrão de treino e inferência."""
+
+    def __init__(self, path: Path):
+        from tensorflow import keras
+
+        self.model = keras.models.load_model(path)
+
+    def predict(self, batch: np.ndarray) -> np.ndarray:
+        return self.model.predict(batch, verbose=0)
+
+
+class SavedModelBackend():
+    """Grafo exportado com `model.export()`; dispensa a pilha Keras na inferência."""
+
+    def __init__(self, path: Path):
+        import tensorflow as tf
+
+        self._tf = tf
+        self.module = tf.saved_model.load(str(path))
+        if hasattr(self.module, "serve"):
+            self._fn = self.module.serve
+        else:
+            self._fn = self.module.signatures["serving_default"]
+
+    def predict(self, batch: np.ndarray) -> np.ndarray:
+        output = self._fn(self._tf.constant(batch, dtype=self._tf.float32))
+        if isinstance(output, dict):
+            output = next(iter(output.values()))
+        return output.numpy()
+
+
+class TFLiteBackend():
+    """Interpretador TFLite (opcionalmente quantizado) para servidores só com CPU."""
+
+    def __init__(self, path: Path, num_threads: int = None):
+        import tensorflow as tf
+
+        self.interpreter = tf.lite.Interpreter(model_path=str(path), num_threads=num_threads)
+        self.interpreter.allocate_tensors()
+        self._input = self.interpreter.get_input_details()[0]
+        self._output = self.interpreter.get_output_details()[0]
+        self._batch_size = int(self._input["shape"][0])
+        self._lock = threading.Lock()
+
+    def predict(self, batch: np.ndarray) -> np.ndarray:
+        with self._lock:
+            if batch.shape[0] != self._batch_size:
+                self.interpreter.resize_tensor_input(self._input["index"], batch.shape)
+                self.interpreter.allocate_tensors()
+                self._input = self.interpreter.get_input_details()[0]
+                self._output = self.interpreter.get_output_details()[0]
+                self._batch_size = batch.shape[0]
+
+            self.interpreter.set_tensor(self._input["index"], batch.astype(self._input["dtype"], copy=False))
+            self.interpreter.invoke()
+            return self.interpreter.get_tensor(self._output["index"]).copy()
+
+
+def load_backend(kind: str, path: Path, num_threads: int = None):
+    """Instancia o backend de inferência `kind` (keras, savedmodel ou tflite) a partir de `path`."""
+    if kind == "keras":
+        return KerasBackend(path)
+    if kind == "savedmodel":
+        return SavedModelBackend(path)
+    if kind == "tflite":
+        return TFLiteBackend(path, num_threads=num_threads)
+    raise ValueError(f"Backend de inferência desconhecido: {kind}. Use um de {BACKENDS}")
@@ -0,0 +1,124 @@
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable
+
+import numpy as np
+
+from src.metrics import LatencyTracker
+
+logger = logging.getLogger(__name__)
+
+
+class _PendingRequest():
+    __slots__ = ("array", "future", "enqueued_at")
+
+    def __init__(self, array: np.ndarray):
+        self.array = array
+        self.future = Future()
+        self.enqueued_at = time.perf_counter()
+
+
+class BatchScheduler():
+    """Agrupa requisições de inferência concorrentes em lotes para o modelo.
+
+    Cada chamada a `predict` enfileira uma única amostra e bloqueia até o
+    resultado. Uma thread de fundo junta até `max_batch_size` amostras, ou o
+    que chegar em `max_wait_ms`, executa `predict_fn` uma única vez e devolve
+    a linha correspondente a cada chamador.
+    """
+
+    def __init__(
+        self,
+        predict_fn: Callable[[np.ndarray], np.ndarray],
+        max_batch_size: int = 16,
+        max_wait_ms: float = 5.0
+    ):
+        self.predict_fn = predict_fn
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000.0
+
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+
+        self.batch_sizes = LatencyTracker()
+        self.queue_wait_ms = LatencyTracker()
+        self.inference_ms = LatencyTracker()
+
+
+    def _ensure_started(self):
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(
+                        target=self._run,
+                        name="inference-batcher",
+                        daemon=True
+                    )
+                    self._thread.start()
+
+
+    def submit(self, array: np.ndarray) -> Future:
+        """Enfileira uma amostra (sem dimensão de lote) e retorna um Future com a linha de predição."""
+        self._ensure_started()
+        request = _PendingRequest(array)
+        self._queue.put(request)
+        return request.future
+
+
+    def predict(self, array: np.ndarray, timeout: float = None) -> np.ndarray:
+        return self.submit(array).result(timeout=timeout)
+
+
+    def _collect(self) -> list:
+        first = self._queue.get()
+        batch = [first]
+        deadline = time.perf_counter() + self.max_wait
+
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+
+        return batch
+
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            started = time.perf_counter()
+
+            for request in batch:
+                self.queue_wait_ms.observe((started - request.enqueued_at) * 1000.0)
+            self.batch_sizes.observe(len(batch))
+
+            try:
+                inputs = np.stack([request.array for request in batch])
+                outputs = self.predict_fn(inputs)
+                self.inference_ms.observe((time.perf_counter() - started) * 1000.0)
+
+                for request, output in zip(batch, outputs):
+                    request.future.set_result(output)
+            except Exception as e:
+                logger.error(f"Falha na inferência em lote ({len(batch)} amostras): {e}")
+                for request in batch:
+                    if not request.future.done():
+                        request.future.set_exception(e)
+
+
+    def get_metrics(self) -> dict:
+        return {
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait * 1000.0,
+            "queue_depth": self._queue.qsize(),
+            "batch_size": self.batch_sizes.snapshot(),
+            "queue_wait_ms": self.queue_wait_ms.snapshot(),
+            "inference_ms": self.inference_ms.snapshot(),
+        }
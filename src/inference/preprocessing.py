@@ -0,0 +1,80 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Sequence
+
+import numpy as np
+from PIL import Image
+
+from .registry import INPUT_SHAPE
+
+_executors = {}
+_executor_lock = threading.Lock()
+
+
+def _get_executor(max_workers: int) -> ThreadPoolExecutor:
+    """Pool de decodificação compartilhado, um por tamanho pedido."""
+    max_workers = max(1, int(max_workers))
+    executor = _executors.get(max_workers)
+    if executor is None:
+        with _executor_lock:
+            executor = _executors.get(max_workers)
+            if executor is None:
+                executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=f"preprocess-{max_workers}")
+                _executors[max_workers] = executor
+    return executor
+
+
+def decode_into(image_path: str, out: np.ndarray):
+    """Decodifica e redimensiona uma imagem diretamente em `out` (224x224x3, float32)."""
+    height, width = out.shape[0], out.shape[1]
+    with Image.open(image_path) as img:
+        img = img.convert('RGB').resize((width, height))
+        np.copyto(out, np.asarray(img))
+
+
+def normalize_inplace(batch: np.ndarray) -> np.ndarray:
+    """Padroniza cada imagem do lote (média zero, desvio unitário) sem criar cópias do lote."""
+    flat = batch.reshape(batch.shape[0], -1)
+
+    mean = flat.mean(axis=1, keepdims=True)
+    flat -= mean
+
+    std = np.sqrt(np.einsum('ij,ij->i', flat, flat) / flat.shape[1])
+    std[std == 0] = 1.0
+    flat /= std[:, None]
+
+    return batch
+
+
+def preprocess_batch(
+    image_paths: Sequence[str],
+    out: np.ndarray = None,
+    max_workers: int = 4
+) -> np.ndarray:
+    """Pré-processa N imagens em um único buffer (N, 224, 224, 3) float32.
+
+    A decodificação roda em paralelo em um pool de threads compartilhado e
+    cada imagem é escrita na sua fatia do buffer pré-alocado; a normalização
+    é feita in-place sobre o lote inteiro.
+
+    Args:
+        image_paths: Caminhos das imagens
+        out: Buffer opcional para reaproveitar entre chamadas (N, 224, 224, 3)
+        max_workers: Tamanho do pool de decodificação
+
+    Returns:
+        O buffer preenchido e normalizado
+    """
+    n = len(image_paths)
+    if out is None:
+        out = np.empty((n, *INPUT_SHAPE), dtype=np.float32)
+    elif out.shape != (n, *INPUT_SHAPE) or out.dtype != np.float32:
+        raise ValueError(f"Buffer incompatível: esperado {(n, *INPUT_SHAPE)} float32, recebido {out.shape} {out.dtype}")
+
+    if n == 1:
+        decode_into(image_paths[0], out[0])
+    elif n > 1:
+        executor = _get_executor(max_workers)
+        list(executor.map(decode_into, image_paths, out))
+
+    return normalize_inplace(out)
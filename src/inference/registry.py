@@ -0,0 +1,108 @@
+import logging
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+
+from .backends import load_backend
+from .cache import path_fingerprint
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MODEL = "pneumonia"
+INPUT_SHAPE = (224, 224, 3)
+
+
+class ModelRegistry():
+    """Registro de modelos carregados, compartilhado por todo o processo.
+
+    Garante que cada modelo seja carregado uma única vez, mesmo com chamadas
+    concorrentes, e guarda o estado de prontidão para o `/health`.
+    """
+
+    def __init__(self):
+        self._models = {}
+        self._status = {}
+        self._fingerprints = {}
+        self._lock = threading.Lock()
+
+
+    def _load(self, name: str, path: Path, warmup: bool, backend: str, num_threads: int):
+        self._status[name] = {"ready": False, "state": "loading", "path": str(path), "backend": backend}
+        started = time.perf_counter()
+
+        model = load_backend(backend, path, num_threads=num_threads)
+        load_seconds = time.perf_counter() - started
+
+        warmup_seconds = None
+        if warmup:
+            started = time.perf_counter()
+            model.predict(np.zeros((1, *INPUT_SHAPE), dtype=np.float32))
+            warmup_seconds = time.perf_counter() - started
+
+        self._fingerprints[name] = path_fingerprint(path)
+        self._models[name] = model
+        self._status[name] = {
+            "ready": True,
+            "state": "ready",
+            "path": str(path),
+            "backend": backend,
+            "fingerprint": self._fingerprints[name],
+            "load_seconds": round(load_seconds, 3),
+            "warmup_seconds": round(warmup_seconds, 3) if warmup_seconds is not None else None,
+        }
+        logger.info(f"Modelo '{name}' carregado de {path} em {load_seconds:.1f}s")
+        return model
+
+
+    def load(
+        self,
+        name: str,
+        path: Path,
+        warmup: bool = True,
+        backend: str = "keras",
+        num_threads: int = None
+    ):
+        """Carrega (se necessário) e aquece o modelo, retornando a instância compartilhada.
+
+        O objeto retornado expõe `predict(batch) -> np.ndarray`, independente do backend.
+        """
+        with self._lock:
+            if name in self._models:
+                return self._models[name]
+            try:
+                return self._load(name, Path(path), warmup, backend, num_threads)
+            except Exception as e:
+                self._status[name] = {
+                    "ready": False, "state": "error", "path": str(path), "backend": backend, "error": str(e)
+                }
+                raise
+
+
+    def get(self, name: str = DEFAULT_MODEL, path: Path = None, backend: str = "keras", num_threads: int = None):
+        """Retorna o modelo registrado; carrega sob demanda se `path` for informado."""
+        model = self._models.get(name)
+        if model is not None:
+            return model
+        if path is None:
+            raise KeyError(f"Modelo '{name}' não registrado")
+        return self.load(name, path, warmup=False, backend=backend, num_threads=num_threads)
+
+
+    def fingerprint(self, name: str = DEFAULT_MODEL) -> str:
+        """Versão do modelo (hash do artefato), usada para invalidar caches de predição."""
+        if name not in self._fingerprints:
+            raise KeyError(f"Modelo '{name}' não registrado")
+        return self._fingerprints[name]
+
+
+    def is_ready(self, name: str = DEFAULT_MODEL) -> bool:
+        return name in self._models
+
+
+    def status(self) -> dict:
+        return {name: dict(info) for name, info in self._status.items()}
+
+
+model_registry = ModelRegistry()
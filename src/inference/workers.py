@@ -0,0 +1,189 @@
+import asyncio
+import logging
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from src.metrics import LatencyTracker
+
+logger = logging.getLogger(__name__)
+
+_tool = None
+
+
+def _inicializar_worker():
+    """Executado uma vez em cada processo: carrega e aquece o modelo local do worker."""
+    global _tool
+    from src.agents.triagem.tools import ToolTriagem
+    from src.inference.registry import DEFAULT_MODEL, model_registry
+
+    _tool = ToolTriagem()
+    model_registry.load(
+        DEFAULT_MODEL,
+        _tool.settings.get_inference_artifact(),
+        backend=_tool.settings.inference_backend,
+        num_threads=_tool.settings.inference_num_threads
+    )
+
+
+def _ping() -> int:
+    return multiprocessing.current_process().pid
+
+
+def _analisar(image_path: str) -> dict:
+    return _tool.analisar_imagem(image_path)
+
+
+class InferenceWorkerPool():
+    """Pool de processos de inferência isolado do event loop do servidor.
+
+    Cada processo mantém seu próprio modelo carregado. A interface é
+    assíncrona: no máximo `workers + max_pending` requisições ficam em voo;
+    acima disso o chamador espera até `queue_timeout` por uma vaga e então
+    recebe um erro de sobrecarga. Cada análise tem um tempo limite próprio.
+    """
+
+    def __init__(
+        self,
+        workers: int = 2,
+        max_pending: int = 8,
+        timeout: float = 60.0,
+        queue_timeout: float = 5.0
+    ):
+        self.workers = max(1, workers)
+        self.max_pending = max(0, max_pending)
+        self.timeout = timeout
+        self.queue_timeout = queue_timeout
+
+        self._executor = None
+        self._semaphore = None
+        self._ready = False
+        self._in_flight = 0
+        self._start_lock = asyncio.Lock()
+
+        self.rejected = 0
+        self.timeouts = 0
+        self.crashes = 0
+        self.latency_ms = LatencyTracker()
+        self.queue_wait_ms = LatencyTracker()
+
+
+    async def start(self):
+        """Sobe os processos e aguarda todos terem o modelo carregado."""
+        async with self._start_lock:
+            if self._executor is not None:
+                return
+            if self._semaphore is None:
+                self._semaphore = asyncio.Semaphore(self.workers + self.max_pending)
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_inicializar_worker
+            )
+            loop = asyncio.get_running_loop()
+            pids = await asyncio.gather(*[loop.run_in_executor(self._executor, _ping) for _ in range(self.workers)])
+            self._ready = True
+            logger.info(f"Pool de inferência pronto: {len(set(pids))} processos")
+
+
+    async def _restart(self, broken: ProcessPoolExecutor):
+        """Recria o pool após a queda de um processo (OOM, falha nativa); só a primeira chamada recria."""
+        if self._executor is broken:
+            self.crashes += 1
+            logger.error("Processo de inferência caiu; recriando o pool")
+            self.shutdown()
+        try:
+            await self.start()
+        except Exception as e:
+            logger.error(f"Falha ao recriar o pool de inferência: {e}")
+            self.shutdown()
+
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+            self._ready = False
+
+
+    def is_ready(self) -> bool:
+        return self._ready
+
+
+    async def analisar(self, image_path: str) -> dict:
+        """Analisa a imagem em um processo do pool, com contrapressão e tempo limite."""
+        if self._executor is None:
+            await self.start()
+
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), timeout=self.queue_timeout)
+        except asyncio.TimeoutError:
+            self.rejected += 1
+            return {
+                "status": "erro",
+                "mensagem": "Serviço de análise de imagens sobrecarregado. Tente novamente em instantes."
+            }
+
+        self._in_flight += 1
+        self.queue_wait_ms.observe((time.perf_counter() - started) * 1000.0)
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphore
+        executor = self._executor
+
+        def liberar():
+            self._in_flight -= 1
+            semaphore.release()
+
+        def ao_terminar(_):
+            # A vaga só é devolvida quando o processo termina o trabalho, mesmo após o tempo limite.
+            try:
+                loop.call_soon_threadsafe(liberar)
+            except RuntimeError:
+                pass
+
+        try:
+            future = executor.submit(_analisar, image_path)
+        except BrokenProcessPool:
+            liberar()
+            return await self._falha_worker(executor, image_path)
+        except Exception:
+            liberar()
+            raise
+        future.add_done_callback(ao_terminar)
+
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout=self.timeout)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            return {
+                "status": "erro",
+                "mensagem": f"Tempo limite de {self.timeout:.0f}s excedido ao analisar imagem: {image_path}"
+            }
+        except BrokenProcessPool:
+            return await self._falha_worker(executor, image_path)
+        finally:
+            self.latency_ms.observe((time.perf_counter() - started) * 1000.0)
+
+
+    async def _falha_worker(self, executor: ProcessPoolExecutor, image_path: str) -> dict:
+        await self._restart(executor)
+        return {
+            "status": "erro",
+            "mensagem": f"O processo de análise falhou ao analisar a imagem {image_path}. Tente novamente."
+        }
+
+
+    def get_metrics(self) -> dict:
+        return {
+            "ready": self._ready,
+            "workers": self.workers,
+            "max_pending": self.max_pending,
+            "in_flight": self._in_flight,
+            "rejected": self.rejected,
+            "timeouts": self.timeouts,
+            "crashes": self.crashes,
+            "queue_wait_ms": self.queue_wait_ms.snapshot(),
+            "latency_ms": self.latency_ms.snapshot(),
+        }
@@ -0,0 +1,243 @@
+import asyncio
+import logging
+import time
+from datetime import timedelta
+
+import anyio
+import httpx
+from mcp.client.session import ClientSession
+from mcp.client.sse import sse_client
+from mcp.shared.exceptions import McpError
+from mcp.types import CONNECTION_CLOSED
+
+from src.metrics import LatencyTracker
+
+logger = logging.getLogger(__name__)
+
+# Falhas de transporte: a sessão não serve mais e precisa ser reaberta.
+# Erros da própria ferramenta ou do protocolo não invalidam a conexão.
+TRANSPORT_ERRORS = (
+    anyio.ClosedResourceError,
+    anyio.BrokenResourceError,
+    anyio.EndOfStream,
+    ConnectionError,
+    OSError,
+)
+
+# Sessão SSE morta (ex: servidor reiniciado): o cliente MCP só percebe como
+# conexão encerrada ou como tempo limite da resposta.
+TRANSPORT_ERROR_CODES = {CONNECTION_CLOSED, httpx.codes.REQUEST_TIMEOUT}
+
+
+def is_transport_error(erro: Exception) -> bool:
+    if isinstance(erro, McpError):
+        return erro.error.code in TRANSPORT_ERROR_CODES
+    return isinstance(erro, TRANSPORT_ERRORS)
+
+
+class MCPConnection():
+    """Uma conexão SSE persistente com o servidor MCP, reconectada automaticamente.
+
+    O ciclo de vida (abrir, inicializar, fechar) roda em uma task própria,
+    porque os contextos do cliente SSE precisam entrar e sair na mesma task;
+    as chamadas de ferramenta podem vir de qualquer task e são multiplexadas
+    pela mesma `ClientSession`.
+    """
+
+    def __init__(self, url: str, index: int, on_change, sse_read_timeout: float = 300.0):
+        self.url = url
+        self.index = index
+        self.sse_read_timeout = sse_read_timeout
+        self._on_change = on_change
+
+        self.session = None
+        self.in_flight = 0
+        self.served = 0
+        self.failures = 0
+        self.reconnects = 0
+
+        self._restart = asyncio.Event()
+        self._closing = False
+        self._task = None
+
+
+    @property
+    def ready(self) -> bool:
+        return self.session is not None
+
+
+    def start(self):
+        self._task = asyncio.create_task(self._run(), name=f"mcp-connection-{self.index}")
+
+
+    async def _run(self):
+        backoff = 0.5
+        while not self._closing:
+            try:
+                async with sse_client(f"{self.url}/sse", timeout=5.0, sse_read_timeout=self.sse_read_timeout) as (read_stream, write_stream):
+                    async with ClientSession(read_stream, write_stream) as session:
+                        await session.initialize()
+                        self.session = session
+                        backoff = 0.5
+                        logger.info(f"[MCP pool] Conexão {self.index} pronta")
+                        await self._on_change()
+                        await self._restart.wait()
+            except Exception as e:
+                logger.warning(f"[MCP pool] Conexão {self.index} caiu: {e}")
+            finally:
+                self.session = None
+                self._restart.clear()
+
+            if self._closing:
+                break
+            self.reconnects += 1
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, 10.0)
+
+
+    def mark_broken(self):
+        """Descarta a sessão atual; a task de ciclo de vida reconecta em seguida."""
+        self.session = None
+        self._restart.set()
+
+
+    async def close(self):
+        self._closing = True
+        self._restart.set()
+        if self._task is not None:
+            await self._task
+
+
+    def get_metrics(self) -> dict:
+        return {
+            "index": self.index,
+            "ready": self.ready,
+            "in_flight": self.in_flight,
+            "served": self.served,
+            "failures": self.failures,
+            "reconnects": self.reconnects,
+        }
+
+
+class MCPClientPool():
+    """Conjunto limitado de sessões MCP de longa duração compartilhadas pelas requisições da API.
+
+    Cada chamada vai para a conexão pronta com menos requisições em voo,
+    respeitando `max_inflight` por conexão; se nenhuma tiver vaga, a
+    requisição espera até `acquire_timeout`.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        size: int = 2,
+        max_inflight: int = 8,
+        acquire_timeout: float = 30.0,
+        call_timeout: float = 120.0
+    ):
+        self.url = url
+        self.size = max(1, size)
+        self.max_inflight = max(1, max_inflight)
+        self.acquire_timeout = acquire_timeout
+        self.call_timeout = call_timeout
+
+        self._connections = []
+        self._cond = None
+
+        self.retries = 0
+        self.wait_ms = LatencyTracker()
+        self.call_ms = LatencyTracker()
+
+
+    async def start(self):
+        self._cond = asyncio.Condition()
+        self._connections = [MCPConnection(self.url, i, self._notify) for i in range(self.size)]
+        for connection in self._connections:
+            connection.start()
+
+
+    async def close(self):
+        await asyncio.gather(*(connection.close() for connection in self._connections), return_exceptions=True)
+        self._connections = []
+
+
+    async def _notify(self):
+        async with self._cond:
+            self._cond.notify_all()
+
+
+    def _pick(self):
+        disponiveis = [c for c in self._connections if c.ready and c.in_flight < self.max_inflight]
+        if not disponiveis:
+            return None
+        return min(disponiveis, key=lambda c: c.in_flight)
+
+
+    async def _acquire(self) -> MCPConnection:
+        async with self._cond:
+            connection = await asyncio.wait_for(self._cond.wait_for(self._pick), timeout=self.acquire_timeout)
+            connection.in_flight += 1
+            return connection
+
+
+    async def _release(self, connection: MCPConnection):
+        async with self._cond:
+            connection.in_flight -= 1
+            self._cond.notify_all()
+
+
+    async def call_tool(self, name: str, arguments: dict):
+        """Chama uma ferramenta MCP em uma das sessões do pool.
+
+        Se a sessão escolhida estiver morta, ela é descartada e a chamada é
+        repetida uma vez em outra sessão (ou na mesma, já reconectada).
+        """
+        try:
+            return await self._call_once(name, arguments)
+        except Exception as e:
+            if not is_transport_error(e):
+                raise
+            self.retries += 1
+            logger.warning(f"[MCP pool] Repetindo {name} após falha de transporte: {e}")
+            return await self._call_once(name, arguments)
+
+
+    async def _call_once(self, name: str, arguments: dict):
+        inicio = time.perf_counter()
+        try:
+            connection = await self._acquire()
+        except asyncio.TimeoutError:
+            raise RuntimeError(f"Nenhuma conexão MCP disponível após {self.acquire_timeout:.0f}s")
+        self.wait_ms.observe((time.perf_counter() - inicio) * 1000.0)
+
+        try:
+            session = connection.session
+            if session is None:
+                raise RuntimeError(f"Conexão MCP {connection.index} indisponível")
+            result = await session.call_tool(
+                name=name,
+                arguments=arguments,
+                read_timeout_seconds=timedelta(seconds=self.call_timeout)
+            )
+            connection.served += 1
+            return result
+        except Exception as e:
+            if is_transport_error(e):
+                connection.failures += 1
+                connection.mark_broken()
+            raise
+        finally:
+            self.call_ms.observe((time.perf_counter() - inicio) * 1000.0)
+            await self._release(connection)
+
+
+    def get_metrics(self) -> dict:
+        return {
+            "size": self.size,
+            "max_inflight": self.max_inflight,
+            "ready": sum(1 for c in self._connections if c.ready),
+            "retries": self.retries,
+            "wait_ms": self.wait_ms.snapshot(),
+            "call_ms": self.call_ms.snapshot(),
+            "connections": [c.get_metrics() for c in self._connections],
+        }
@@ -1,21 +1,33 @@
 import sys
+import json
+import time
+import asyncio
+import contextlib
 from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from mcp.server.fastmcp import FastMCP
 from starlette.applications import Starlette
 from starlette.routing import Mount, Route
-from starlette.responses import JSONResponse
+from starlette.responses import JSONResponse, StreamingResponse
 import uvicorn
 
+from google.adk.agents.run_config import RunConfig, StreamingMode
 from google.adk.runners import Runner
 from google.adk.sessions import InMemorySessionService
+from google.genai import types
 from src.agents.orchestrator.agent import root_agent
+from src.container import container
+from src.inference import DEFAULT_MODEL, model_registry
+from src.metrics import LatencyTracker
 
 mcp = FastMCP("triagem-orquestrador")
 
 session_service = InMemorySessionService()
 
+chat_ttft_ms = LatencyTracker()
+chat_total_ms = LatencyTracker()
+
 runner = Runner(
     agent=root_agent,
     app_name="triagem_medica",
@@ -23,43 +35,67 @@ runner = Runner(
 )
 
 
-@mcp.tool()
-async def chat(message: str, session_id: str = "default") -> str:
-    try:
-        print(f"[MCP] Mensagem: {message}")
-        
-        session = await session_service.get_session(
+def _textos(event) -> list:
+    if hasattr(event, 'content') and event.content:
+        if hasattr(event.content, 'parts'):
+            return [part.text for part in event.content.parts if hasattr(part, 'text') and part.text]
+        elif isinstance(event.content, str):
+            return [event.content]
+    return []
+
+
+async def _executar_chat(message: str, session_id: str, streaming: bool = False):
+    """Executa o orquestrador e produz os trechos de texto à medida que são gerados.
+
+    Em modo streaming o runner emite eventos parciais seguidos de um evento
+    final com o texto agregado; o agregado é descartado para não duplicar.
+    """
+    session = await session_service.get_session(
+        app_name="triagem_medica",
+        user_id="mcp_user",
+        session_id=session_id
+    )
+    
+    if session is None:
+        session = await session_service.create_session(
             app_name="triagem_medica",
             user_id="mcp_user",
             session_id=session_id
         )
-        
-        if session is None:
-            session = await session_service.create_session(
-                app_name="triagem_medica",
-                user_id="mcp_user",
-                session_id=session_id
-            )
-        
-        from google.genai import types
-        user_content = types.Content(
-            role="user",
-            parts=[types.Part.from_text(text=message)]
-        )
+    
+    user_content = types.Content(
+        role="user",
+        parts=[types.Part.from_text(text=message)]
+    )
+
+    run_config = RunConfig(streaming_mode=StreamingMode.SSE if streaming else StreamingMode.NONE)
+
+    parcial_pendente = False
+    async for event in runner.run_async(
+        user_id="mcp_user",
+        session_id=session_id,
+        new_message=user_content,
+        run_config=run_config
+    ):
+        if getattr(event, 'partial', False):
+            parcial_pendente = True
+            for texto in _textos(event):
+                yield texto
+        elif parcial_pendente:
+            parcial_pendente = False
+        else:
+            for texto in _textos(event):
+                yield texto
+
+
+@mcp.tool()
+async def chat(message: str, session_id: str = "default") -> str:
+    try:
+        print(f"[MCP] Mensagem: {message}")
         
         final_response = ""
-        async for event in runner.run_async(
-            user_id="mcp_user",
-            session_id=session_id,
-            new_message=user_content
-        ):
-            if hasattr(event, 'content') and event.content:
-                if hasattr(event.content, 'parts'):
-                    for part in event.content.parts:
-                        if hasattr(part, 'text') and part.text:
-                            final_response += part.text
-                elif isinstance(event.content, str):
-                    final_response += event.content
+        async for texto in _executar_chat(message, session_id):
+            final_response += texto
         
         if not final_response:
             final_response = "Desculpe, não consegui processar sua solicitação."
@@ -75,14 +111,124 @@ async def chat(message: str, session_id: str = "default") -> str:
         return error_msg
 
 
+def _sse(payload: dict) -> str:
+    return f"data: {json.dumps(payload, ensure_ascii=False)}\n\n"
+
+
+async def chat_stream(request):
+    """Versão em streaming do chat: repassa a saída parcial do orquestrador via SSE."""
+    body = await request.json()
+    message = body.get("message", "")
+    session_id = body.get("session_id", "default")
+
+    async def eventos():
+        inicio = time.perf_counter()
+        primeiro = None
+        try:
+            print(f"[MCP] Mensagem (stream): {message}")
+            async for texto in _executar_chat(message, session_id, streaming=True):
+                if primeiro is None:
+                    primeiro = time.perf_counter()
+                    chat_ttft_ms.observe((primeiro - inicio) * 1000.0)
+                yield _sse({"type": "token", "text": texto})
+
+            if primeiro is None:
+                yield _sse({"type": "token", "text": "Desculpe, não consegui processar sua solicitação."})
+
+            total_ms = (time.perf_counter() - inicio) * 1000.0
+            chat_total_ms.observe(total_ms)
+            yield _sse({
+                "type": "done",
+                "ttft_ms": round((primeiro - inicio) * 1000.0, 1) if primeiro else None,
+                "total_ms": round(total_ms, 1),
+            })
+        except Exception as e:
+            import traceback
+            print(f"[MCP] Erro (stream): {str(e)}")
+            print(traceback.format_exc())
+            yield _sse({"type": "error", "message": f"Erro: {str(e)}"})
+
+    return StreamingResponse(
+        eventos(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+def _modelo_pronto() -> bool:
+    if container.tool_triagem.settings.inference_workers > 0:
+        return container.tool_triagem.get_pool().is_ready()
+    return model_registry.is_ready(DEFAULT_MODEL)
+
+
 async def health(request):
-    return JSONResponse({"status": "ok", "server": "mcp-orchestrator"})
+    ready = _modelo_pronto()
+    return JSONResponse(
+        {
+            "status": "ok" if ready else "starting",
+            "server": "mcp-orchestrator",
+            "model_ready": ready,
+            "models": model_registry.status(),
+        },
+        status_code=200 if ready else 503
+    )
+
+
+async def metrics(request):
+    return JSONResponse({
+        "inference": container.tool_triagem.get_metrics(),
+        "alerts": container.tool_notification.alerts.get_metrics(),
+        "email": container.tool_notification.dispatcher.get_metrics() if container.tool_notification.dispatcher else None,
+        "events": container.event_bus.get_metrics(),
+        "chat_stream": {
+            "ttft_ms": chat_ttft_ms.snapshot(),
+            "total_ms": chat_total_ms.snapshot(),
+        },
+    })
+
+
+async def _carregar_modelo():
+    settings = container.settings
+    if not settings.is_model_available():
+        print(f"[MCP] Modelo não encontrado em {settings.get_inference_artifact()}")
+        return
+    if settings.inference_workers > 0:
+        try:
+            await container.tool_triagem.get_pool().start()
+            print(f"[MCP] Pool de inferência pronto ({settings.inference_workers} processos)")
+        except Exception as e:
+            print(f"[MCP] Falha ao iniciar pool de inferência: {e}")
+        return
+    try:
+        await asyncio.to_thread(container.load_model)
+        print(f"[MCP] Modelo carregado e aquecido ({settings.inference_backend})")
+    except Exception as e:
+        print(f"[MCP] Falha ao carregar modelo: {e}")
+
+
+@contextlib.asynccontextmanager
+async def lifespan(app):
+    await asyncio.to_thread(container.database.init_database)
+    await asyncio.to_thread(container.tool_notification.alerts.compact, container.settings.alerts_retention_days)
+    if not container.tool_notification.simula_email():
+        await asyncio.to_thread(container.tool_notification.get_dispatcher)
+    await _carregar_modelo()
+    yield
+    await asyncio.to_thread(container.event_bus.shutdown)
+    if container.tool_notification.dispatcher is not None:
+        await asyncio.to_thread(container.tool_notification.dispatcher.stop)
+    if container.tool_triagem.pool is not None:
+        container.tool_triagem.pool.shutdown()
+    await container.async_database.dispose()
 
 
 app = Starlette(
     debug=True,
+    lifespan=lifespan,
     routes=[
         Route("/health", health),
+        Route("/metrics", metrics),
+        Route("/chat/stream", chat_stream, methods=["POST"]),
         Mount("/", app=mcp.sse_app()),
     ],
 )
@@ -96,6 +242,8 @@ if __name__ == "__main__":
     print("")
     print("Endpoints:")
     print("  GET  /health    -> Status do servidor")
+    print("  GET  /metrics   -> Métricas de inferência e chat")
+    print("  POST /chat/stream -> Chat com resposta parcial (SSE)")
     print("  POST / -> Mensagens MCP")
     print("")
     print("URL: http://localhost:8001")
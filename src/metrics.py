@@ -0,0 +1,43 @@
+import threading
+from collections import deque
+
+
+class LatencyTracker():
+    """Acumula observações (latência, tamanho de lote, etc.) com janela recente para percentis."""
+
+    def __init__(self, window: int = 1024):
+        self._lock = threading.Lock()
+        self._recent = deque(maxlen=window)
+        self._count = 0
+        self._total = 0.0
+        self._max = 0.0
+
+    def observe(self, value: float):
+        with self._lock:
+            self._recent.append(value)
+            self._count += 1
+            self._total += value
+            if value > self._max:
+                self._max = value
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            recent = sorted(self._recent)
+            count = self._count
+            total = self._total
+            maximum = self._max
+
+        if not recent:
+            return {"count": 0, "mean": 0.0, "p50": 0.0, "p95": 0.0, "max": 0.0}
+
+        def percentile(p: float) -> float:
+            index = min(len(recent) - 1, int(round(p * (len(recent) - 1))))
+            return recent[index]
+
+        return {
+            "count": count,
+            "mean": total / count,
+            "p50": percentile(0.50),
+            "p95": percentile(0.95),
+            "max": maximum,
+        }